@@ -0,0 +1,38 @@
+"""
+Synthesis engine: voices, envelopes, filters, chorus, parameters and
+offline rendering.
+
+Nothing in this package imports Qt, pandas or pyqtgraph, so it runs
+headless (see backend.render). The names below are imported from their
+modules on first access; `import backend` on its own loads nothing.
+"""
+import importlib
+
+_EXPORTS = {
+    'ADSREnvelope': 'backend.generator',
+    'Generator': 'backend.generator',
+    'Note': 'backend.generator',
+    'VoiceBank': 'backend.voice_bank',
+    'EnvelopeBank': 'backend.envelope_bank',
+    'BufferPool': 'backend.buffer_pool',
+    'FilterStage': 'backend.filters',
+    'design_filter': 'backend.filters',
+    'ChorusEngine': 'backend.chorus',
+    'ParameterStore': 'backend.params',
+    'OscillatorParams': 'backend.params',
+    'FilterParams': 'backend.params',
+    'ChorusParams': 'backend.params',
+    'ADSRParams': 'backend.params',
+    'StereoParams': 'backend.params',
+    'OfflineRenderer': 'backend.render',
+    'load_patch': 'backend.render',
+    'load_events': 'backend.render',
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name]), name)
+    raise AttributeError(f"module 'backend' has no attribute {name!r}")
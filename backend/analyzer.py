@@ -0,0 +1,92 @@
+from functools import lru_cache
+
+import numpy as np
+
+sp_fft = None  # scipy.fft, bound by load_scipy() on first use
+
+
+def load_scipy():
+    """
+    Imports scipy.fft on first use rather than at module load, where it
+    would add a large share of a second to startup.
+    """
+    global sp_fft
+    if sp_fft is None:
+        from scipy import fft
+        sp_fft = fft
+
+
+@lru_cache(maxsize=16)
+def hann_window(size):
+    window = np.hanning(size)
+    window.flags.writeable = False
+    return window
+
+
+@lru_cache(maxsize=16)
+def spectrum_frequencies(size, sample_rate):
+    freqs = np.fft.rfftfreq(size, d=1 / sample_rate)[:size // 2]
+    freqs.flags.writeable = False
+    return freqs
+
+
+class SpectrumAnalyzer:
+    """
+    Incremental short-time spectrum of a mono stream.
+
+    Incoming samples go into a fixed-size ring; a new Hann-windowed real FFT
+    of the newest size samples is computed only once hop new samples have
+    arrived since the previous one. The window and frequency axis are
+    cached per (size, sample rate) and the windowed frame, magnitude and
+    waveform buffers are reused between frames.
+    """
+
+    def __init__(self, size=4096, hop=1024):
+        self.size = size
+        self.hop = hop
+        self.ring = np.zeros(size)
+        self.write_pos = 0
+        self.pending = 0        # Samples received since the last computed frame
+        self.filled = 0
+        self._workspace = np.empty(size)
+        self._frame = np.empty(size)
+        self._magnitudes = np.zeros(size // 2)
+
+    def push(self, samples):
+        """
+        Adds samples and returns True when a new frame is ready.
+        """
+        samples = samples[-self.size:]
+        count = len(samples)
+        first = min(count, self.size - self.write_pos)
+        self.ring[self.write_pos:self.write_pos + first] = samples[:first]
+        self.ring[:count - first] = samples[first:]
+        self.write_pos = (self.write_pos + count) % self.size
+        self.filled = min(self.filled + count, self.size)
+        self.pending += count
+        if self.pending < self.hop:
+            return False
+        self.pending = 0
+        self._compute()
+        return True
+
+    def _compute(self):
+        # Ordered copy of the newest samples, oldest first
+        tail = self.size - self.write_pos
+        self._frame[:tail] = self.ring[self.write_pos:]
+        self._frame[tail:] = self.ring[:self.write_pos]
+        np.multiply(self._frame, hann_window(self.size), out=self._workspace)
+        if sp_fft is None:
+            load_scipy()
+        spectrum = sp_fft.rfft(self._workspace, overwrite_x=True)
+        np.abs(spectrum[:self.size // 2], out=self._magnitudes)
+        self._magnitudes *= 2.0 / self.size
+
+    def frame(self):
+        """
+        The newest samples (only those received so far while filling up).
+        """
+        return self._frame[self.size - self.filled:]
+
+    def spectrum(self, sample_rate):
+        return spectrum_frequencies(self.size, sample_rate), self._magnitudes
@@ -0,0 +1,48 @@
+import math
+
+import numpy as np
+
+
+class BufferPool:
+    """
+    Named scratch arrays for the audio thread, reserved when the stream starts.
+
+    Each name owns one flat array; get() returns a contiguous view of its
+    first prod(shape) elements, so blocks of any size up to the reserved one
+    reuse the same memory. A request that does not fit reallocates that
+    buffer and is counted in grown, instead of failing mid-stream.
+    """
+
+    def __init__(self, dtype=np.float32):
+        self.dtype = np.dtype(dtype)
+        self.buffers = {}
+        self.grown = 0
+
+    def reserve(self, name, shape, dtype=None):
+        dtype = self.dtype if dtype is None else np.dtype(dtype)
+        size = math.prod(shape)
+        buffer = self.buffers.get(name)
+        if buffer is None or buffer.dtype != dtype or buffer.size < size:
+            self.buffers[name] = np.zeros(size, dtype)
+
+    def get(self, name, shape, dtype=None):
+        dtype = self.dtype if dtype is None else np.dtype(dtype)
+        size = math.prod(shape)
+        buffer = self.buffers.get(name)
+        if buffer is None or buffer.dtype != dtype or buffer.size < size:
+            self.grown += 1
+            self.reserve(name, shape, dtype)
+            buffer = self.buffers[name]
+        return buffer[:size].reshape(shape)
+
+    def nbytes(self):
+        return sum(buffer.nbytes for buffer in self.buffers.values())
+
+
+def scratch(pool, name, shape, dtype=None):
+    """
+    Scratch array from pool, or a freshly allocated float64 one without a pool.
+    """
+    if pool is None:
+        return np.empty(shape, np.float64 if dtype is None else dtype)
+    return pool.get(name, shape, dtype)
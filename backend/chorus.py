@@ -0,0 +1,162 @@
+import numpy as np
+
+from backend.smoothing import DEFAULT_RAMP_TIME, LinearSmoother
+
+
+class ChorusEngine:
+    """
+    Multi-voice stereo chorus on a persistent circular delay line.
+
+    Every block is written into the ring buffer before it is read, so
+    modulated taps can reach back across callback boundaries. The LFO phase
+    is accumulated between blocks and delays are fractional (linear
+    interpolation). Voices are spread evenly in LFO phase; the right channel
+    runs a quarter cycle behind the left one. Scratch arrays are sized for
+    max_block frames up front, so only the returned block is allocated, and
+    nothing when out= is given. Depth, rate and mix changes glide over
+    ramp_time with per-sample ramps. The delay line and taps are kept in
+    dtype; delay positions are always computed in float64.
+    """
+
+    def __init__(self, sample_rate=44100, max_depth=0.05, voices=1, channels=2, max_block=4096,
+                 ramp_time=DEFAULT_RAMP_TIME, dtype=np.float64):
+        self.sample_rate = sample_rate
+        self.dtype = np.dtype(dtype)
+        self.max_depth = max_depth
+        self.voices = voices
+        self.channels = channels
+        self.lfo_phase = 0.0
+        self.write_pos = 0
+        self.ramp_time = ramp_time
+        self.controls = None  # Smoother for (depth, rate, mix), created on the first block
+        self.delay_line = np.zeros((0, channels), self.dtype)
+        self.offsets = (2 * np.pi * np.arange(voices)[:, np.newaxis] / voices
+                        + np.pi / 2 * np.arange(channels))
+        self._allocate(max_block)
+
+    def _allocate(self, max_block):
+        max_delay = int(np.ceil(self.max_depth * self.sample_rate))
+        length = 1 << int(np.ceil(np.log2(max_delay + max_block + 2)))
+        if length > len(self.delay_line):
+            # Keep the history in order, ending just before the write position
+            history = np.roll(self.delay_line, -self.write_pos, axis=0)
+            self.delay_line = np.zeros((length, self.channels), self.dtype)
+            self.delay_line[length - len(history):] = history
+            self.write_pos = 0
+        self.max_block = max_block
+        shape = (self.voices, max_block, self.channels)
+        self._ramp = np.arange(max_block)
+        self._write_index = np.empty(max_block, dtype=np.intp)
+        self._time = np.empty(max_block)
+        self._position = np.empty(shape)
+        self._index = np.empty(shape, dtype=np.intp)
+        self._floor = np.empty(shape)
+        self._fraction = np.empty(shape, self.dtype)
+        self._lower = np.empty(shape, self.dtype)
+        self._upper = np.empty(shape, self.dtype)
+        self._wet = np.empty((max_block, self.channels), self.dtype)
+        self._channel = np.arange(self.channels)
+
+    def reset(self):
+        self.delay_line.fill(0.0)
+        self.lfo_phase = 0.0
+        self.controls = None
+
+    def process(self, block, depth, rate, mix, out=None):
+        # The result goes to out when given, which may be block itself
+        if block.ndim == 1:
+            block = np.column_stack((block, block))
+        frames = block.shape[0]
+        if frames > self.max_block:
+            self._allocate(frames)
+        length = len(self.delay_line)
+        mask = length - 1
+
+        # Write the dry block into the ring
+        ramp = self._ramp[:frames]
+        write_index = self._write_index[:frames]
+        np.add(ramp, self.write_pos, out=write_index)
+        np.bitwise_and(write_index, mask, out=write_index)
+        self.delay_line[write_index] = block
+
+        targets = (min(depth, self.max_depth), rate, mix)
+        if self.controls is None:
+            self.controls = LinearSmoother(targets, self.ramp_time, self.sample_rate)
+        self.controls.set_target(targets)
+        ramping = self.controls.is_ramping()
+        if ramping:
+            depth, rate, mix = self.controls.next_block(frames)
+            mix = mix[:, np.newaxis]
+            lfo_steps = rate * (2 * np.pi / self.sample_rate)
+            lfo_advance = lfo_steps.sum()
+        else:
+            depth, rate, mix = targets
+            lfo_step = 2 * np.pi * rate / self.sample_rate
+            lfo_advance = lfo_step * frames
+
+        if not ramping and mix == 0:
+            if out is None:
+                output = block.copy()
+            else:
+                output = out
+                if out is not block:
+                    out[:] = block
+        else:
+            # Delay in samples for every voice x frame x channel
+            time = self._time[:frames]
+            position = self._position[:, :frames]
+            if ramping:
+                # Phase at each frame is the sum of the steps before it
+                time[0] = 0.0
+                np.cumsum(lfo_steps[:-1], out=time[1:])
+            else:
+                np.multiply(ramp, lfo_step, out=time)
+            time += self.lfo_phase
+            np.add(self.offsets[:, np.newaxis, :], time[np.newaxis, :, np.newaxis], out=position)
+            np.sin(position, out=position)
+            position += 1
+            if ramping:
+                position *= (0.5 * self.sample_rate * depth)[np.newaxis, :, np.newaxis]
+            else:
+                position *= 0.5 * depth * self.sample_rate
+
+            # Fractional read position behind each written sample
+            np.add(ramp, float(self.write_pos), out=time)
+            np.subtract(time[np.newaxis, :, np.newaxis], position, out=position)
+            np.remainder(position, length, out=position)
+            index = self._index[:, :frames]
+            floor = self._floor[:, :frames]
+            np.floor(position, out=floor)
+            np.copyto(index, floor, casting='unsafe')
+            position -= floor  # Now the interpolation fraction
+            if self.dtype != position.dtype:
+                # Mixed-dtype ufuncs allocate a temporary, so convert once
+                fraction = self._fraction[:, :frames]
+                np.copyto(fraction, position)
+                position = fraction
+
+            # Linear interpolation between neighbouring taps
+            flat_line = self.delay_line.ravel()
+            lower = self._lower[:, :frames]
+            upper = self._upper[:, :frames]
+            np.bitwise_and(index, mask, out=index)
+            index *= self.channels
+            index += self._channel
+            np.take(flat_line, index, out=lower, mode='clip')  # Indices are in range already
+            index += self.channels
+            np.remainder(index, flat_line.size, out=index)
+            np.take(flat_line, index, out=upper, mode='clip')
+            upper -= lower
+            upper *= position
+            lower += upper
+
+            wet = self._wet[:frames]
+            np.sum(lower, axis=0, out=wet)
+            wet /= self.voices
+            wet -= block
+            wet *= mix
+            output = np.add(wet, block, out=out)
+
+        self.write_pos = (self.write_pos + frames) & mask
+        self.lfo_phase = (self.lfo_phase + lfo_advance) % (2 * np.pi)
+        return output
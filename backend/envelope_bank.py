@@ -0,0 +1,153 @@
+import numpy as np
+
+ATTACK, DECAY, SUSTAIN, RELEASE, IDLE = range(5)
+
+
+class EnvelopeBank:
+    """
+    ADSR envelope state for every voice slot, advanced for all voices at once.
+
+    Follows ADSREnvelope sample for sample. The states are visited once per
+    block in their attack-to-idle order, each rendering the current segment
+    of all its voices as one (voices, frames) ramp; a voice that changes
+    state mid-block continues from there in the next state's step. Ramps are
+    built with a row-wise np.cumsum from the same start and step as
+    ADSREnvelope's, so both produce the same values bit for bit.
+    """
+
+    def __init__(self, capacity, sample_rate):
+        self.sample_rate = sample_rate
+        self.state = np.full(capacity, IDLE, dtype=np.int8)
+        self.amplitude = np.zeros(capacity)
+        self.released = np.zeros(capacity, dtype=bool)  # note_off seen, acted on in sustain
+        self.time_in_release = np.zeros(capacity)
+        self.release_start = np.zeros(capacity)
+        self.attack_step = np.zeros(capacity)
+        self.decay_step = np.zeros(capacity)
+        self.sustain_level = np.zeros(capacity)
+        self.release_time = np.ones(capacity)
+
+    def start(self, slot, envelope):
+        # Takes the (clamped) settings of an ADSREnvelope and starts the attack
+        self.attack_step[slot] = 1.0 / (envelope.attack_time * self.sample_rate)
+        self.decay_step[slot] = (1.0 - envelope.sustain_level) / (envelope.decay_time * self.sample_rate)
+        self.sustain_level[slot] = envelope.sustain_level
+        self.release_time[slot] = envelope.release_time
+        self.state[slot] = ATTACK
+        self.amplitude[slot] = 0.0
+        self.time_in_release[slot] = 0.0
+        self.released[slot] = False
+
+    def release(self, slot):
+        if self.state[slot] != IDLE:
+            self.released[slot] = True
+
+    def finished(self, slots):
+        return slots[self.state[slots] == IDLE]
+
+    def process(self, slots, num_frames, out):
+        """
+        Writes the next num_frames envelope samples of each voice in slots to
+        the rows of out, a (len(slots), num_frames) array.
+        """
+        # States only move forward, so one visit of each finishes the block;
+        # a state is skipped unless it had voices or the previous one handed some on
+        position = np.zeros(slots.size, dtype=np.intp)
+        counts = np.bincount(self.state[slots], minlength=IDLE + 1)
+        handed_on = False
+        for state, segment in ((ATTACK, self._attack), (DECAY, self._decay), (SUSTAIN, self._sustain),
+                               (RELEASE, self._release), (IDLE, self._idle)):
+            if not (counts[state] or handed_on):
+                continue
+            rows = np.flatnonzero((self.state[slots] == state) & (position < num_frames))
+            handed_on = False
+            if rows.size:
+                position[rows] = end = segment(slots[rows], out, rows, position[rows])
+                handed_on = bool((end < num_frames).any())
+        return out
+
+    # Each segment writes out[row, position:end] for its rows and returns end.
+
+    @staticmethod
+    def _accumulate(start, step, position, num_frames):
+        # Row i is start + step, start + 2 * step, ... from column position[i],
+        # with zeros before it; adding exact zeros keeps the cumsum exact
+        columns = np.arange(num_frames)
+        after = columns >= position[:, np.newaxis]
+        ramp = np.where(after, step[:, np.newaxis], 0.0)
+        ramp[np.arange(len(position)), position] = start + step
+        return np.cumsum(ramp, axis=1, out=ramp), after
+
+    @staticmethod
+    def _write(out, rows, ramp, after, hits, value):
+        # Writes each row's ramp up to its first hit, which is set to value;
+        # returns the end of each row's segment and which rows hit
+        hits &= after
+        hit = hits.any(axis=1)
+        first = np.argmax(hits, axis=1)
+        end = np.where(hit, first + 1, ramp.shape[1])
+        block = out[rows]
+        np.copyto(block, ramp, where=after & (np.arange(ramp.shape[1]) < end[:, np.newaxis]))
+        block[hit, first[hit]] = value[hit]
+        out[rows] = block
+        return end, hit
+
+    def _attack(self, slots, out, rows, position):
+        ramp, after = self._accumulate(self.amplitude[slots], self.attack_step[slots], position, out.shape[1])
+        end, hit = self._write(out, rows, ramp, after, ramp >= 1.0, np.ones(slots.size))
+        self.amplitude[slots] = np.where(hit, 1.0, ramp[:, -1])
+        self.state[slots[hit]] = DECAY
+        return end
+
+    def _decay(self, slots, out, rows, position):
+        sustain_level = self.sustain_level[slots]
+        ramp, after = self._accumulate(self.amplitude[slots], -self.decay_step[slots], position, out.shape[1])
+        end, hit = self._write(out, rows, ramp, after, ramp <= sustain_level[:, np.newaxis], sustain_level)
+        self.amplitude[slots] = np.where(hit, sustain_level, ramp[:, -1])
+        self.state[slots[hit]] = SUSTAIN
+        return end
+
+    def _sustain(self, slots, out, rows, position):
+        # A released voice holds the sustain level for one more sample
+        released = self.released[slots]
+        if released.any():
+            releasing = slots[released]
+            out[rows[released], position[released]] = self.amplitude[releasing]
+            self.state[releasing] = RELEASE
+            self.time_in_release[releasing] = 0.0
+            self.release_start[releasing] = self.amplitude[releasing]
+        held = ~released
+        self._fill(out, rows[held], position[held], self.amplitude[slots[held]])
+        return np.where(released, position + 1, out.shape[1])
+
+    def _release(self, slots, out, rows, position):
+        release_time = self.release_time[slots]
+        step = np.full(slots.size, 1 / self.sample_rate)
+        times, after = self._accumulate(self.time_in_release[slots], step, position, out.shape[1])
+        ramp = self.release_start[slots, np.newaxis] * (1 - times / release_time[:, np.newaxis])
+        end, hit = self._write(out, rows, ramp, after, times >= release_time[:, np.newaxis],
+                               np.zeros(slots.size))
+        self.time_in_release[slots] = times[np.arange(slots.size), end - 1]
+        self.amplitude[slots] = np.where(hit, 0.0, ramp[:, -1])
+        self.state[slots[hit]] = IDLE
+        self.released[slots[hit]] = False
+        return end
+
+    def _idle(self, slots, out, rows, position):
+        self.amplitude[slots] = 0.0
+        self._fill(out, rows, position, self.amplitude[slots])
+        return np.full(slots.size, out.shape[1])
+
+    @staticmethod
+    def _fill(out, rows, position, values):
+        # out[row, position:] = value for each row
+        if rows.size == out.shape[0] and not position.any():
+            out[...] = values[:, np.newaxis]
+            return
+        if not position.any():
+            out[rows] = values[:, np.newaxis]
+            return
+        block = out[rows]
+        after = np.arange(out.shape[1]) >= position[:, np.newaxis]
+        np.copyto(block, np.broadcast_to(values[:, np.newaxis], block.shape), where=after)
+        out[rows] = block
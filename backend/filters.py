@@ -0,0 +1,129 @@
+from functools import lru_cache
+
+import numpy as np
+
+from backend.smoothing import DEFAULT_RAMP_TIME, LinearSmoother
+
+FILTER_TYPES = ('low_pass', 'high_pass')
+
+sosfilt = None  # scipy.signal.sosfilt, bound by load_scipy() on first use
+
+
+def load_scipy():
+    """
+    Imports scipy.signal, the slowest import in the engine (around a second
+    on a cold start). FilterStage calls it on its first block; the GUI calls
+    it before opening the audio stream so the callback never has to.
+    """
+    global sosfilt
+    if sosfilt is None:
+        from scipy.signal import sosfilt as loaded
+        sosfilt = loaded
+
+
+@lru_cache(maxsize=1024)
+def design_filter(filter_type, cutoff, order, sample_rate, dtype=np.float64):
+    """
+    Digital Butterworth filter as second-order sections, memoized on every
+    design parameter.
+
+    The sections are written down directly from the analog prototype poles
+    and the pre-warped bilinear transform, which gives the same response as
+    scipy.signal.butter(..., output='sos') at a small fraction of its cost,
+    so redesigning while a slider is swept stays cheap. dtype=np.float32
+    gives sections for filtering float32 blocks without upcasting them.
+    """
+    if filter_type not in FILTER_TYPES:
+        raise ValueError("Invalid filter type")
+    nyq = 0.5 * sample_rate
+    normal_cutoff = min(max(cutoff / nyq, 1e-6), 1 - 1e-6)
+    k = np.tan(np.pi * normal_cutoff / 2)
+    low_pass = filter_type == 'low_pass'
+
+    sections = []
+    for index in range(order // 2):
+        # Conjugate pole pair of the prototype: s^2 + s / Q + 1
+        inv_q = 2 * np.cos((order - 2 * index - 1) * np.pi / (2 * order))
+        norm = 1 / (1 + k * inv_q + k * k)
+        b0 = k * k * norm if low_pass else norm
+        b1 = 2 * b0 if low_pass else -2 * b0
+        a1 = 2 * (k * k - 1) * norm
+        a2 = (1 - k * inv_q + k * k) * norm
+        sections.append([b0, b1, b0, 1.0, a1, a2])
+    if order % 2:
+        # Real prototype pole: s + 1
+        norm = 1 / (1 + k)
+        b0 = k * norm if low_pass else norm
+        b1 = b0 if low_pass else -b0
+        sections.append([b0, b1, 0.0, 1.0, (k - 1) * norm, 0.0])
+    return np.array(sections, dtype=dtype)
+
+
+class FilterStage:
+    """
+    Streaming Butterworth filter for (frames, channels) blocks.
+
+    Coefficients come from the design_filter cache, so they are only
+    recomputed when the type or cutoff actually changes, and the per-channel
+    sosfilt state is carried from one block to the next. Cutoff changes glide
+    over ramp_time on a log-frequency scale. While a ramp runs, the block is
+    split on a sub_block grid wherever the cutoff has moved more than
+    max_step octaves since the current piece began, and each piece is
+    filtered with coefficients for the cutoff at its start (rounded to
+    whole Hz so the cache still hits). A slow sweep then costs one sosfilt
+    call per block like a held cutoff; a fast one gets a new design every
+    sub_block samples at most.
+    """
+
+    def __init__(self, sample_rate=44100, order=3, ramp_time=DEFAULT_RAMP_TIME, sub_block=128,
+                 max_step=1 / 24):
+        self.sample_rate = sample_rate
+        self.order = order
+        self.sub_block = sub_block
+        self.max_step = max_step
+        self.ramp_time = ramp_time
+        self.cutoff = None  # Log2 cutoff smoother, created on the first block
+        self.filter_type = None
+        self.zi = None
+
+    def reset(self):
+        self.zi = None
+        self.cutoff = None
+
+    def process(self, samples, filter_type, cutoff, out=None):
+        # Filters in the dtype of samples; the result goes to out when given,
+        # which may be samples itself
+        dtype = np.float32 if samples.dtype == np.float32 else np.float64
+        if sosfilt is None:
+            load_scipy()
+        if self.cutoff is None or filter_type != self.filter_type:
+            # A new response type is a discrete switch, so it is not ramped
+            self.cutoff = LinearSmoother(np.log2(max(cutoff, 1.0)), self.ramp_time, self.sample_rate)
+            self.filter_type = filter_type
+        self.cutoff.set_target(np.log2(max(cutoff, 1.0)))
+
+        state_shape = (-(-self.order // 2), 2) + samples.shape[1:]
+        if self.zi is None or self.zi.shape != state_shape or self.zi.dtype != dtype:
+            self.zi = np.zeros(state_shape, dtype)
+
+        if not self.cutoff.is_ramping():
+            sos = design_filter(filter_type, cutoff, self.order, self.sample_rate, dtype)
+            filtered, self.zi = sosfilt(sos, samples, axis=0, zi=self.zi)
+            if out is None:
+                return filtered
+            out[:] = filtered
+            return out
+
+        frames = samples.shape[0]
+        grid = self.cutoff.next_block(frames)[0, ::self.sub_block].tolist()
+        # Indices into grid where a new piece starts
+        starts = [0]
+        for index in range(1, len(grid)):
+            if abs(grid[index] - grid[starts[-1]]) > self.max_step:
+                starts.append(index)
+        filtered = np.empty_like(samples, dtype=dtype) if out is None else out
+        for first, last in zip(starts, starts[1:] + [len(grid)]):
+            start, stop = first * self.sub_block, last * self.sub_block
+            sos = design_filter(filter_type, float(round(2 ** grid[first])), self.order, self.sample_rate, dtype)
+            filtered[start:stop], self.zi = sosfilt(sos, samples[start:stop], axis=0, zi=self.zi)
+        return filtered
@@ -1,8 +1,13 @@
 import numpy as np
-from scipy import signal
 import threading
 import random
 
+from backend.buffer_pool import BufferPool
+from backend.params import OscillatorParams, ParameterStore
+from backend.smoothing import LinearSmoother
+from backend.utils import midi_note_number_to_frequency
+from backend.voice_bank import STEAL_POLICIES, VoiceBank
+
 class ADSREnvelope:
     def __init__(self, attack_time, decay_time, sustain_level, release_time, sample_rate):
         self.attack_time = max(attack_time, 1e-7)  # Avoid division by zero
@@ -25,46 +30,112 @@ class ADSREnvelope:
             self.note_released = True
             print("note_off called: transitioning to release phase")
 
-    def process(self, num_frames):
-        envelope = np.zeros(num_frames)
-        for i in range(num_frames):
+    def process(self, num_frames, out=None):
+        envelope = np.empty(num_frames) if out is None else out
+        pos = 0
+        while pos < num_frames:
             if self.state == 'attack':
-                self.current_amplitude += 1.0 / (self.attack_time * self.sample_rate)
-                if self.current_amplitude >= 1.0:
-                    self.current_amplitude = 1.0
-                    self.state = 'decay'
-                envelope[i] = self.current_amplitude
+                pos += self._process_attack(envelope, pos)
             elif self.state == 'decay':
-                self.current_amplitude -= (1.0 - self.sustain_level) / (self.decay_time * self.sample_rate)
-                if self.current_amplitude <= self.sustain_level:
-                    self.current_amplitude = self.sustain_level
-                    self.state = 'sustain'
-                envelope[i] = self.current_amplitude
+                pos += self._process_decay(envelope, pos)
             elif self.state == 'sustain':
-                if self.note_released:
-                    self.state = 'release'
-                    self.time_in_state = 0.0
-                    self.release_start_amplitude = self.current_amplitude
-                    print("Transitioning to release phase from sustain")
-                envelope[i] = self.current_amplitude
+                pos += self._process_sustain(envelope, pos)
             elif self.state == 'release':
-                self.time_in_state += 1 / self.sample_rate
-                if self.time_in_state >= self.release_time:
-                    self.current_amplitude = 0.0
-                    self.state = 'idle'
-                    self.note_released = False
-                    print("Envelope reached zero, transitioning to idle state")
-                else:
-                    self.current_amplitude = self.release_start_amplitude * (1 - self.time_in_state / self.release_time)
-                envelope[i] = self.current_amplitude
+                pos += self._process_release(envelope, pos)
             else:  # 'idle'
-                envelope[i] = 0.0
+                envelope[pos:] = 0.0
                 self.current_amplitude = 0.0
+                pos = num_frames
         return envelope
+
+    # Each segment writes envelope[pos:pos + n] and returns n. Ramps are built
+    # with np.cumsum, which adds sequentially, so they match repeated `+=`
+    # bit for bit; the transition sample is located on the ramp itself.
+
+    @staticmethod
+    def _segment_length(estimate, remaining):
+        # Samples to compute for a ramp expected to end after `estimate`
+        # steps; the margin absorbs rounding in the accumulated ramp.
+        if not estimate < remaining:
+            return remaining
+        return min(remaining, max(int(np.ceil(estimate)), 0) + 2)
+
+    @staticmethod
+    def _accumulate(start, step, count):
+        ramp = np.full(count, step)
+        ramp[0] = start + step
+        return np.cumsum(ramp, out=ramp)
+
+    def _process_attack(self, envelope, pos):
+        step = 1.0 / (self.attack_time * self.sample_rate)
+        count = self._segment_length((1.0 - self.current_amplitude) / step, len(envelope) - pos)
+        ramp = self._accumulate(self.current_amplitude, step, count)
+        hits = np.flatnonzero(ramp >= 1.0)
+        if hits.size:
+            n = int(hits[0]) + 1
+            envelope[pos:pos + n - 1] = ramp[:n - 1]
+            envelope[pos + n - 1] = 1.0
+            self.current_amplitude = 1.0
+            self.state = 'decay'
+            return n
+        envelope[pos:pos + count] = ramp
+        self.current_amplitude = float(ramp[-1])
+        return count
+
+    def _process_decay(self, envelope, pos):
+        step = (1.0 - self.sustain_level) / (self.decay_time * self.sample_rate)
+        remaining = len(envelope) - pos
+        estimate = (self.current_amplitude - self.sustain_level) / step if step > 0 else 0.0
+        count = self._segment_length(estimate, remaining)
+        ramp = self._accumulate(self.current_amplitude, -step, count)
+        hits = np.flatnonzero(ramp <= self.sustain_level)
+        if hits.size:
+            n = int(hits[0]) + 1
+            envelope[pos:pos + n - 1] = ramp[:n - 1]
+            envelope[pos + n - 1] = self.sustain_level
+            self.current_amplitude = self.sustain_level
+            self.state = 'sustain'
+            return n
+        envelope[pos:pos + count] = ramp
+        self.current_amplitude = float(ramp[-1])
+        return count
+
+    def _process_sustain(self, envelope, pos):
+        if self.note_released:
+            # The sample at the transition still carries the sustain level
+            self.state = 'release'
+            self.time_in_state = 0.0
+            self.release_start_amplitude = self.current_amplitude
+            print("Transitioning to release phase from sustain")
+            envelope[pos] = self.current_amplitude
+            return 1
+        envelope[pos:] = self.current_amplitude
+        return len(envelope) - pos
+
+    def _process_release(self, envelope, pos):
+        step = 1 / self.sample_rate
+        count = self._segment_length((self.release_time - self.time_in_state) / step, len(envelope) - pos)
+        times = self._accumulate(self.time_in_state, step, count)
+        hits = np.flatnonzero(times >= self.release_time)
+        n = int(hits[0]) + 1 if hits.size else count
+        ramp = self.release_start_amplitude * (1 - times[:n] / self.release_time)
+        self.time_in_state = float(times[n - 1])
+        if hits.size:
+            ramp[-1] = 0.0
+            self.current_amplitude = 0.0
+            self.state = 'idle'
+            self.note_released = False
+            print("Envelope reached zero, transitioning to idle state")
+        else:
+            self.current_amplitude = float(ramp[-1])
+        envelope[pos:pos + n] = ramp
+        return n
+
 class Note:
     def __init__(self, frequency, velocity, sample_rate, adsr_params):
         self.frequency = frequency
         self.velocity = velocity
+        # Carries the settings; VoiceBank advances the envelope itself
         self.envelope = ADSREnvelope(
             attack_time=adsr_params['attack_time'],
             decay_time=adsr_params['decay_time'],
@@ -77,34 +148,92 @@ class Note:
         self.just_started = True
 
 class Generator:
-    def __init__(self, sample_rate=44100):
-        self.oscillators = []
+    def __init__(self, sample_rate=44100, max_voices=256, params=None, polyphony=16, steal_policy='oldest',
+                 render_threads=1, min_voices_per_thread=32):
+        if steal_policy not in STEAL_POLICIES:
+            raise ValueError("Invalid voice stealing policy")
+        self.params = params or ParameterStore()  # Snapshots read once per block
         self.sample_rate = sample_rate
-        self.active_notes = []  # List of Note instances
-        self.phase = {}  # Dictionary to track phase for each oscillator and note
+        self.voices = VoiceBank(max_voices, sample_rate)  # Preallocated voice storage
+        self.polyphony = min(polyphony, max_voices)  # Voices that may sound at once
+        self.steal_policy = steal_policy
+        if render_threads > 1:
+            self.voices.set_threads(render_threads, min_voices_per_thread)
         self.lock = threading.Lock()
+        self.volume_smoother = None  # Per-sample volume ramps, one row per oscillator
+        self.pool = None  # Scratch buffers for the float32 stream mode, see prepare()
         self.last_processed_samples = np.zeros(1)  # Initialize with a single zero
 
-    def add_note(self, frequency, velocity, adsr_params, MAX_POLYPHONY=16):
+    def prepare(self, max_frames, dtype=np.float32):
+        """
+        Sizes a buffer pool for blocks of up to max_frames and renders in dtype
+        from then on. Called once when the stream starts; afterwards
+        generate_samples(out=...) renders a block without allocating buffers.
+        """
+        pool = BufferPool(dtype)
+        oscillators = max(len(self.params.snapshot.oscillators), 1)
+        with self.lock:
+            self.voices.prepare(pool, max_frames, self.polyphony, oscillators)
+            pool.reserve('volumes', (oscillators, max_frames), np.float64)
+            self.pool = pool
+
+    def set_render_threads(self, threads, min_voices_per_thread=32):
+        """
+        Splits voice rendering across up to threads threads once at least
+        min_voices_per_thread voices per thread are sounding (1 = serial).
+        """
         with self.lock:
-            if len(self.active_notes) >= MAX_POLYPHONY:
-                oldest_note = self.active_notes.pop(0)
-                keys_to_remove = [key for key in self.phase if key[0] == oldest_note]
-                for key in keys_to_remove:
-                    del self.phase[key]
-            note = Note(frequency, velocity, self.sample_rate, adsr_params)
-            self.active_notes.append(note)
+            self.voices.set_threads(threads, min_voices_per_thread)
+
+    def close(self):
+        # Stops the voice rendering threads, if any
+        with self.lock:
+            self.voices.close()
+
+    def note_on(self, channel, note_number, velocity, adsr_params):
+        with self.lock:
+            self._start_note((channel, note_number), midi_note_number_to_frequency(note_number),
+                             velocity, adsr_params)
+
+    def note_off(self, channel, note_number):
+        with self.lock:
+            self._release_note((channel, note_number))
+
+    def add_note(self, frequency, velocity, adsr_params, MAX_POLYPHONY=None):
+        # Notes started by frequency are keyed by it, so remove_note can find them
+        with self.lock:
+            self._start_note((None, frequency), frequency, velocity, adsr_params, MAX_POLYPHONY)
 
     def remove_note(self, frequency):
         with self.lock:
-            for note in self.active_notes:
-                if note.frequency == frequency:
+            self._release_note((None, frequency))
+
+    def _start_note(self, key, frequency, velocity, adsr_params, polyphony=None):
+        # Caller holds self.lock
+        voices = self.voices
+        note = Note(frequency, velocity, self.sample_rate, adsr_params)
+        slot = voices.slot_for_key(key)
+        if slot is not None:
+            if self.steal_policy == 'retrigger':
+                voices.retrigger(slot, note)
+                return
+            voices.release(slot)  # A repeated note-on ends the held note first
+        if voices.count() >= min(polyphony or self.polyphony, voices.capacity):
+            voices.steal(self.steal_policy)
+        voices.allocate(note, key)
 
-                    note.envelope.note_off()
-                    note.active = False
+    def _release_note(self, key):
+        # Caller holds self.lock
+        slot = self.voices.slot_for_key(key)
+        if slot is not None:
+            self.voices.release(slot)
 
     def set_oscillators(self, oscillators):
-        self.oscillators = oscillators
+        # Publishes a snapshot of the given oscillators' current settings
+        self.params.set_oscillators([
+            osc if isinstance(osc, OscillatorParams) else OscillatorParams.from_object(osc)
+            for osc in oscillators
+        ])
 
     def apply_fade(self, samples, fade_in_samples, fade_out_samples):
         total_samples = len(samples)
@@ -121,100 +250,54 @@ class Generator:
     def apply_soft_clipping(self, samples, threshold=0.9):
         return samples / (1 + np.abs(samples / threshold))
 
-    def generate_samples(self, num_frames):
-        buffer = np.zeros((num_frames, 2))  # Initialize stereo buffer
-        with self.lock:
-            notes = self.active_notes.copy()
-        if not notes:
-            return buffer
-
-        notes_to_remove = []
-
-        for note in notes:
-            frequency = note.frequency
-            velocity = note.velocity
-            note_buffer = np.zeros((num_frames, 2))  # Stereo buffer for the note
-            envelope = note.envelope.process(num_frames)
-            if note.envelope.state == 'idle':
-                notes_to_remove.append(note)
-                continue
-            for osc in self.oscillators:
-                # Get oscillator parameters
-                shape = osc.shape
-                base_octave = osc.base_octave
-                pitch_semitones = osc.pitch_semitones
-                fine_tune = osc.fine_tune
-                amplitude = (velocity) * osc.volume / 4  # Scale amplitude
-
-                # Calculate the final frequency for this oscillator
-                freq = frequency * (2 ** base_octave)
-                freq *= 2 ** (pitch_semitones / 12)
-                freq *= 2 ** (fine_tune / 1200)
-
-                # Phase tracking key
-                key = (note, osc)
-
-                # Initialize phase if not already done
-                if key not in self.phase:
-                    self.phase[key] = np.random.uniform(0, 2 * np.pi)
-                phase = self.phase[key]
-
-                # Calculate phase increment per sample
-                phase_increment = 2 * np.pi * freq / self.sample_rate
-
-                # Generate phases for each sample
-                sample_indices = np.arange(num_frames)
-                phases = phase + sample_indices * phase_increment
-
-                # Update phase for next buffer
-                self.phase[key] = (phases[-1] + phase_increment) % (2 * np.pi)
-
-                # Generate waveform based on shape
-                if shape == 'sine':
-                    samples = amplitude * np.sin(phases)
-                elif shape == 'square':
-                    samples = amplitude * signal.square(phases)
-                elif shape == 'sawtooth':
-                    samples = amplitude * signal.sawtooth(phases)
-                elif shape == 'triangle':
-                    samples = amplitude * signal.sawtooth(phases, width=0.5)
-                elif shape == 'whitenoise':
-                    samples = amplitude * np.random.normal(0, 1, num_frames)
-                else:
-                    samples = amplitude * np.sin(phases)
-
-                # Multiply samples by the envelope
-                samples *= envelope
-
-                # Ensure samples are in the shape (num_frames, 1)
-                samples = samples[:, np.newaxis]
-
-                # Apply fade-in if the note has just started
-                if note.just_started:
-                    fade_in_samples = 100  # Number of samples for fade-in (adjust as needed)
-                    samples = self.apply_fade(samples, fade_in_samples, 0)
-                    note.just_started = False  # Reset the flag after applying fade-in
-
-                # Duplicate the samples for both channels (stereo)
-                samples_stereo = np.column_stack((samples, samples))
-
-                # Add to note buffer
-                note_buffer += samples_stereo
-
-            # Add note buffer to main buffer
-            buffer += note_buffer
-
-        # Remove notes that have finished releasing
+    def generate_samples(self, num_frames, events=(), out=None):
+        """
+        Renders num_frames stereo samples, into out when given.
+
+        events are (offset, kind, channel, note_number, velocity, adsr_params)
+        tuples, kind being 'note_on' or 'note_off' (velocity and adsr_params
+        are only used for note-ons). Each is applied at its sample offset inside
+        the block: the voices are rendered up to the offset, the event is
+        applied, and rendering continues from there.
+        """
+        if out is None:
+            out = np.zeros((num_frames, 2))  # Initialize stereo buffer
+        snapshot = self.params.snapshot  # One consistent snapshot per block
+        oscillators, stereo = snapshot.oscillators, snapshot.stereo
+        volumes = self.volume_ramps(oscillators, num_frames)
         with self.lock:
-            for note in notes_to_remove:
-                self.active_notes.remove(note)
-                # Clean up phase data
-                keys_to_remove = [key for key in self.phase if key[0] == note]
-                for key in keys_to_remove:
-                    del self.phase[key]
+            if not events:
+                # All voices and oscillators are rendered in one batched pass
+                self.voices.render(num_frames, oscillators, volumes, out=out, stereo=stereo)
+            else:
+                position = 0
+                for offset, kind, channel, note_number, velocity, adsr_params in sorted(
+                        events, key=lambda e: e[0]):
+                    offset = min(max(int(offset), position), num_frames)
+                    if offset > position:
+                        self.voices.render(offset - position, oscillators, volumes[:, position:offset],
+                                           out=out[position:offset], stereo=stereo)
+                        position = offset
+                    if kind == 'note_on':
+                        frequency = midi_note_number_to_frequency(note_number)
+                        self._start_note((channel, note_number), frequency, velocity, adsr_params)
+                    else:
+                        self._release_note((channel, note_number))
+                if position < num_frames:
+                    self.voices.render(num_frames - position, oscillators, volumes[:, position:],
+                                       out=out[position:], stereo=stereo)
+        return out
 
-        return buffer
+    def volume_ramps(self, oscillators, num_frames):
+        # Mixer moves glide to their new level instead of stepping at block edges
+        targets = [osc.volume for osc in oscillators]
+        if self.volume_smoother is None or len(self.volume_smoother.target) != len(targets):
+            self.volume_smoother = LinearSmoother(targets, sample_rate=self.sample_rate)
+        out = None
+        if self.pool is not None:
+            out = self.pool.get('volumes', (len(targets), num_frames), np.float64)
+        return self.volume_smoother.next_block(num_frames, targets, out=out)
 
     def has_active_notes(self):
         with self.lock:
-            return len(self.active_notes) > 0
\ No newline at end of file
+            return self.voices.count() > 0
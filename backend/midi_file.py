@@ -0,0 +1,99 @@
+import struct
+
+DEFAULT_TEMPO = 500000  # Microseconds per quarter note (120 BPM)
+
+
+def _read_variable_length(data, pos):
+    value = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value = (value << 7) | (byte & 0x7F)
+        if not byte & 0x80:
+            return value, pos
+
+
+def _read_track(data, pos, end):
+    """
+    Yields (tick, status, payload) for every event of one MTrk chunk.
+    """
+    tick = 0
+    running_status = None
+    while pos < end:
+        delta, pos = _read_variable_length(data, pos)
+        tick += delta
+        status = data[pos]
+        if status == 0xFF:
+            meta_type = data[pos + 1]
+            length, pos = _read_variable_length(data, pos + 2)
+            yield tick, 0xFF, (meta_type, data[pos:pos + length])
+            pos += length
+        elif status in (0xF0, 0xF7):
+            length, pos = _read_variable_length(data, pos + 1)
+            pos += length
+        else:
+            if status & 0x80:
+                running_status = status
+                pos += 1
+            elif running_status is None:
+                raise ValueError("MIDI data byte without a status byte")
+            status = running_status
+            size = 1 if status & 0xF0 in (0xC0, 0xD0) else 2
+            yield tick, status, data[pos:pos + size]
+            pos += size
+
+
+def read_midi_file(path):
+    """
+    Reads a standard MIDI file (format 0 or 1) into a time-sorted list of
+    (time_seconds, 'note_on' | 'note_off', channel, note_number, velocity).
+
+    Tempo changes from any track are applied to all tracks; a note-on with
+    velocity 0 is reported as a note-off.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    if data[:4] != b'MThd':
+        raise ValueError(f"Not a standard MIDI file: '{path}'")
+    header_length, = struct.unpack('>I', data[4:8])
+    _, track_count, division = struct.unpack('>HHH', data[8:14])
+    if division & 0x8000:
+        raise ValueError("SMPTE time division is not supported")
+
+    pos = 8 + header_length
+    raw_events = []
+    tempo_changes = []
+    for _ in range(track_count):
+        chunk_type = data[pos:pos + 4]
+        chunk_length, = struct.unpack('>I', data[pos + 4:pos + 8])
+        start = pos + 8
+        pos = start + chunk_length
+        if chunk_type != b'MTrk':
+            continue
+        for tick, status, payload in _read_track(data, start, pos):
+            if status == 0xFF:
+                meta_type, meta_data = payload
+                if meta_type == 0x51:
+                    tempo_changes.append((tick, int.from_bytes(meta_data, 'big')))
+                continue
+            kind = status & 0xF0
+            if kind == 0x90 and payload[1] > 0:
+                raw_events.append((tick, 'note_on', status & 0x0F, payload[0], payload[1]))
+            elif kind == 0x80 or kind == 0x90:
+                raw_events.append((tick, 'note_off', status & 0x0F, payload[0], 0))
+
+    # Convert ticks to seconds through the tempo map
+    tempo_changes.sort()
+    raw_events.sort(key=lambda event: (event[0], event[1] == 'note_on'))
+    events = []
+    segment_tick, segment_time, tempo = 0, 0.0, DEFAULT_TEMPO
+    changes = iter(tempo_changes)
+    next_change = next(changes, None)
+    for tick, kind, channel, note_number, velocity in raw_events:
+        while next_change is not None and next_change[0] <= tick:
+            segment_time += (next_change[0] - segment_tick) * tempo / (division * 1e6)
+            segment_tick, tempo = next_change
+            next_change = next(changes, None)
+        time = segment_time + (tick - segment_tick) * tempo / (division * 1e6)
+        events.append((time, kind, channel, note_number, velocity))
+    return events
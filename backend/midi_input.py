@@ -0,0 +1,78 @@
+import heapq
+import time
+
+from backend.ring_buffer import EventRingBuffer
+
+# Event kinds, shared with the offline renderer's event lists
+NOTE_ON = 'note_on'
+NOTE_OFF = 'note_off'
+CONTROL = 'control'
+
+
+class MidiInput:
+    """
+    One MIDI input port feeding a lock-free event queue.
+
+    Messages are handled in RtMidi's own input callback: each one is
+    stamped with time.perf_counter_ns() on arrival and pushed as
+    (arrival_ns, kind, channel, number, value) into an EventRingBuffer that
+    the audio callback drains directly, so note events never wait for a
+    polling loop or the Qt event loop. Each port has its own queue, which
+    keeps every queue single-producer.
+    """
+
+    def __init__(self, port, capacity=1024):
+        import rtmidi  # Loads the system MIDI library, so only when a port is opened
+
+        self.port = port
+        self.events = EventRingBuffer(capacity)
+        self.midi_in = rtmidi.RtMidiIn()
+        try:
+            self.midi_in.openPort(port)
+            self.midi_in.ignoreTypes(False, False, False)
+            self.midi_in.setCallback(self.on_message)
+            port_name = self.midi_in.getPortName(port)
+            print(f"MIDI input started on port {port}: {port_name}")
+        except Exception as e:
+            print(f"Failed to open MIDI port {port}: {e}")
+
+    def on_message(self, midi):
+        # Runs on the RtMidi input thread; keep it to a timestamp and a push
+        arrival = time.perf_counter_ns()
+        if midi.isNoteOn():
+            event = (arrival, NOTE_ON, midi.getChannel(), midi.getNoteNumber(), midi.getVelocity())
+        elif midi.isNoteOff():
+            event = (arrival, NOTE_OFF, midi.getChannel(), midi.getNoteNumber(), 0)
+        elif midi.isController():
+            event = (arrival, CONTROL, midi.getChannel(), midi.getControllerNumber(),
+                     midi.getControllerValue())
+        else:
+            return
+        self.events.push(event)
+
+    def close(self):
+        self.midi_in.cancelCallback()
+        self.midi_in.closePort()
+        print(f"MIDI input stopped on port {self.port}")
+
+
+def open_midi_inputs():
+    """
+    Opens every available input port; returns an empty list if there are none.
+    """
+    import rtmidi
+
+    port_count = rtmidi.RtMidiIn().getPortCount()
+    if port_count == 0:
+        print("NO MIDI INPUT PORTS!")
+    return [MidiInput(port) for port in range(port_count)]
+
+
+def drain_events(inputs):
+    """
+    Events queued on all inputs since the last call, in arrival order.
+    """
+    queued = [midi_input.events.drain() for midi_input in inputs]
+    if len(queued) == 1:
+        return queued[0]
+    return list(heapq.merge(*queued))
@@ -0,0 +1,147 @@
+import threading
+
+
+class _Record:
+    """
+    Base for immutable slotted parameter records.
+    """
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable; use replace()")
+
+    def _set(self, **values):
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def replace(self, **changes):
+        values = self.as_dict()
+        values.update(changes)
+        return type(self)(**values)
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self._fields}
+
+    def __repr__(self):
+        values = ", ".join(f"{name}={getattr(self, name)!r}" for name in self._fields)
+        return f"{type(self).__name__}({values})"
+
+
+class OscillatorParams(_Record):
+    """
+    Settings of one oscillator, plus the frequency ratio they imply.
+    """
+    __slots__ = ('shape', 'volume', 'base_octave', 'pitch_semitones', 'fine_tune', 'ratio')
+    _fields = ('shape', 'volume', 'base_octave', 'pitch_semitones', 'fine_tune')
+
+    def __init__(self, shape='sine', volume=1.0, base_octave=0, pitch_semitones=0, fine_tune=0):
+        ratio = 2 ** base_octave * 2 ** (pitch_semitones / 12) * 2 ** (fine_tune / 1200)
+        self._set(shape=shape, volume=volume, base_octave=base_octave,
+                  pitch_semitones=pitch_semitones, fine_tune=fine_tune, ratio=ratio)
+
+    @classmethod
+    def from_object(cls, source):
+        """
+        Captures the current settings of anything exposing the oscillator
+        attributes (e.g. an OscillatorWidget).
+        """
+        return cls(source.shape, source.volume, source.base_octave, source.pitch_semitones, source.fine_tune)
+
+
+class FilterParams(_Record):
+    __slots__ = ('filter_type', 'cutoff')
+    _fields = __slots__
+
+    def __init__(self, filter_type='low_pass', cutoff=20000):
+        self._set(filter_type=filter_type, cutoff=cutoff)
+
+
+class ChorusParams(_Record):
+    __slots__ = ('depth', 'rate', 'mix')
+    _fields = __slots__
+
+    def __init__(self, depth=0.005, rate=1.0, mix=0.0):
+        self._set(depth=depth, rate=rate, mix=mix)
+
+
+class ADSRParams(_Record):
+    """
+    Envelope times in seconds and sustain level; as_dict() gives the
+    adsr_params mapping Generator.note_on takes.
+    """
+    __slots__ = ('attack_time', 'decay_time', 'sustain_level', 'release_time')
+    _fields = __slots__
+
+    def __init__(self, attack_time=0.1, decay_time=0.5, sustain_level=0.5, release_time=0.1):
+        self._set(attack_time=attack_time, decay_time=decay_time, sustain_level=sustain_level,
+                  release_time=release_time)
+
+
+class StereoParams(_Record):
+    """
+    Voice placement: pan (-1 left to 1 right) centres the voices, spread
+    (0 to 1) fans them across the field by pitch.
+    """
+    __slots__ = ('pan', 'spread')
+    _fields = __slots__
+
+    def __init__(self, pan=0.0, spread=0.0):
+        self._set(pan=pan, spread=spread)
+
+
+class ParameterSnapshot(_Record):
+    __slots__ = ('version', 'oscillators', 'filter', 'chorus', 'stereo', 'adsr')
+    _fields = __slots__
+
+    def __init__(self, version, oscillators, filter, chorus, stereo, adsr):
+        self._set(version=version, oscillators=tuple(oscillators), filter=filter, chorus=chorus,
+                  stereo=stereo, adsr=adsr)
+
+
+class ParameterStore:
+    """
+    Versioned, atomically replaced snapshot of the synth parameters.
+
+    The GUI publishes changes by building a new snapshot and swapping the
+    snapshot reference (a single atomic assignment); the audio thread reads
+    store.snapshot once per block and never sees a half-applied change or
+    touches a Qt widget. The lock only serializes publishers.
+    """
+
+    def __init__(self, oscillators=(), filter=None, chorus=None, stereo=None, adsr=None):
+        self._lock = threading.Lock()
+        self.snapshot = ParameterSnapshot(0, oscillators, filter or FilterParams(), chorus or ChorusParams(),
+                                          stereo or StereoParams(), adsr or ADSRParams())
+
+    def publish(self, **changes):
+        with self._lock:
+            self.snapshot = self.snapshot.replace(version=self.snapshot.version + 1, **changes)
+
+    def set_oscillators(self, oscillators):
+        self.publish(oscillators=tuple(oscillators))
+
+    def update_oscillator(self, index, params):
+        with self._lock:
+            oscillators = list(self.snapshot.oscillators)
+            oscillators[index] = params
+            self.snapshot = self.snapshot.replace(version=self.snapshot.version + 1, oscillators=oscillators)
+
+    def update_filter(self, **changes):
+        with self._lock:
+            self.snapshot = self.snapshot.replace(version=self.snapshot.version + 1,
+                                                  filter=self.snapshot.filter.replace(**changes))
+
+    def update_chorus(self, **changes):
+        with self._lock:
+            self.snapshot = self.snapshot.replace(version=self.snapshot.version + 1,
+                                                  chorus=self.snapshot.chorus.replace(**changes))
+
+    def update_stereo(self, **changes):
+        with self._lock:
+            self.snapshot = self.snapshot.replace(version=self.snapshot.version + 1,
+                                                  stereo=self.snapshot.stereo.replace(**changes))
+
+    def update_adsr(self, **changes):
+        with self._lock:
+            self.snapshot = self.snapshot.replace(version=self.snapshot.version + 1,
+                                                  adsr=self.snapshot.adsr.replace(**changes))
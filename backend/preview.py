@@ -0,0 +1,74 @@
+from functools import lru_cache
+
+import numpy as np
+
+from backend.voice_bank import render_waveform
+
+PREVIEW_DURATION = 0.01  # Seconds visible in the oscillator waveform plot
+PREVIEW_SAMPLE_RATE = 44100
+SPECTRUM_LIMIT = 20000   # Upper end of the oscillator FFT plot
+
+
+def _read_only(*arrays):
+    for array in arrays:
+        array.flags.writeable = False
+    return arrays
+
+
+@lru_cache(maxsize=256)
+def preview_waveform(shape, frequency, duration=PREVIEW_DURATION, sample_rate=PREVIEW_SAMPLE_RATE):
+    """
+    (t, y) for only the visible span of the oscillator preview.
+    """
+    t = np.arange(int(sample_rate * duration)) / sample_rate
+    if shape == 'whitenoise':
+        y = np.random.normal(-1, 1, len(t))
+    else:
+        y = render_waveform(shape, 2 * np.pi * frequency * t)
+    return _read_only(t, y)
+
+
+def harmonic_series(shape, frequency, limit=SPECTRUM_LIMIT):
+    """
+    Frequencies and amplitudes of the partials of a periodic shape up to
+    limit Hz, from the shape's Fourier series.
+    """
+    if frequency <= 0:
+        return np.zeros(0), np.zeros(0)
+    k = np.arange(1, int(limit // frequency) + 1)
+    if shape == 'square':
+        k = k[k % 2 == 1]
+        amplitudes = 4 / (np.pi * k)
+    elif shape == 'sawtooth':
+        amplitudes = 2 / (np.pi * k)
+    elif shape == 'triangle':
+        k = k[k % 2 == 1]
+        amplitudes = 8 / (np.pi * k) ** 2
+    else:  # 'sine'
+        k = k[:1]
+        amplitudes = np.ones(len(k))
+    return k * frequency, amplitudes
+
+
+@lru_cache(maxsize=256)
+def preview_spectrum(shape, frequency, sample_rate=PREVIEW_SAMPLE_RATE):
+    """
+    (frequencies, magnitudes) drawn in the oscillator FFT plot, in the same
+    2/N * |FFT| scale as a one-second analysis.
+
+    Periodic shapes are drawn analytically as one spike per partial (0, a, 0
+    triples); white noise does not depend on frequency, so its spectrum is
+    computed once and cached.
+    """
+    if shape == 'whitenoise':
+        if frequency is not None:
+            return preview_spectrum(shape, None, sample_rate)
+        y = np.random.normal(-1, 1, sample_rate)
+        yf = 2.0 / sample_rate * np.abs(np.fft.rfft(y)[:sample_rate // 2])
+        xf = np.fft.rfftfreq(sample_rate, d=1 / sample_rate)[:sample_rate // 2]
+        return _read_only(xf, yf)
+    partials, amplitudes = harmonic_series(shape, frequency, min(SPECTRUM_LIMIT, sample_rate / 2))
+    xf = np.repeat(partials, 3)
+    yf = np.zeros(len(xf))
+    yf[1::3] = amplitudes
+    return _read_only(xf, yf)
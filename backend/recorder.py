@@ -0,0 +1,185 @@
+import os
+import queue
+import tempfile
+import threading
+import wave
+
+import numpy as np
+
+from backend.waveform_pyramid import MinMaxPyramid
+
+
+class StreamRecorder:
+    """
+    Records mono float32 blocks to a temporary file from a background
+    writer thread.
+
+    append() only hands the block to a queue capped at max_pending blocks,
+    so RAM use is bounded however long the recording runs, and stop() only
+    queues an end marker; it never waits for the writer. on_finished, if
+    given, is called from the writer thread once the file is complete (a
+    Qt signal's emit makes that a queued call on the GUI thread). The
+    finished recording is read back as a read-only memory map and exported
+    in chunks. The writer also builds a min/max pyramid as it goes, in
+    level files next to the recording, so any span can be displayed at
+    screen resolution without touching the full recording.
+    """
+
+    def __init__(self, directory=None, max_pending=256, chunk_frames=1 << 16, on_finished=None):
+        self.directory = directory
+        self.chunk_frames = chunk_frames
+        self.max_pending = max_pending
+        self.on_finished = on_finished
+        self.queue = queue.Queue()  # Bounded by append(), so the end marker always fits
+        self.path = None
+        self.frames = 0
+        self.peak = 0.0
+        self.dropped_blocks = 0  # Blocks append() discarded while the queue was full
+        self.dropped_frames = 0
+        self.recording = False
+        self.writing = False  # True until the writer has finished the file
+        self.pyramid = MinMaxPyramid()
+        self._file = None
+        self._thread = None
+
+    def start(self):
+        self.stop()
+        self.close()
+        fd, self.path = tempfile.mkstemp(prefix='recording_', suffix='.f32', dir=self.directory)
+        self._file = os.fdopen(fd, 'wb')
+        self.frames = 0
+        self.peak = 0.0
+        self.dropped_blocks = 0
+        self.dropped_frames = 0
+        self.pyramid = MinMaxPyramid(self.path)  # Level files next to the recording
+        self.recording = True
+        self.writing = True
+        self._thread = threading.Thread(target=self._write_loop, daemon=True)
+        self._thread.start()
+
+    def append(self, samples):
+        if not self.recording:
+            return
+        if self.queue.qsize() >= self.max_pending:
+            self.dropped_blocks += 1
+            self.dropped_frames += len(samples)
+            return
+        self.queue.put_nowait(np.array(samples, dtype=np.float32))
+
+    def stop(self):
+        if self.recording:
+            self.recording = False
+            self.queue.put_nowait(None)  # End marker; the writer finishes in the background
+
+    def _write_loop(self):
+        while True:
+            block = self.queue.get()
+            if block is None:
+                break
+            block.tofile(self._file)
+            self.pyramid.append(block)
+            if len(block):
+                self.peak = max(self.peak, float(np.abs(block).max()))
+            self.frames += len(block)
+        self.pyramid.finish()
+        self._file.close()
+        self.writing = False
+        if self.on_finished is not None:
+            self.on_finished()
+
+    def wait(self):
+        if self._thread is not None:
+            self._thread.join()
+
+    def status_text(self):
+        text = f"recorded {self.frames} frames"
+        if self.dropped_blocks:
+            text += f", {self.dropped_blocks} blocks dropped ({self.dropped_frames} frames missing)"
+        return text
+
+    def has_data(self):
+        return not self.writing and self.path is not None and self.frames > 0
+
+    def samples(self):
+        """
+        The finished recording as a read-only memory map (no copy in RAM).
+        """
+        self.wait()
+        if self.path is None or self.frames == 0:
+            return np.zeros(0, dtype=np.float32)
+        return np.memmap(self.path, dtype=np.float32, mode='r', shape=(self.frames,))
+
+    def view(self, start, end, max_points):
+        """
+        Returns (positions, values) tracing samples [start, end) with at most
+        about 2 * max_points points: the raw samples when they fit, otherwise
+        alternating bucket minima and maxima. Spans too short for even the
+        finest pyramid level to fill max_points buckets are bucketed from
+        the recording directly, so the point count stays near max_points
+        at every zoom.
+        """
+        self.wait()
+        start = max(int(start), 0)
+        end = min(int(end), self.frames)
+        if end <= start:
+            return np.zeros(0), np.zeros(0, dtype=np.float32)
+        span = end - start
+        if span <= 2 * max_points:
+            return np.arange(start, end), np.asarray(self.samples()[start:end])
+        if span < self.pyramid.base_bucket * max_points:
+            # At most base_bucket * max_points samples read from the memory map
+            size = -(-span // max_points)
+            positions = np.arange(start, end, size)
+            samples = np.asarray(self.samples()[start:end])
+            offsets = positions - start
+            mins = np.minimum.reduceat(samples, offsets)
+            maxs = np.maximum.reduceat(samples, offsets)
+        else:
+            positions, mins, maxs = self.pyramid.query(start, end, max_points)
+            size = self.pyramid.bucket_size(self.pyramid.level_for(span, max_points))
+        x = np.empty(2 * len(positions))
+        x[0::2] = positions
+        x[1::2] = positions + size / 2
+        y = np.empty(2 * len(positions), dtype=np.float32)
+        y[0::2] = mins
+        y[1::2] = maxs
+        return x, y
+
+    def chunks(self):
+        data = self.samples()
+        for start in range(0, len(data), self.chunk_frames):
+            yield start, np.asarray(data[start:start + self.chunk_frames])
+
+    def export_wav(self, file_path, sample_rate):
+        # Normalized to full scale like the original in-memory export
+        self.wait()
+        scale = 32767 / self.peak if self.peak != 0 else 32767
+        with wave.open(file_path, 'wb') as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(int(sample_rate))
+            for _, chunk in self.chunks():
+                wav.writeframes(np.int16(chunk * scale).astype('<i2').tobytes())
+
+    def export_csv(self, file_path, sample_rate):
+        import pandas as pd
+
+        for start, chunk in self.chunks():
+            t = (start + np.arange(len(chunk))) / sample_rate
+            dataframe = pd.DataFrame({"Time": t, "Amplitude": chunk})
+            dataframe.to_csv(file_path, index=False, mode='w' if start == 0 else 'a', header=start == 0)
+
+    def close(self):
+        """
+        Stops any recording and deletes its temporary file.
+        """
+        self.stop()
+        self.wait()
+        self.pyramid.close()
+        if self.path is not None:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+            self.path = None
+            self.frames = 0
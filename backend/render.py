@@ -0,0 +1,178 @@
+"""
+Headless offline rendering: a patch plus timed note events (or a standard
+MIDI file) rendered through Generator, the filter and the chorus into a WAV
+file, without any Qt dependency.
+
+    python -m backend.render events.mid out.wav --patch patch.json
+
+Events files ending in .json hold a list of
+{"time": seconds, "type": "note_on" | "note_off", "note": n, "velocity": v}.
+"""
+import argparse
+import json
+import time
+import wave
+
+import numpy as np
+
+from backend import filters
+from backend.chorus import ChorusEngine
+from backend.filters import FilterStage
+from backend.generator import Generator
+from backend.midi_file import read_midi_file
+from backend.params import OscillatorParams
+
+# Same defaults as the GUI at startup
+DEFAULT_PATCH = {
+    'sample_rate': 44100,
+    'polyphony': 16,
+    'steal_policy': 'oldest',  # oldest, quietest, releasing or retrigger
+    'render_threads': 1,  # Voice rendering threads; helps at high polyphony on several cores
+    'oscillators': [
+        {'shape': 'sawtooth', 'volume': 1.0, 'base_octave': -2, 'pitch_semitones': 7, 'fine_tune': -12},
+        {'shape': 'square', 'volume': 1.0, 'base_octave': -3, 'pitch_semitones': 0, 'fine_tune': 0},
+        {'shape': 'sine', 'volume': 1.0, 'base_octave': -3, 'pitch_semitones': 0, 'fine_tune': 0},
+    ],
+    'adsr': {'attack_time': 0.1, 'decay_time': 0.5, 'sustain_level': 0.5, 'release_time': 0.1},
+    'filter': {'type': 'low_pass', 'cutoff': 20000},
+    'chorus': {'depth': 0.005, 'rate': 1.0, 'mix': 0.0},
+    'stereo': {'pan': 0.0, 'spread': 0.0},  # Voice pan (-1 to 1) and pitch spread (0 to 1)
+}
+
+
+def load_patch(path=None):
+    patch = json.loads(json.dumps(DEFAULT_PATCH))  # Deep copy of the defaults
+    if path is not None:
+        with open(path) as f:
+            overrides = json.load(f)
+        for key, value in overrides.items():
+            if isinstance(value, dict) and isinstance(patch.get(key), dict):
+                patch[key].update(value)
+            else:
+                patch[key] = value
+    return patch
+
+
+def load_events(path):
+    """
+    Returns time-sorted (time_seconds, kind, channel, note_number, velocity).
+    """
+    if path.lower().endswith('.json'):
+        with open(path) as f:
+            entries = json.load(f)
+        events = [(float(e['time']), e['type'], int(e.get('channel', 0)), int(e['note']), int(e.get('velocity', 0)))
+                  for e in entries]
+        return sorted(events, key=lambda event: (event[0], event[1] == 'note_on'))
+    return read_midi_file(path)
+
+
+class OfflineRenderer:
+    """
+    Drives Generator, FilterStage and ChorusEngine in large blocks.
+
+    Events are passed to Generator.generate_samples at their offset inside
+    the block, so every note starts and stops on its exact sample without
+    cutting the block short. Rendering uses the float32 stream mode of the
+    audio callback: one reused block buffer, with every stage working in
+    place in buffers sized up front.
+    """
+
+    def __init__(self, patch, block_size=16384):
+        self.patch = patch
+        self.block_size = block_size
+        self.sample_rate = patch['sample_rate']
+        self.generator = Generator(self.sample_rate, max_voices=max(patch['polyphony'], 1),
+                                   polyphony=patch['polyphony'],
+                                   steal_policy=patch['steal_policy'],
+                                   render_threads=patch['render_threads'])
+        self.generator.set_oscillators([OscillatorParams(**osc) for osc in patch['oscillators']])
+        self.generator.params.update_stereo(**patch['stereo'])
+        self.generator.prepare(block_size, np.float32)
+        filters.load_scipy()  # Here, so render timings do not include the scipy import
+        self.filter_stage = FilterStage(self.sample_rate, order=3)
+        self.chorus = ChorusEngine(self.sample_rate, max_depth=0.05, max_block=block_size, dtype=np.float32)
+        self.buffer = np.zeros((block_size, 2), dtype=np.float32)
+
+    def render_block(self, frames, events=()):
+        patch = self.patch
+        samples = self.generator.generate_samples(frames, events, out=self.buffer[:frames])
+        self.filter_stage.process(samples, patch['filter']['type'], patch['filter']['cutoff'], out=samples)
+        chorus = patch['chorus']
+        return self.chorus.process(samples, chorus['depth'], chorus['rate'], chorus['mix'], out=samples)
+
+    def apply_event(self, kind, channel, note_number, velocity):
+        if kind == 'note_on':
+            self.generator.note_on(channel, note_number, velocity / 127.0, self.patch['adsr'])
+        else:
+            self.generator.note_off(channel, note_number)
+
+    def blocks(self, events, tail=5.0):
+        """
+        Yields rendered (frames, 2) blocks covering every event, followed by
+        the release tail until all voices are silent (at most tail seconds).
+        Each block is a view of one reused buffer, valid until the next.
+        """
+        timed = [(int(round(event_time * self.sample_rate)), kind, channel, note_number, velocity)
+                 for event_time, kind, channel, note_number, velocity in events]
+        position = 0
+        index = 0
+        while index < len(timed):
+            # Blocks end at the last event, so the tail is measured from it
+            frames = min(self.block_size, timed[-1][0] - position)
+            block_events = []
+            while index < len(timed) and timed[index][0] < position + frames:
+                event_position, kind, channel, note_number, velocity = timed[index]
+                block_events.append((event_position - position, kind, channel, note_number,
+                                     velocity / 127.0, self.patch['adsr']))
+                index += 1
+            if frames <= 0:
+                for _, kind, channel, note_number, velocity in timed[index:]:
+                    self.apply_event(kind, channel, note_number, velocity)
+                break
+            yield self.render_block(frames, block_events)
+            position += frames
+        tail_end = position + int(tail * self.sample_rate)
+        while self.generator.has_active_notes() and position < tail_end:
+            frames = min(self.block_size, tail_end - position)
+            yield self.render_block(frames)
+            position += frames
+
+    def render_to_wav(self, events, path, tail=5.0):
+        """
+        Streams the rendering into a 16-bit stereo WAV file and returns
+        (rendered_seconds, wall_seconds). Closes the generator when done,
+        so no voice rendering threads are left running.
+        """
+        frames_written = 0
+        start = time.perf_counter()
+        try:
+            with wave.open(path, 'wb') as wav:
+                wav.setnchannels(2)
+                wav.setsampwidth(2)
+                wav.setframerate(self.sample_rate)
+                for block in self.blocks(events, tail):
+                    pcm = np.clip(block, -1.0, 1.0) * 32767
+                    wav.writeframes(pcm.astype('<i2').tobytes())
+                    frames_written += len(block)
+        finally:
+            self.generator.close()
+        return frames_written / self.sample_rate, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render note events or a MIDI file to WAV without the GUI.")
+    parser.add_argument('events', help="Standard MIDI file, or .json list of note events")
+    parser.add_argument('output', help="WAV file to write")
+    parser.add_argument('--patch', help="JSON patch; missing keys use the GUI defaults")
+    parser.add_argument('--block-size', type=int, default=16384)
+    parser.add_argument('--tail', type=float, default=5.0, help="Maximum release tail in seconds")
+    args = parser.parse_args(argv)
+
+    renderer = OfflineRenderer(load_patch(args.patch), block_size=args.block_size)
+    rendered, elapsed = renderer.render_to_wav(load_events(args.events), args.output, tail=args.tail)
+    print(f"Rendered {rendered:.2f} s of audio in {elapsed:.2f} s "
+          f"({rendered / max(elapsed, 1e-9):.1f}x real time) to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+import numpy as np
+
+
+class SampleRingBuffer:
+    """
+    Lock-free single-producer / single-consumer ring of audio frames.
+
+    The producer (audio thread) copies each block into a preallocated
+    float32 array and then publishes it by advancing write_count; the
+    consumer (GUI thread) keeps its own read_count and drains whatever has
+    been published since. Each counter is only ever assigned by one thread,
+    and in CPython a single attribute assignment is atomic, so no lock is
+    needed. If the consumer falls more than a full buffer behind, the oldest
+    frames are skipped.
+    """
+
+    def __init__(self, capacity, channels=2):
+        self.capacity = capacity
+        self.channels = channels
+        self.data = np.zeros((capacity, channels), dtype=np.float32)
+        self.write_count = 0  # Total frames written, owned by the producer
+        self.read_count = 0   # Total frames consumed, owned by the consumer
+
+    def write(self, block):
+        """
+        Producer side: copies block (frames x channels) into the ring.
+        """
+        frames = len(block)
+        if frames > self.capacity:
+            block = block[-self.capacity:]
+            skipped = frames - self.capacity
+            frames = self.capacity
+        else:
+            skipped = 0
+        start = (self.write_count + skipped) % self.capacity
+        first = min(frames, self.capacity - start)
+        self.data[start:start + first] = block[:first]
+        self.data[:frames - first] = block[first:]
+        self.write_count += skipped + frames  # Publish only after the copy
+
+    def available(self):
+        return min(self.write_count - self.read_count, self.capacity)
+
+    def read(self, max_frames=None):
+        """
+        Consumer side: returns a new array with the frames published since
+        the previous read (at most max_frames of the newest ones).
+        """
+        end = self.write_count
+        start = max(self.read_count, end - self.capacity)
+        if max_frames is not None:
+            start = max(start, end - max_frames)
+        out = self._copy(start, end)
+        # Frames the producer overwrote while we were copying are stale
+        overwritten = self.write_count - self.capacity - start
+        if overwritten > 0:
+            out = out[overwritten:]
+        self.read_count = end
+        return out
+
+    def _copy(self, start, end):
+        frames = end - start
+        offset = start % self.capacity
+        first = min(frames, self.capacity - offset)
+        out = np.empty((frames, self.channels), dtype=np.float32)
+        out[:first] = self.data[offset:offset + first]
+        out[first:] = self.data[:frames - first]
+        return out
+
+
+class EventRingBuffer:
+    """
+    Lock-free single-producer / single-consumer ring of event tuples.
+
+    Uses the same counter protocol as SampleRingBuffer, but a full ring
+    rejects new events instead of overwriting old ones (dropping a queued
+    note-off would leave a note hanging); rejected events are counted in
+    dropped.
+    """
+
+    def __init__(self, capacity=1024):
+        self.capacity = capacity
+        self.slots = [None] * capacity
+        self.write_count = 0  # Owned by the producer
+        self.read_count = 0   # Owned by the consumer
+        self.dropped = 0
+
+    def push(self, event):
+        """
+        Producer side: queues one event, returns False if the ring is full.
+        """
+        if self.write_count - self.read_count >= self.capacity:
+            self.dropped += 1
+            return False
+        self.slots[self.write_count % self.capacity] = event
+        self.write_count += 1  # Publish only after the slot is filled
+        return True
+
+    def drain(self):
+        """
+        Consumer side: returns the events published since the previous drain,
+        oldest first.
+        """
+        end = self.write_count
+        if end == self.read_count:
+            return []
+        events = [self.slots[index % self.capacity] for index in range(self.read_count, end)]
+        self.read_count = end
+        return events
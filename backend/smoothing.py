@@ -0,0 +1,48 @@
+import numpy as np
+
+DEFAULT_RAMP_TIME = 0.02  # Seconds to glide to a new parameter value
+
+
+class LinearSmoother:
+    """
+    Per-sample linear ramps for one or more continuously changing parameters.
+
+    A new target starts a ramp of ramp_time seconds from the current value;
+    next_block returns a (parameters, frames) array of per-sample values, so
+    a change lands smoothly inside the block instead of as a step at its
+    start. While no ramp is running the block is just the held value.
+    """
+
+    def __init__(self, initial, ramp_time=DEFAULT_RAMP_TIME, sample_rate=44100):
+        self.current = np.array(initial, dtype=float, ndmin=1)
+        self.target = self.current.copy()
+        self.step = np.zeros_like(self.current)
+        self.ramp_samples = max(int(ramp_time * sample_rate), 1)
+        self.remaining = 0
+
+    def set_target(self, target):
+        target = np.array(target, dtype=float, ndmin=1)
+        if np.array_equal(target, self.target):
+            return
+        self.target = target
+        self.step = (target - self.current) / self.ramp_samples
+        self.remaining = self.ramp_samples
+
+    def is_ramping(self):
+        return self.remaining > 0
+
+    def next_block(self, frames, target=None, out=None):
+        if target is not None:
+            self.set_target(target)
+        if out is None:
+            out = np.empty((len(self.current), frames))
+        if self.remaining == 0:
+            out[:] = self.current[:, np.newaxis]
+            return out
+        ramp_frames = min(self.remaining, frames)
+        np.multiply(self.step[:, np.newaxis], np.arange(1, ramp_frames + 1), out=out[:, :ramp_frames])
+        out[:, :ramp_frames] += self.current[:, np.newaxis]
+        out[:, ramp_frames:] = self.target[:, np.newaxis]
+        self.remaining -= ramp_frames
+        self.current = self.target.copy() if self.remaining == 0 else out[:, ramp_frames - 1].copy()
+        return out
@@ -37,7 +37,6 @@ def get_midi_note_name(note_number):
     return f"{note}{octave}"
 
 def midi_note_number_to_frequency(note_number):
-    print(f"midi_note_number_to_frequency called with note_number={note_number}, type={type(note_number)}")
     frequency = 440.0 * (2 ** ((note_number - 69) / 12))
     return frequency
 
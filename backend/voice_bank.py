@@ -0,0 +1,358 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from backend.buffer_pool import BufferPool, scratch
+from backend.envelope_bank import ATTACK, EnvelopeBank
+from backend.wavetable import WavetableOscillator
+
+FADE_IN_SAMPLES = 100  # Length of the click-suppressing fade at note start
+SPREAD_CENTER = 261.63  # Hz (middle C); spread pans voices away from it by pitch
+SPREAD_OCTAVES = 2  # Octaves from SPREAD_CENTER to a full-width position
+
+
+def render_waveform(shape, phases, out=None):
+    """
+    Evaluates an oscillator shape on an array of phases (radians) of any shape.
+
+    Matches scipy.signal.square/sawtooth, but works from the fractional cycle
+    position directly instead of their general duty/width masking. The result
+    is written to out when given (it may not alias phases).
+    """
+    if shape == 'whitenoise':
+        noise = np.random.normal(0, 1, phases.shape)
+        if out is None:
+            return noise
+        out[...] = noise
+        return out
+    if shape not in ('square', 'sawtooth', 'triangle'):
+        return np.sin(phases, out=out)
+    cycle = np.divide(phases, 2 * np.pi, out=out)
+    np.remainder(cycle, 1.0, out=cycle)  # Same as cycle - floor(cycle), in place
+    if shape == 'square':
+        # floor(2 * cycle) is 0 in the first half cycle and 1 in the second
+        cycle *= 2
+        np.floor(cycle, out=cycle)
+        cycle *= -2
+        cycle += 1
+    elif shape == 'sawtooth':
+        cycle *= 2
+        cycle -= 1
+    else:
+        cycle -= 0.5
+        np.abs(cycle, out=cycle)
+        cycle *= -4
+        cycle += 1
+    return cycle
+
+
+def pan_gains(positions):
+    """
+    (voices, 2) equal-power left/right gains for pan positions in [-1, 1],
+    scaled so a centred voice keeps unit gain in both channels.
+    """
+    angles = (np.clip(positions, -1.0, 1.0) + 1.0) * (np.pi / 4)
+    gains = np.empty((len(angles), 2))
+    np.cos(angles, out=gains[:, 0])
+    np.sin(angles, out=gains[:, 1])
+    gains *= np.sqrt(2)
+    return gains
+
+
+STEAL_POLICIES = ('oldest', 'quietest', 'releasing', 'retrigger')
+
+
+class VoiceBank:
+    """
+    Structure-of-arrays storage for the sounding voices.
+
+    Each voice occupies a fixed slot; per-voice values live in preallocated
+    arrays indexed by slot (and by oscillator for phases), so a whole block
+    for all voices and oscillators is rendered with broadcast operations.
+    Envelope state is kept the same way, in an EnvelopeBank.
+
+    Slots come from a free list, held voices are indexed by their
+    (channel, note number) key, and the sounding and releasing voices are
+    kept in insertion-ordered dicts, so allocation, lookup, release and
+    oldest-first stealing are all constant time.
+    """
+
+    def __init__(self, capacity, sample_rate):
+        self.capacity = capacity
+        self.sample_rate = sample_rate
+        self.notes = [None] * capacity  # Note instance owning each slot
+        self.active = np.zeros(capacity, dtype=bool)
+        self.frequency = np.zeros(capacity)
+        self.velocity = np.zeros(capacity)
+        self.level = np.zeros(capacity)  # Envelope x velocity at the end of the last block
+        self.fade_position = np.zeros(capacity, dtype=np.int64)
+        self.envelopes = EnvelopeBank(capacity, sample_rate)  # ADSR state of every slot
+        self.phase = np.zeros((capacity, 0))  # voices x oscillators
+        self.wavetables = WavetableOscillator(sample_rate)  # Band-limited tables built once
+        self.free_slots = list(range(capacity - 1, -1, -1))  # Popped from the end, slot 0 first
+        self.sounding = {}   # Slot -> None in start order, oldest first
+        self.releasing = {}  # Slot -> None in release order
+        self.held = {}       # (channel, note number) -> slot of the held voice
+        self.keys = [None] * capacity
+        self.pool = None  # BufferPool for render scratch, set by prepare()
+        self.prepared = None  # (max_frames, max_voices, oscillators) given to prepare()
+        self.threads = 1
+        self.min_voices_per_thread = 32
+        self.executor = None  # Persistent helper threads, see set_threads()
+        self.worker_pools = []  # One BufferPool per helper thread
+        self.ramp = np.arange(0.0)  # 0, 1, 2, ... shared by every block
+
+    def prepare(self, pool, max_frames, max_voices, oscillators):
+        """
+        Reserves render scratch in pool for blocks of up to max_frames with
+        max_voices sounding voices, and renders in the pool's dtype from then on.
+        """
+        self.pool = pool
+        self.wavetables.prepare(pool)
+        self.ramp = np.arange(max_frames, dtype=pool.dtype)
+        self._reserve(pool, max_frames, max_voices, oscillators)
+        self.prepared = (max_frames, max_voices, oscillators)
+        self.worker_pools = [BufferPool(pool.dtype) for _ in self.worker_pools]
+        self._reserve_workers(max_frames, max_voices, oscillators)
+
+    @staticmethod
+    def _reserve(pool, max_frames, max_voices, oscillators):
+        for name, shape in (('phases', (oscillators, max_voices, max_frames)),
+                            ('voices', (max_voices, max_frames)),
+                            ('waveform', (max_voices, max_frames)),
+                            ('envelopes', (max_voices, max_frames)),
+                            ('wavetable position', (max_voices, max_frames)),
+                            ('wavetable upper', (max_voices, max_frames))):
+            pool.reserve(name, shape)
+        pool.reserve('wavetable index', (max_voices, max_frames), np.intp)
+
+    def _ramp(self, num_frames):
+        if len(self.ramp) < num_frames:
+            self.ramp = np.arange(num_frames, dtype=self.ramp.dtype)
+        return self.ramp[:num_frames]
+
+    def count(self):
+        return len(self.sounding)
+
+    def set_oscillator_count(self, count):
+        if count != self.phase.shape[1]:
+            self.phase = np.random.uniform(0, 2 * np.pi, (self.capacity, count))
+
+    def allocate(self, note, key=None):
+        if not self.free_slots:
+            self.steal('oldest')
+        slot = self.free_slots.pop()
+        self.sounding[slot] = None
+        self.active[slot] = True
+        self.phase[slot] = np.random.uniform(0, 2 * np.pi, self.phase.shape[1])
+        self._assign(slot, note, key)
+        return slot
+
+    def retrigger(self, slot, note):
+        # Restarts the note in place: same slot, key and oscillator phases
+        self.releasing.pop(slot, None)
+        self.sounding.pop(slot)
+        self.sounding[slot] = None  # Now the newest voice
+        self._assign(slot, note, self.keys[slot])
+
+    def _assign(self, slot, note, key):
+        self.notes[slot] = note
+        self.frequency[slot] = note.frequency
+        self.velocity[slot] = note.velocity
+        self.level[slot] = 0.0
+        self.fade_position[slot] = 0
+        self.envelopes.start(slot, note.envelope)
+        self.keys[slot] = key
+        if key is not None:
+            self.held[key] = slot
+
+    def free(self, slot):
+        if not self.active[slot]:
+            return
+        self._detach(slot)
+        self.releasing.pop(slot, None)
+        self.sounding.pop(slot)
+        self.active[slot] = False
+        self.notes[slot] = None
+        self.free_slots.append(slot)
+
+    def release(self, slot):
+        """
+        Starts the release phase of the voice and detaches it from its key.
+        """
+        if slot in self.releasing:
+            return
+        self.envelopes.release(slot)
+        self.notes[slot].active = False
+        self.releasing[slot] = None
+        self._detach(slot)
+
+    def _detach(self, slot):
+        key = self.keys[slot]
+        if key is not None and self.held.get(key) == slot:
+            del self.held[key]
+        self.keys[slot] = None
+
+    def slot_for_key(self, key):
+        return self.held.get(key)
+
+    def steal(self, policy):
+        """
+        Frees one sounding voice to make room for a new note.
+
+        'releasing' takes the voice that has been releasing longest, falling
+        back to the oldest voice; 'quietest' takes the voice with the lowest
+        level at the end of the last block (one vectorized argmin over the
+        pool), skipping voices still in their attack, so the notes of a chord
+        started in one block do not steal each other; 'oldest' and
+        'retrigger' take the oldest voice, as does 'quietest' when every
+        voice is in its attack.
+        """
+        if not self.sounding:
+            return None
+        # A starting voice is quiet only because its attack has just begun
+        settled = self.active & (self.envelopes.state != ATTACK) if policy == 'quietest' else None
+        if policy == 'releasing' and self.releasing:
+            slot = next(iter(self.releasing))
+        elif settled is not None and settled.any():
+            slot = int(np.argmin(np.where(settled, self.level, np.inf)))
+        else:
+            slot = next(iter(self.sounding))
+        self.free(slot)
+        return slot
+
+    def set_threads(self, threads, min_voices_per_thread=32):
+        """
+        Renders voices on up to threads threads (the caller's included), each
+        taking a group of at least min_voices_per_thread voices. The helper
+        threads are started once here and kept; threads=1 renders serially.
+        """
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+        self.threads = max(int(threads), 1)
+        self.min_voices_per_thread = max(int(min_voices_per_thread), 1)
+        dtype = np.float64 if self.pool is None else self.pool.dtype
+        self.worker_pools = [BufferPool(dtype) for _ in range(self.threads - 1)]
+        if self.threads > 1:
+            self.executor = ThreadPoolExecutor(self.threads - 1, thread_name_prefix='voice-render')
+        if self.prepared is not None:
+            self._reserve_workers(*self.prepared)
+
+    def _reserve_workers(self, max_frames, max_voices, oscillators):
+        # Helpers only run with two or more groups, so none gets over half the voices
+        group = -(-max_voices // 2)
+        for pool in self.worker_pools:
+            self._reserve(pool, max_frames, group, oscillators)
+            pool.reserve('mix', (max_frames, 2))
+
+    def close(self):
+        # Back to serial rendering; set_threads() can start the helpers again
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+        self.threads = 1
+        self.worker_pools = []
+
+    def render(self, num_frames, oscillators, volumes=None, out=None, stereo=None):
+        """
+        Renders all active voices into a (num_frames, 2) stereo block.
+
+        oscillators is a sequence of OscillatorParams records. volumes is an
+        optional (oscillators, num_frames) array of per-sample gains that
+        replaces the fixed osc.volume values. stereo is a StereoParams record
+        (centred when omitted). The block is written to out when given.
+
+        With set_threads(), the voices are split into groups: the caller
+        renders the first into out while the thread pool renders the others
+        into per-worker mix buffers, which are then added to out.
+        """
+        if out is None:
+            out = np.zeros((num_frames, 2))
+        self.set_oscillator_count(len(oscillators))
+        slots = np.flatnonzero(self.active)
+        if slots.size == 0 or not oscillators:
+            out.fill(0.0)
+            return out
+        if volumes is None:
+            volumes = np.array([osc.volume for osc in oscillators])
+        self._ramp(num_frames)  # Grown here, never from a worker
+
+        groups = min(self.threads, slots.size // self.min_voices_per_thread)
+        if groups < 2 or self.executor is None:
+            self._render_group(slots, num_frames, oscillators, volumes, stereo, out, self.pool)
+        else:
+            parts = np.array_split(slots, groups)
+            futures = []
+            for part, pool in zip(parts[1:], self.worker_pools):
+                mix = scratch(pool, 'mix', (num_frames, 2))
+                futures.append((mix, self.executor.submit(
+                    self._render_group, part, num_frames, oscillators, volumes, stereo, mix, pool)))
+            self._render_group(parts[0], num_frames, oscillators, volumes, stereo, out, self.pool)
+            for mix, future in futures:
+                future.result()
+                out += mix
+
+        # Free voices whose envelopes finished during this block
+        for slot in self.envelopes.finished(slots):
+            self.free(slot)
+        return out
+
+    def _render_group(self, slots, num_frames, oscillators, volumes, stereo, out, pool):
+        """
+        Renders the voices in slots into out, taking scratch from pool.
+
+        Voices are rendered in mono and placed by one matrix product with
+        their (voices, 2) pan and velocity gains. Groups touch disjoint slots
+        and their own pool, so they can run on separate threads. With a pool
+        every operation stays in the pool's dtype, since numpy allocates a
+        temporary for mixed-dtype ufuncs.
+        """
+        dtype = np.float64 if pool is None else pool.dtype
+        ratios = np.array([osc.ratio for osc in oscillators])
+        ramp = self.ramp[:num_frames]
+
+        # Phases for every oscillator x voice x frame, so each oscillator's
+        # rows are contiguous
+        frequencies = np.outer(self.frequency[slots], ratios)
+        increments = 2 * np.pi * frequencies / self.sample_rate
+        phases = scratch(pool, 'phases', (len(oscillators), slots.size, num_frames))
+        np.multiply(increments.T.astype(dtype)[:, :, np.newaxis], ramp, out=phases)
+        phases += self.phase[slots].T.astype(dtype)[:, :, np.newaxis]
+        # Carried in float64 from the start phase, whatever the block dtype
+        self.phase[slots] = (self.phase[slots] + increments * num_frames) % (2 * np.pi)
+
+        voices = scratch(pool, 'voices', (slots.size, num_frames))
+        voices.fill(0.0)
+        waveform = scratch(pool, 'waveform', (slots.size, num_frames))
+        volumes = np.asarray(volumes, dtype=dtype)
+        for index, osc in enumerate(oscillators):
+            if osc.shape in WavetableOscillator.SHAPES:
+                self.wavetables.render(osc.shape, phases[index], frequencies[:, index], out=waveform,
+                                       pool=pool)
+            else:
+                render_waveform(osc.shape, phases[index], out=waveform)
+            waveform *= volumes[index]
+            voices += waveform
+
+        envelopes = self.envelopes.process(slots, num_frames,
+                                           scratch(pool, 'envelopes', (slots.size, num_frames)))
+        voices *= envelopes
+        self.level[slots] = envelopes[:, -1] * self.velocity[slots]
+
+        # Fade-in for voices that have only just started, continued across blocks
+        fading = self.fade_position[slots] < FADE_IN_SAMPLES
+        if fading.any():
+            fade_positions = self.fade_position[slots[fading], np.newaxis] + ramp
+            voices[fading] *= np.minimum(fade_positions / (FADE_IN_SAMPLES - 1), 1.0)
+            self.fade_position[slots[fading]] += num_frames
+
+        # Velocity and pan are per voice, so both fold into the gain matrix
+        pan, spread = (0.0, 0.0) if stereo is None else (stereo.pan, stereo.spread)
+        positions = np.full(slots.size, float(pan))
+        if spread:
+            octaves = np.log2(self.frequency[slots] / SPREAD_CENTER) / SPREAD_OCTAVES
+            positions += spread * np.clip(octaves, -1.0, 1.0)
+        gains = pan_gains(positions)
+        gains *= self.velocity[slots, np.newaxis] / 4
+        np.matmul(voices.T, gains.astype(dtype), out=out)
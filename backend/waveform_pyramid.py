@@ -0,0 +1,170 @@
+import os
+import tempfile
+
+import numpy as np
+
+
+class _LevelFile:
+    """
+    One pyramid level: (min, max) pairs appended to a file and read back as
+    a memory map, so only the unpaired last bucket stays in RAM.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'wb')
+        self.count = 0
+        self.carry = None  # Last bucket, until a partner completes a next-level pair
+        self._map = None
+
+    def extend(self, pairs):
+        self._file.write(np.ascontiguousarray(pairs, dtype=np.float32).tobytes())
+        self.count += len(pairs)
+        self._map = None
+
+    def pairs(self):
+        if self.count == 0:
+            return np.zeros((0, 2), dtype=np.float32)
+        if self._map is None:
+            if not self._file.closed:
+                self._file.flush()
+            self._map = np.memmap(self.path, dtype=np.float32, mode='r', shape=(self.count, 2))
+        return self._map
+
+    def close(self):
+        self._file.close()
+
+    def remove(self):
+        self._file.close()
+        self._map = None
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+class MinMaxPyramid:
+    """
+    Min/max decimation pyramid of a growing mono signal.
+
+    Level 0 holds the minimum and maximum of every base_bucket samples and
+    each further level halves the resolution, so any time span can be drawn
+    from the coarsest level that still has about as many buckets as the
+    display has pixels. Levels are extended incrementally as blocks arrive.
+
+    Each level is appended to its own file, path + '.level<n>' (temporary
+    files when path is None), and read back as a memory map, like the
+    recording itself. RAM use is a few buffers per level whatever the
+    length; on disk the levels add about 1/16 of the recording's size.
+    """
+
+    def __init__(self, path=None, base_bucket=64, directory=None):
+        self.path = path
+        self.directory = directory
+        self.base_bucket = base_bucket
+        self.levels = []
+        self.frames = 0
+        self._partial = np.empty(base_bucket, dtype=np.float32)
+        self._partial_count = 0
+
+    def bucket_size(self, level):
+        return self.base_bucket << level
+
+    def append(self, block):
+        block = np.asarray(block, dtype=np.float32)
+        self.frames += len(block)
+        if self._partial_count:
+            take = min(self.base_bucket - self._partial_count, len(block))
+            self._partial[self._partial_count:self._partial_count + take] = block[:take]
+            self._partial_count += take
+            block = block[take:]
+            if self._partial_count < self.base_bucket:
+                return
+            self._push(0, self._partial.min(keepdims=True), self._partial.max(keepdims=True))
+            self._partial_count = 0
+        whole = len(block) - len(block) % self.base_bucket
+        if whole:
+            buckets = block[:whole].reshape(-1, self.base_bucket)
+            self._push(0, buckets.min(axis=1), buckets.max(axis=1))
+        rest = len(block) - whole
+        self._partial[:rest] = block[whole:]
+        self._partial_count = rest
+
+    def _level_path(self, level):
+        if self.path is not None:
+            return f"{self.path}.level{level}"
+        fd, path = tempfile.mkstemp(prefix='pyramid_', suffix=f'.level{level}', dir=self.directory)
+        os.close(fd)
+        return path
+
+    def _push(self, level, mins, maxs):
+        if level == len(self.levels):
+            self.levels.append(_LevelFile(self._level_path(level)))
+        pyramid_level = self.levels[level]
+        pairs = np.column_stack((mins, maxs)).astype(np.float32, copy=False)
+        pyramid_level.extend(pairs)
+        # Combine newly completed pairs into the next level
+        if pyramid_level.carry is not None:
+            pairs = np.concatenate((pyramid_level.carry, pairs))
+        end = len(pairs) - len(pairs) % 2
+        pyramid_level.carry = pairs[end:].copy() if end < len(pairs) else None
+        if end:
+            combined = pairs[:end].reshape(-1, 2, 2)
+            self._push(level + 1, combined[:, :, 0].min(axis=1), combined[:, :, 1].max(axis=1))
+
+    def finish(self):
+        """
+        Flushes the incomplete trailing bucket of every level once no more
+        samples will be appended, and closes the level files.
+        """
+        if self._partial_count:
+            partial = self._partial[:self._partial_count]
+            self._partial_count = 0
+            self._push(0, partial.min(keepdims=True), partial.max(keepdims=True))
+        level = 0
+        while level < len(self.levels) and self.levels[level].count > 1:
+            carry = self.levels[level].carry
+            if carry is not None:
+                self.levels[level].carry = None
+                self._push(level + 1, carry[:, 0], carry[:, 1])
+            level += 1
+        for pyramid_level in self.levels:
+            pyramid_level.close()
+
+    def close(self):
+        # Deletes the level files
+        for pyramid_level in self.levels:
+            pyramid_level.remove()
+        self.levels = []
+
+    def level_for(self, span, max_buckets):
+        level = 0
+        while level < len(self.levels) - 1 and span / self.bucket_size(level) > max_buckets:
+            level += 1
+        return level
+
+    def query(self, start, end, max_buckets):
+        """
+        Returns (positions, mins, maxs) for the buckets covering samples
+        [start, end) at the coarsest useful level; positions are the first
+        sample of each bucket.
+        """
+        if not self.levels:
+            empty = np.zeros(0, dtype=np.float32)
+            return np.zeros(0), empty, empty
+        level = self.level_for(end - start, max_buckets)
+        size = self.bucket_size(level)
+        pairs = self.levels[level].pairs()
+        first = max(start // size, 0)
+        last = min(-(-end // size), len(pairs))
+        positions = np.arange(first, last) * size
+        return positions, pairs[first:last, 0], pairs[first:last, 1]
+
+    def extent(self):
+        """
+        Overall (min, max) of everything appended so far.
+        """
+        if not self.levels:
+            return 0.0, 0.0
+        top = self.levels[-1].pairs()
+        return float(top[:, 0].min()), float(top[:, 1].max())
@@ -0,0 +1,101 @@
+import numpy as np
+
+from backend.buffer_pool import scratch
+
+TABLE_SIZE = 2048
+LOWEST_FREQUENCY = 20.0  # Fundamental covered by the richest mip level
+
+
+def _harmonic_amplitudes(shape, harmonics):
+    """
+    Sine and cosine Fourier coefficients of one cycle of each shape, using
+    the same phase convention as scipy.signal.square/sawtooth.
+    """
+    k = np.arange(1, harmonics + 1)
+    sines = np.zeros(harmonics)
+    cosines = np.zeros(harmonics)
+    odd = k % 2 == 1
+    if shape == 'sawtooth':
+        sines = -2 / (np.pi * k)
+    elif shape == 'square':
+        sines[odd] = 4 / (np.pi * k[odd])
+    elif shape == 'triangle':
+        cosines[odd] = -8 / (np.pi * k[odd]) ** 2
+    else:
+        raise ValueError(f"No wavetable for shape '{shape}'")
+    return sines, cosines
+
+
+def build_table(shape, harmonics, size=TABLE_SIZE):
+    """
+    Additively synthesizes one band-limited cycle of size samples, with a
+    wrap-around guard sample appended for interpolation.
+    """
+    sines, cosines = _harmonic_amplitudes(shape, harmonics)
+    spectrum = np.zeros(size // 2 + 1, dtype=complex)
+    spectrum[1:harmonics + 1] = (cosines - 1j * sines) * size / 2
+    table = np.fft.irfft(spectrum, n=size)
+    return np.append(table, table[0])
+
+
+class WavetableOscillator:
+    """
+    Band-limited, mip-mapped wavetables for the periodic non-sine shapes.
+
+    Mip level l holds only the harmonics that stay below Nyquist for every
+    fundamental up to LOWEST_FREQUENCY * 2**l, so a voice reads the richest
+    table that cannot alias at its frequency. Tables are built once here and
+    read with a linearly interpolated phase lookup. Each shape's levels are
+    stored back to back in one flat array so a lookup is a single take().
+    """
+    SHAPES = ('square', 'sawtooth', 'triangle')
+
+    def __init__(self, sample_rate, size=TABLE_SIZE):
+        self.sample_rate = sample_rate
+        self.size = size
+        nyquist = sample_rate / 2
+        self.levels = int(np.ceil(np.log2(nyquist / LOWEST_FREQUENCY))) + 1
+        top_frequencies = LOWEST_FREQUENCY * 2.0 ** np.arange(self.levels)
+        self.harmonics = np.clip(np.floor(nyquist / top_frequencies).astype(int), 1, size // 2 - 1)
+        self.tables = {
+            shape: np.concatenate([build_table(shape, h, size) for h in self.harmonics])
+            for shape in self.SHAPES
+        }
+        self.pool = None  # BufferPool for render scratch, set by prepare()
+
+    def prepare(self, pool):
+        # Tables in the pool's dtype: take() only writes to an out of its own dtype.
+        # Every pool later passed to render() must have the same dtype.
+        self.pool = pool
+        self.tables = {shape: table.astype(pool.dtype) for shape, table in self.tables.items()}
+
+    def mip_level(self, frequencies):
+        ratio = np.maximum(np.abs(frequencies), LOWEST_FREQUENCY) / LOWEST_FREQUENCY
+        return np.minimum(np.ceil(np.log2(ratio)).astype(int), self.levels - 1)
+
+    def render(self, shape, phases, frequencies, out=None, pool=None):
+        """
+        Reads the tables for phases (radians, rows x frames) where each row
+        plays at the matching entry of frequencies, into out when given.
+        Scratch comes from pool, or from the one given to prepare().
+        """
+        pool = self.pool if pool is None else pool
+        position = np.multiply(phases, self.size / (2 * np.pi),
+                               out=scratch(pool, 'wavetable position', phases.shape))
+        position %= self.size
+        index = scratch(pool, 'wavetable index', phases.shape, np.intp)
+        np.copyto(index, position, casting='unsafe')  # Truncates like astype
+        np.minimum(index, self.size - 1, out=index)
+        upper = scratch(pool, 'wavetable upper', phases.shape)
+        np.copyto(upper, index)  # Same dtype as position, so -= does not allocate
+        position -= upper  # Fractional part
+        # Offset into the flattened (levels x size + 1) table of each row
+        index += (self.mip_level(frequencies) * (self.size + 1))[:, np.newaxis]
+        table = self.tables[shape]
+        lower = table.take(index, out=out, mode='clip')  # 'raise' would buffer out
+        index += 1
+        table.take(index, out=upper, mode='clip')
+        upper -= lower
+        upper *= position
+        lower += upper
+        return lower
@@ -0,0 +1,121 @@
+"""
+Micro-benchmark for ADSREnvelope.process.
+
+Compares the block-based envelope against the original per-sample loop
+(kept below as a reference) and checks that both produce identical output.
+
+Run from the repository root:
+    python -m benchmarks.bench_adsr
+"""
+import contextlib
+import io
+import timeit
+
+import numpy as np
+
+from backend.generator import ADSREnvelope
+
+SAMPLE_RATE = 44100
+BLOCK_SIZES = [64, 128, 256, 512, 1024, 2048, 4096]
+
+
+class LoopADSREnvelope(ADSREnvelope):
+    """The original per-sample implementation, used as the reference."""
+
+    def process(self, num_frames):
+        envelope = np.zeros(num_frames)
+        for i in range(num_frames):
+            if self.state == 'attack':
+                self.current_amplitude += 1.0 / (self.attack_time * self.sample_rate)
+                if self.current_amplitude >= 1.0:
+                    self.current_amplitude = 1.0
+                    self.state = 'decay'
+                envelope[i] = self.current_amplitude
+            elif self.state == 'decay':
+                self.current_amplitude -= (1.0 - self.sustain_level) / (self.decay_time * self.sample_rate)
+                if self.current_amplitude <= self.sustain_level:
+                    self.current_amplitude = self.sustain_level
+                    self.state = 'sustain'
+                envelope[i] = self.current_amplitude
+            elif self.state == 'sustain':
+                if self.note_released:
+                    self.state = 'release'
+                    self.time_in_state = 0.0
+                    self.release_start_amplitude = self.current_amplitude
+                envelope[i] = self.current_amplitude
+            elif self.state == 'release':
+                self.time_in_state += 1 / self.sample_rate
+                if self.time_in_state >= self.release_time:
+                    self.current_amplitude = 0.0
+                    self.state = 'idle'
+                    self.note_released = False
+                else:
+                    self.current_amplitude = self.release_start_amplitude * (1 - self.time_in_state / self.release_time)
+                envelope[i] = self.current_amplitude
+            else:  # 'idle'
+                envelope[i] = 0.0
+                self.current_amplitude = 0.0
+        return envelope
+
+
+def render(envelope_class, params, block_size, release_after, total):
+    env = envelope_class(*params, SAMPLE_RATE)
+    env.note_on()
+    blocks = []
+    rendered = 0
+    while rendered < total:
+        if rendered >= release_after:
+            env.note_off()
+        blocks.append(env.process(block_size))
+        rendered += block_size
+    return np.concatenate(blocks)
+
+
+def check_identical():
+    cases = [
+        (0.1, 0.5, 0.5, 0.1),
+        (0.0, 0.0, 0.0, 0.0),
+        (0.003, 0.2, 1.0, 0.5),
+        (0.25, 0.01, 0.0, 2.0),
+    ]
+    with contextlib.redirect_stdout(io.StringIO()):
+        for params in cases:
+            for block_size in [1, 63, 512, 4096]:
+                # Release during sustain, and during attack (deferred to sustain)
+                for release_after in [SAMPLE_RATE, 0]:
+                    expected = render(LoopADSREnvelope, params, block_size, release_after, 2 * SAMPLE_RATE)
+                    actual = render(ADSREnvelope, params, block_size, release_after, 2 * SAMPLE_RATE)
+                    if not np.array_equal(expected, actual):
+                        raise AssertionError(f"Mismatch for {params}, block {block_size}")
+    print("Output identical to the per-sample loop")
+
+
+def time_block(envelope_class, block_size, repeats=200):
+    # Cycle through a full note so every segment type is exercised
+    env = envelope_class(0.05, 0.1, 0.5, 0.1, SAMPLE_RATE)
+    blocks_per_note = int(0.5 * SAMPLE_RATE / block_size) + 1
+
+    def run():
+        for i in range(repeats):
+            if i % blocks_per_note == 0:
+                env.note_on()
+            elif i % blocks_per_note == blocks_per_note // 2:
+                env.note_off()
+            env.process(block_size)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        return min(timeit.repeat(run, number=1, repeat=3)) / repeats
+
+
+def main():
+    check_identical()
+    print(f"{'frames':>8} {'loop (us)':>12} {'block (us)':>12} {'speedup':>8}")
+    for block_size in BLOCK_SIZES:
+        loop_time = time_block(LoopADSREnvelope, block_size, repeats=50)
+        block_time = time_block(ADSREnvelope, block_size)
+        print(f"{block_size:>8} {loop_time * 1e6:>12.1f} {block_time * 1e6:>12.1f} "
+              f"{loop_time / block_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Benchmark for the live spectrum in InfoWindow.update_displays.
+
+Compares the previous per-delivery analysis (concatenate into the sample
+buffer, rebuild the Hann window, full complex FFT and fftfreq) with
+SpectrumAnalyzer, feeding both the same stream of audio blocks.
+
+Run from the repository root:
+    python -m benchmarks.bench_analyzer
+"""
+import timeit
+
+import numpy as np
+
+from backend.analyzer import SpectrumAnalyzer
+
+SAMPLE_RATE = 44100
+SIZE = 4096
+DELIVERIES = [256, 512, 2205]  # Block sizes and a 50 ms timer drain
+
+
+def previous_update(state, samples):
+    state['buffer'] = np.concatenate((state['buffer'], samples))
+    if len(state['buffer']) > SIZE:
+        state['buffer'] = state['buffer'][-SIZE:]
+    N = len(state['buffer'])
+    windowed = state['buffer'] * np.hanning(N)
+    yf = 2.0 / N * np.abs(np.fft.fft(windowed)[0:N // 2])
+    xf = np.fft.fftfreq(N, d=1 / SAMPLE_RATE)[0:N // 2]
+    return xf, yf
+
+
+def analyzer_update(analyzer, samples):
+    if analyzer.push(samples):
+        return analyzer.spectrum(SAMPLE_RATE)
+    return None
+
+
+def main():
+    stream = np.random.uniform(-1, 1, SAMPLE_RATE * 4)
+    print(f"{'delivery':>9} {'previous (us)':>14} {'analyzer (us)':>14} {'speedup':>8}")
+    for delivery in DELIVERIES:
+        blocks = [stream[i:i + delivery] for i in range(0, len(stream) - delivery, delivery)]
+
+        def run_previous():
+            state = {'buffer': np.array([])}
+            for block in blocks:
+                previous_update(state, block)
+
+        def run_analyzer():
+            analyzer = SpectrumAnalyzer(size=SIZE, hop=1024)
+            for block in blocks:
+                analyzer_update(analyzer, block)
+
+        previous = min(timeit.repeat(run_previous, number=1, repeat=5)) / len(blocks)
+        current = min(timeit.repeat(run_analyzer, number=1, repeat=5)) / len(blocks)
+        print(f"{delivery:>9} {previous * 1e6:>14.1f} {current * 1e6:>14.1f} {previous / current:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
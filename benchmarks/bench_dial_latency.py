@@ -0,0 +1,86 @@
+"""
+GUI responsiveness while sweeping an OscillatorWidget dial.
+
+A driver timer moves the fine-tune dial every 2 ms while a probe timer
+measures how late the Qt event loop services it (event-loop latency).
+Compares the previous synchronous path (one second of waveform, a full
+FFT and a redraw on the GUI thread for every dial value) with the
+coalesced background preview worker.
+
+Run from the repository root (uses the offscreen Qt platform):
+    python -m benchmarks.bench_dial_latency
+"""
+import contextlib
+import io
+import os
+import time
+
+import numpy as np
+
+from benchmarks.bench_preview import previous_preview
+
+SWEEP_STEPS = 400
+PROBE_INTERVAL_MS = 5
+
+
+def sweep(app, widget, change):
+    from PyQt6.QtCore import QTimer
+
+    latencies = []
+    state = {'value': -100, 'last_probe': time.perf_counter()}
+
+    def probe():
+        now = time.perf_counter()
+        latencies.append(now - state['last_probe'] - PROBE_INTERVAL_MS / 1000)
+        state['last_probe'] = now
+
+    def drive():
+        state['value'] += 1
+        change(state['value'] % 201 - 100)
+
+    probe_timer = QTimer()
+    probe_timer.setInterval(PROBE_INTERVAL_MS)
+    probe_timer.timeout.connect(probe)
+    drive_timer = QTimer()
+    drive_timer.setInterval(2)
+    drive_timer.timeout.connect(drive)
+    probe_timer.start()
+    drive_timer.start()
+    with contextlib.redirect_stdout(io.StringIO()):
+        while state['value'] < SWEEP_STEPS - 100:
+            app.processEvents()
+    drive_timer.stop()
+    probe_timer.stop()
+    return np.maximum(np.array(latencies[1:]), 0) * 1e3
+
+
+def main():
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt6.QtWidgets import QApplication
+    from oscillator_widget import OscillatorWidget
+
+    app = QApplication.instance() or QApplication([])
+    with contextlib.redirect_stdout(io.StringIO()):
+        widget = OscillatorWidget(name="Benchmark", default_shape='sawtooth')
+    widget.resize(600, 500)
+    widget.show()
+
+    def synchronous(value):
+        widget.fine_tune = value
+        t, y, xf, yf = previous_preview(widget.shape, widget.get_final_frequency())
+        widget.plot_wave.clear()
+        widget.plot_wave.plot(t, y)
+        widget.plot_fft.clear()
+        widget.plot_fft.plot(xf, yf)
+
+    print(f"Event-loop latency over a {SWEEP_STEPS}-step dial sweep (ms)")
+    print(f"{'path':>12} {'mean':>8} {'p99':>8} {'max':>8}")
+    for label, change in (('synchronous', synchronous), ('background', widget.change_fine_tune)):
+        latencies = sweep(app, widget, change)
+        print(f"{label:>12} {latencies.mean():>8.2f} {np.percentile(latencies, 99):>8.2f} "
+              f"{latencies.max():>8.2f}")
+    widget.stop_preview_worker()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark for the filter stage used by FilterPanel.apply_filter.
+
+Measures per-callback cost of the original path (butter + lfilter on
+every block, no carried state) and of FilterStage, with a static cutoff,
+with the cutoff swept a little on every block like a dragged slider, and
+with it jumping between 200 Hz and 8 kHz on every block (the worst case
+for the ramp, which then needs a new design every sub-block).
+
+Run from the repository root:
+    python -m benchmarks.bench_filter
+"""
+import timeit
+
+import numpy as np
+from scipy.signal import butter, lfilter, sosfreqz
+
+from backend.filters import FilterStage, design_filter
+
+SAMPLE_RATE = 44100
+BLOCK_SIZES = [64, 256, 1024]
+BLOCKS = 400
+
+
+def redesign_filter(samples, cutoff):
+    """The original per-callback filter: redesign, filter from rest."""
+    b, a = butter(3, cutoff / (0.5 * SAMPLE_RATE), btype='low', analog=False)
+    return lfilter(b, a, samples, axis=0)
+
+
+def cutoffs(mode):
+    if mode == 'static':
+        return np.full(BLOCKS, 1000)
+    if mode == 'jumps':
+        return np.where(np.arange(BLOCKS) % 2, 8000, 200)
+    # A slider dragged back and forth: a new integer cutoff every block
+    return (2000 + 1800 * np.sin(np.linspace(0, 4 * np.pi, BLOCKS))).astype(int)
+
+
+def time_path(process, block_size, mode):
+    samples = np.random.uniform(-1, 1, (block_size, 2))
+    values = [int(c) for c in cutoffs(mode)]
+
+    def run():
+        for cutoff in values:
+            process(samples, cutoff)
+
+    return min(timeit.repeat(run, number=1, repeat=3)) / BLOCKS
+
+
+def check_continuity():
+    # Filtering block by block must equal filtering the whole signal at once
+    signal = np.random.uniform(-1, 1, (4096, 2))
+    stage = FilterStage(SAMPLE_RATE)
+    blocks = [stage.process(block, 'low_pass', 1000) for block in np.split(signal, 16)]
+    whole = FilterStage(SAMPLE_RATE).process(signal, 'low_pass', 1000)
+    if not np.allclose(np.concatenate(blocks), whole):
+        raise AssertionError("Filter state is not carried across blocks")
+    print("Block-wise output matches one-shot filtering")
+
+
+def check_design():
+    # The closed-form sections must have scipy's Butterworth response
+    for filter_type, btype in (('low_pass', 'low'), ('high_pass', 'high')):
+        for cutoff in (20, 1000, 20000):
+            _, expected = sosfreqz(butter(3, cutoff / (0.5 * SAMPLE_RATE), btype=btype, output='sos'))
+            _, actual = sosfreqz(design_filter(filter_type, cutoff, 3, SAMPLE_RATE))
+            if not np.allclose(expected, actual, atol=1e-8):
+                raise AssertionError(f"Response mismatch for {filter_type} at {cutoff} Hz")
+    print("Filter design matches scipy.signal.butter")
+
+
+def main():
+    check_design()
+    check_continuity()
+    print(f"{'frames':>8} {'cutoff':>7} {'redesign (us)':>14} {'stage (us)':>11} {'speedup':>8}")
+    for block_size in BLOCK_SIZES:
+        for mode in ('static', 'swept', 'jumps'):
+            stage = FilterStage(SAMPLE_RATE)
+            old = time_path(redesign_filter, block_size, mode)
+            new = time_path(lambda samples, cutoff: stage.process(samples, 'low_pass', cutoff),
+                            block_size, mode)
+            print(f"{block_size:>8} {mode:>7} {old * 1e6:>14.1f} {new * 1e6:>11.1f} {old / new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Benchmark for the float32 stream mode of the audio callback.
+
+Runs the body of MainWindow.audio_callback without audio hardware: the
+generator, filter, chorus and analysis ring for one block, ending in a
+float32 outdata array like the one sounddevice passes in. The previous
+path renders float64 blocks that every stage returns freshly allocated,
+then copies the result into outdata; the float32 path renders into outdata
+in place from buffers sized by Generator.prepare before the first block.
+Reports microseconds per callback, real-time factor, and the peak and
+retained bytes that tracemalloc sees allocated during one callback.
+
+Run from the repository root:
+    python -m benchmarks.bench_float32_pipeline
+"""
+import contextlib
+import io
+import time
+import tracemalloc
+
+import numpy as np
+
+from backend.chorus import ChorusEngine
+from backend.filters import FilterStage
+from backend.generator import Generator
+from backend.params import OscillatorParams
+from backend.ring_buffer import SampleRingBuffer
+
+SAMPLE_RATE = 44100
+BLOCK_SIZES = [64, 256, 512, 1024]
+VOICES = 16
+OSCILLATORS = [OscillatorParams('sawtooth', 0.5, -2, 7, -12),
+               OscillatorParams('square', 0.5, -3),
+               OscillatorParams('sine', 0.5, -3)]
+ADSR = {'attack_time': 0.01, 'decay_time': 0.1, 'sustain_level': 0.7, 'release_time': 0.2}
+MAX_FRAMES = 4096
+MIN_SECONDS = 0.3
+
+
+def make_callback(float32):
+    np.random.seed(0)
+    generator = Generator(SAMPLE_RATE, polyphony=VOICES)
+    generator.params.set_oscillators(OSCILLATORS)
+    for index in range(VOICES):
+        generator.note_on(0, 45 + index, 0.8, ADSR)
+    filter_stage = FilterStage(SAMPLE_RATE)
+    analysis_buffer = SampleRingBuffer(1 << 17, channels=2)
+
+    if float32:
+        generator.prepare(MAX_FRAMES, np.float32)
+        chorus = ChorusEngine(SAMPLE_RATE, voices=3, max_block=MAX_FRAMES, dtype=np.float32)
+
+        def callback(outdata, frames):
+            generator.generate_samples(frames, (), out=outdata)
+            filter_stage.process(outdata, 'low_pass', 5000.0, out=outdata)
+            chorus.process(outdata, 0.005, 1.0, 0.5, out=outdata)
+            analysis_buffer.write(outdata)
+    else:
+        chorus = ChorusEngine(SAMPLE_RATE, voices=3, max_block=MAX_FRAMES)
+
+        def callback(outdata, frames):
+            samples = generator.generate_samples(frames)
+            filtered = filter_stage.process(samples, 'low_pass', 5000.0)
+            chorused = chorus.process(filtered, 0.005, 1.0, 0.5)
+            analysis_buffer.write(chorused)
+            outdata[:] = chorused
+    return callback, generator
+
+
+def measure(float32, frames):
+    callback, generator = make_callback(float32)
+    outdata = np.zeros((frames, 2), dtype=np.float32)
+    for _ in range(20):  # Past the attack, fade-in and any first-block setup
+        callback(outdata, frames)
+
+    blocks = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < MIN_SECONDS:
+        callback(outdata, frames)
+        blocks += 1
+    seconds = (time.perf_counter() - start) / blocks
+
+    tracemalloc.start()
+    peaks, retained = [], []
+    for _ in range(10):
+        baseline, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        callback(outdata, frames)
+        current, peak = tracemalloc.get_traced_memory()
+        peaks.append(peak - baseline)
+        retained.append(current - baseline)
+    tracemalloc.stop()
+    grown = generator.pool.grown if generator.pool is not None else 0
+    return seconds, max(peaks), max(retained), grown
+
+
+def main():
+    print(f"Audio callback body, {VOICES} voices x {len(OSCILLATORS)} oscillators, filter and chorus")
+    print(f"{'frames':>7} {'path':>9} {'us/block':>9} {'x realtime':>11} "
+          f"{'peak KiB':>9} {'kept B':>7} {'pool grew':>10}")
+    with contextlib.redirect_stdout(io.StringIO()):  # Envelope state messages
+        rows = [(frames, float32, measure(float32, frames))
+                for frames in BLOCK_SIZES for float32 in (False, True)]
+    for frames, float32, (seconds, peak, kept, grown) in rows:
+        path = 'float32' if float32 else 'previous'
+        print(f"{frames:>7} {path:>9} {seconds * 1e6:>9.1f} {frames / SAMPLE_RATE / seconds:>11.1f} "
+              f"{peak / 1024:>9.1f} {kept:>7} {grown:>10}")
+
+
+if __name__ == "__main__":
+    main()
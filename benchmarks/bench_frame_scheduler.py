@@ -0,0 +1,111 @@
+"""
+Analysis display rate under the previous 50 ms timer and FrameScheduler.
+
+A producer thread writes 512-frame blocks into a SampleRingBuffer at the
+audio rate while the Qt event loop (offscreen platform) drains it into
+InfoWindow.update_displays. Runs once with normal drawing cost and once
+with 30 ms of extra GUI work per frame. Reports rendered frames per
+second, dropped display frames, GUI-thread time spent rendering, and the
+age of the newest sample when its frame finished.
+
+Run from the repository root:
+    python -m benchmarks.bench_frame_scheduler
+"""
+import contextlib
+import io
+import os
+import threading
+import time
+
+import numpy as np
+
+from backend.ring_buffer import SampleRingBuffer
+
+SAMPLE_RATE = 44100
+BLOCK_SIZE = 512
+SECONDS = 3.0
+SLOW_FRAME_MS = 30
+
+
+def producer(ring, state, done):
+    period = BLOCK_SIZE / SAMPLE_RATE
+    t = np.arange(BLOCK_SIZE) / SAMPLE_RATE
+    deadline = time.perf_counter()
+    block_index = 0
+    while not done.is_set():
+        deadline += period
+        time.sleep(max(deadline - time.perf_counter(), 0))
+        y = np.sin(2 * np.pi * 440 * (t + block_index * period))
+        ring.write(np.column_stack((y, y)))
+        state['written_at'] = time.perf_counter()
+        block_index += 1
+
+
+def run(app, window, scheduled, extra_ms):
+    from PyQt6.QtCore import QTimer
+    from frame_scheduler import FrameScheduler
+
+    ring = SampleRingBuffer(1 << 17)
+    state = {'written_at': time.perf_counter()}
+    stats = {'busy': 0.0, 'ages': [], 'frames': 0}
+
+    def render_frame():
+        start = time.perf_counter()
+        written_at = state['written_at']
+        samples = ring.read() if ring.available() else None
+        if samples is not None:
+            window.update_displays(samples)
+            if extra_ms:
+                time.sleep(extra_ms / 1000)  # Stands in for slow drawing
+        end = time.perf_counter()
+        stats['busy'] += end - start
+        stats['ages'].append(end - written_at)
+        stats['frames'] += 1
+
+    if scheduled:
+        scheduler = FrameScheduler(render_frame, lambda: ring.write_count)
+        timer = scheduler.timer
+    else:
+        scheduler = None
+        timer = QTimer()
+        timer.setInterval(50)
+        timer.timeout.connect(render_frame)
+
+    done = threading.Event()
+    thread = threading.Thread(target=producer, args=(ring, state, done))
+    thread.start()
+    timer.start()
+    end = time.perf_counter() + SECONDS
+    while time.perf_counter() < end:
+        app.processEvents()
+        time.sleep(0.0005)
+    timer.stop()
+    done.set()
+    thread.join()
+    dropped = scheduler.dropped if scheduler else '-'
+    ages = np.array(stats['ages'][5:]) * 1e3
+    return stats['frames'] / SECONDS, dropped, stats['busy'] / SECONDS * 100, ages.mean()
+
+
+def main():
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt6.QtWidgets import QApplication
+    from info_window import InfoWindow
+
+    app = QApplication.instance() or QApplication([])
+    with contextlib.redirect_stdout(io.StringIO()):
+        window = InfoWindow(main_window=None)
+    window.resize(900, 800)
+    window.show()
+    app.processEvents()
+
+    print(f"{'drawing':>8} {'path':>10} {'fps':>6} {'dropped':>8} {'GUI busy %':>11} {'data age (ms)':>14}")
+    for label, extra_ms in (('normal', 0), ('slow', SLOW_FRAME_MS)):
+        for path, scheduled in (('50 ms', False), ('scheduler', True)):
+            fps, dropped, busy, age = run(app, window, scheduled, extra_ms)
+            print(f"{label:>8} {path:>10} {fps:>6.1f} {dropped!s:>8} {busy:>11.1f} {age:>14.1f}")
+    window.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Benchmark for handing processed audio from the audio thread to the GUI.
+
+A worker thread plays the audio callback and times only the handoff of
+each block: either the previous path (copy under a lock and emit a Qt
+signal carrying a fresh array, queued to the GUI thread) or a write into
+SampleRingBuffer. The main thread runs a Qt event loop and drains the data
+as the GUI would. Reports mean, 99th percentile and worst handoff time.
+
+Run from the repository root (PyQt6 is needed for the signal path):
+    python -m benchmarks.bench_handoff
+"""
+import threading
+import time
+
+import numpy as np
+
+from backend.ring_buffer import SampleRingBuffer
+
+BLOCK_SIZE = 512
+CALLBACKS = 2000
+CALLBACK_PERIOD = BLOCK_SIZE / 44100
+
+
+def summarize(label, durations):
+    durations = np.asarray(durations) * 1e6
+    print(f"{label:>14} {durations.mean():>10.1f} {np.percentile(durations, 99):>10.1f} "
+          f"{durations.max():>10.1f}")
+
+
+def run_callbacks(handoff):
+    block = np.random.uniform(-1, 1, (BLOCK_SIZE, 2))
+    durations = []
+    for _ in range(CALLBACKS):
+        start = time.perf_counter()
+        handoff(block)
+        durations.append(time.perf_counter() - start)
+        time.sleep(CALLBACK_PERIOD / 8)
+    return durations
+
+
+def bench_signal(app):
+    from PyQt6.QtCore import QObject, pyqtSignal, Qt
+
+    class Receiver(QObject):
+        data = pyqtSignal(np.ndarray)
+
+        def __init__(self):
+            super().__init__()
+            self.received = 0
+            self.data.connect(self.on_data, Qt.ConnectionType.QueuedConnection)
+
+        def on_data(self, samples):
+            self.received += len(samples.mean(axis=1))
+
+    receiver = Receiver()
+    lock = threading.Lock()
+    state = {}
+
+    def handoff(block):
+        with lock:
+            state['last'] = block.copy()
+        receiver.data.emit(block.copy())
+
+    return run_in_thread(app, handoff, lambda: None)
+
+
+def bench_ring(app):
+    ring = SampleRingBuffer(1 << 17, channels=2)
+    return run_in_thread(app, ring.write, lambda: ring.read().mean(axis=1))
+
+
+def run_in_thread(app, handoff, drain):
+    from PyQt6.QtCore import QTimer
+
+    result = {}
+    worker = threading.Thread(target=lambda: result.update(durations=run_callbacks(handoff)))
+    timer = QTimer()
+    timer.setInterval(50)
+    timer.timeout.connect(drain)
+    timer.start()
+    worker.start()
+    while worker.is_alive():
+        app.processEvents()
+        time.sleep(0.001)
+    timer.stop()
+    app.processEvents()
+    return result['durations']
+
+
+def main():
+    from PyQt6.QtCore import QCoreApplication
+
+    app = QCoreApplication.instance() or QCoreApplication([])
+    print(f"{CALLBACKS} callbacks of {BLOCK_SIZE} frames, handoff time in us")
+    print(f"{'path':>14} {'mean':>10} {'p99':>10} {'max':>10}")
+    summarize('lock + signal', bench_signal(app))
+    summarize('ring buffer', bench_ring(app))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Startup import cost, measured with python -X importtime.
+
+Each target is imported in a fresh interpreter (best of several runs, so
+the OS file cache is warm). Reports the total cumulative import time, the
+heaviest top-level imports, and whether Qt, pyqtgraph, pandas or scipy
+were loaded. Headless targets are the synthesis engine and the offline
+renderer; GUI targets are the widget modules and the main window (built
+with the offscreen Qt platform).
+
+Run from the repository root:
+    python -m benchmarks.bench_import_time
+"""
+import os
+import subprocess
+import sys
+
+RUNS = 5
+TARGETS = [
+    ('engine', 'import backend.generator, backend.filters, backend.chorus'),
+    ('renderer', 'import backend.render'),
+    ('gui widgets', 'import oscillator_widget, synth_panel, info_window'),
+    ('main window', 'import main_window'),
+]
+WATCHED = ('PyQt6', 'pyqtgraph', 'pandas', 'scipy')
+
+
+def measure(statement):
+    """
+    Returns ({top-level import: cumulative microseconds}, set of every
+    module loaded), or the error text.
+    """
+    environment = dict(os.environ, QT_QPA_PLATFORM='offscreen')
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement],
+                            capture_output=True, text=True, env=environment)
+    if result.returncode != 0:
+        return result.stderr.strip().splitlines()[-1]
+    modules = {}
+    loaded = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        loaded.add(name.strip().split('.')[0])
+        if not name.startswith('  '):  # Indentation marks nested imports
+            modules[name.strip()] = int(cumulative)
+    return modules, loaded
+
+
+def main():
+    print(f"{'target':>12} {'total (ms)':>11}  {'loaded':<30} heaviest imports (ms)")
+    for label, statement in TARGETS:
+        runs = [measure(statement) for _ in range(RUNS)]
+        if isinstance(runs[0], str):
+            print(f"{label:>12} {'failed':>11}  {runs[0]}")
+            continue
+        best, loaded = min(runs, key=lambda run: sum(run[0].values()))
+        total = sum(best.values()) / 1000
+        loaded = ",".join(name for name in WATCHED if name in loaded) or "-"
+        heaviest = sorted(best.items(), key=lambda item: -item[1])[:4]
+        heavy_text = ", ".join(f"{name} {us / 1000:.0f}" for name, us in heaviest)
+        print(f"{label:>12} {total:>11.1f}  {loaded:<30} {heavy_text}")
+
+
+if __name__ == "__main__":
+    main()
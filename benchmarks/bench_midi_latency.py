@@ -0,0 +1,145 @@
+"""
+Note-on-to-sound latency of the MIDI input path.
+
+A producer thread plays RtMidi's input thread, sending note-ons at
+irregular intervals stamped on arrival; an audio thread wakes once per
+block period like the sounddevice callback and records, for every note it
+starts, the time from arrival to the start of that callback. The main
+thread runs a Qt event loop that is kept busy with periodic GUI-sized work.
+
+Compares the previous path (a polling QThread per port emitting queued
+signals that reach Generator.add_note on the GUI thread) with the
+EventRingBuffer drained by the callback itself. The stream's own output
+latency comes on top of both and is the same for each.
+
+Run from the repository root (uses the offscreen Qt platform):
+    python -m benchmarks.bench_midi_latency
+"""
+import os
+import queue
+import random
+import threading
+import time
+
+import numpy as np
+
+from backend.ring_buffer import EventRingBuffer
+
+BLOCK_SIZE = 256
+SAMPLE_RATE = 44100
+NOTES = 300
+GUI_PERIOD_MS = 50  # MainWindow's update_info timer
+GUI_WORK_MS = 15    # Plot updates done on each tick
+
+
+def busy(milliseconds):
+    end = time.perf_counter() + milliseconds / 1000
+    while time.perf_counter() < end:
+        pass
+
+
+def produce(deliver, done):
+    rng = random.Random(0)
+    for note in range(NOTES):
+        time.sleep(rng.uniform(0.003, 0.02))
+        deliver((time.perf_counter_ns(), note % 128))
+    time.sleep(0.05)
+    done.set()
+
+
+def audio_thread(take_pending, latencies, done):
+    period = BLOCK_SIZE / SAMPLE_RATE
+    deadline = time.perf_counter()
+    while not done.is_set():
+        deadline += period
+        time.sleep(max(deadline - time.perf_counter(), 0))
+        start = time.perf_counter_ns()
+        for arrival, _ in take_pending():
+            latencies.append(start - arrival)
+
+
+def run(app, deliver, take_pending):
+    from PyQt6.QtCore import QTimer
+
+    latencies = []
+    done = threading.Event()
+    gui_timer = QTimer()
+    gui_timer.setInterval(GUI_PERIOD_MS)
+    gui_timer.timeout.connect(lambda: busy(GUI_WORK_MS))
+    gui_timer.start()
+    threads = [threading.Thread(target=audio_thread, args=(take_pending, latencies, done)),
+               threading.Thread(target=produce, args=(deliver, done))]
+    for thread in threads:
+        thread.start()
+    while not done.is_set():
+        app.processEvents()
+        time.sleep(0.0005)
+    for thread in threads:
+        thread.join()
+    gui_timer.stop()
+    return np.array(latencies) / 1e6
+
+
+def polled_path(app):
+    from PyQt6.QtCore import QObject, QThread, pyqtSignal
+
+    incoming = queue.Queue()  # RtMidi's internal queue, read with getMessage(10)
+    pending = []
+    lock = threading.Lock()
+
+    class Receiver(QObject):
+        def on_note(self, arrival, note):
+            # Generator.add_note on the GUI thread
+            with lock:
+                pending.append((arrival, note))
+
+    class Poller(QThread):
+        note_on = pyqtSignal(object, int)
+
+        def __init__(self):
+            super().__init__()
+            self.running = True
+
+        def run(self):
+            while self.running:
+                try:
+                    self.note_on.emit(*incoming.get(timeout=0.01))
+                except queue.Empty:
+                    pass
+
+    def take_pending():
+        with lock:
+            notes = pending[:]
+            pending.clear()
+        return notes
+
+    receiver = Receiver()
+    poller = Poller()
+    poller.note_on.connect(receiver.on_note)
+    poller.start()
+    latencies = run(app, incoming.put, take_pending)
+    poller.running = False
+    poller.wait()
+    return latencies
+
+
+def queued_path(app):
+    events = EventRingBuffer()
+    return run(app, events.push, events.drain)
+
+
+def main():
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt6.QtWidgets import QApplication
+
+    app = QApplication.instance() or QApplication([])
+    print(f"Note-on to start of the playing callback, {BLOCK_SIZE}-frame blocks (ms)")
+    print(f"{'path':>14} {'mean':>8} {'p50':>8} {'p99':>8} {'max':>8}")
+    for label, path in (('qt signals', polled_path), ('event queue', queued_path)):
+        latencies = path(app)
+        print(f"{label:>14} {latencies.mean():>8.2f} {np.percentile(latencies, 50):>8.2f} "
+              f"{np.percentile(latencies, 99):>8.2f} {latencies.max():>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
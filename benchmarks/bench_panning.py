@@ -0,0 +1,102 @@
+"""
+Benchmark for the stereo mixdown of the voice bank.
+
+Takes a (voices, frames) block of rendered voices, as VoiceBank.render has
+it after the envelopes, and times three ways to turn it into a stereo
+(frames, 2) block with per-voice velocity:
+
+    per-voice stereo  every voice expanded with column_stack and added as
+                      (frames, 2) arrays, as the original generator did
+    mono + expand     velocity pass, mono sum, one stereo duplication
+    pan matrix        one (frames, voices) @ (voices, 2) product with the
+                      pan and velocity gains of every voice
+
+Then times Generator.generate_samples with the voices centred and fully
+spread, to show panning adds nothing to the block cost.
+
+Run from the repository root:
+    python -m benchmarks.bench_panning
+"""
+import contextlib
+import io
+import timeit
+
+import numpy as np
+
+from backend.generator import Generator
+from backend.params import OscillatorParams
+from backend.voice_bank import pan_gains
+
+SAMPLE_RATE = 44100
+BLOCK_SIZE = 512
+POLYPHONY = [4, 16, 64, 256]
+ADSR = {'attack_time': 0.01, 'decay_time': 0.1, 'sustain_level': 0.7, 'release_time': 0.2}
+OSCILLATORS = [OscillatorParams('sawtooth', 0.5, -2, 7, -12),
+               OscillatorParams('square', 0.5, -3),
+               OscillatorParams('sine', 0.5, -3)]
+REPEAT = 200
+
+
+def per_voice_stereo(voices, velocity):
+    buffer = np.zeros((voices.shape[1], 2))
+    for row, gain in zip(voices, velocity):
+        samples = row * gain
+        buffer += np.column_stack((samples, samples))
+    return buffer
+
+
+def mono_expand(voices, velocity):
+    scaled = voices * velocity[:, np.newaxis]
+    buffer = np.empty((voices.shape[1], 2))
+    buffer[:] = scaled.sum(axis=0)[:, np.newaxis]
+    return buffer
+
+
+def pan_matrix(voices, gains):
+    return voices.T @ gains
+
+
+def time_call(function):
+    return min(timeit.repeat(function, number=REPEAT, repeat=3)) / REPEAT
+
+
+def time_generator(voices, spread):
+    np.random.seed(0)
+    generator = Generator(SAMPLE_RATE, max_voices=voices, polyphony=voices)
+    generator.params.set_oscillators(OSCILLATORS)
+    generator.params.update_stereo(spread=spread)
+    for index in range(voices):
+        generator.note_on(index // 48, 36 + index % 48, 0.8, ADSR)
+    for _ in range(10):
+        generator.generate_samples(BLOCK_SIZE)
+    return min(timeit.repeat(lambda: generator.generate_samples(BLOCK_SIZE), number=20, repeat=3)) / 20
+
+
+def main():
+    print(f"Stereo mixdown of a (voices, {BLOCK_SIZE}) block (us)")
+    print(f"{'voices':>7} {'per-voice':>10} {'mono+expand':>12} {'pan matrix':>11}")
+    rng = np.random.default_rng(0)
+    for count in POLYPHONY:
+        voices = rng.uniform(-1, 1, (count, BLOCK_SIZE))
+        velocity = rng.uniform(0.2, 1.0, count) / 4
+        gains = pan_gains(rng.uniform(-1, 1, count)) * velocity[:, np.newaxis]
+        times = [time_call(lambda: per_voice_stereo(voices, velocity)),
+                 time_call(lambda: mono_expand(voices, velocity)),
+                 time_call(lambda: pan_matrix(voices, gains))]
+        print(f"{count:>7}" + "".join(f" {t * 1e6:>{w}.1f}" for t, w in zip(times, (10, 12, 11))))
+
+    centre = pan_gains(np.zeros(1))[0]
+    left = pan_gains(np.full(1, -1.0))[0]
+    print(f"\nPan gains (left, right): centre {centre[0]:.3f}, {centre[1]:.3f}; "
+          f"hard left {left[0]:.3f}, {left[1]:.3f}")
+
+    print(f"\nGenerator.generate_samples, {len(OSCILLATORS)} oscillators, {BLOCK_SIZE} frames (us)")
+    print(f"{'voices':>7} {'centred':>9} {'spread 1':>9}")
+    with contextlib.redirect_stdout(io.StringIO()):  # Envelope state messages
+        rows = [(count, time_generator(count, 0.0), time_generator(count, 1.0)) for count in POLYPHONY]
+    for count, centred, spread in rows:
+        print(f"{count:>7} {centred * 1e6:>9.1f} {spread * 1e6:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
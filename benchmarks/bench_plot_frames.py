@@ -0,0 +1,158 @@
+"""
+GUI-thread frame time of the live plots, using the offscreen Qt platform.
+
+Feeds InfoWindow one analyzer hop of a changing test signal per frame
+(new waveform and spectrum), redraws an OscillatorWidget preview, and
+runs FinalFFTWidget.update_fft on a 4096-sample block. Every frame is
+painted synchronously, so the time covers both the update and the
+redraw. The previous plotting path (plot.clear() and plot.plot() with
+the ranges and log mode reapplied on every frame) is timed alongside
+the persistent curves.
+
+Run from the repository root:
+    python -m benchmarks.bench_plot_frames
+"""
+import contextlib
+import io
+import os
+import time
+
+import numpy as np
+
+FRAMES = 240
+FRAME_BUDGET_MS = 1000 / 60
+SAMPLE_RATE = 44100
+HOP = 1024
+
+
+def test_block(frame, size=HOP):
+    t = (frame * size + np.arange(size)) / SAMPLE_RATE
+    frequency = 220 + 5 * frame
+    return 0.5 * np.sign(np.sin(2 * np.pi * frequency * t)) + 0.05 * np.random.standard_normal(size)
+
+
+def previous_info_update(window, samples):
+    # InfoWindow.update_displays before the persistent curves
+    if not window.analyzer.push(samples):
+        return
+    y = window.analyzer.frame()
+    t = np.linspace(0, len(y) / SAMPLE_RATE, len(y))
+    window.plot_waveform.clear()
+    window.plot_waveform.plot(t, y, pen='c')
+    window.plot_waveform.setXRange(0, len(y) / SAMPLE_RATE)
+    window.plot_waveform.setYRange(y.min() * 1.1, y.max() * 1.1)
+    xf, yf = window.analyzer.spectrum(SAMPLE_RATE)
+    window.plot_fft.clear()
+    window.plot_fft.plot(xf, yf, pen='y')
+    window.plot_fft.setXRange(0, SAMPLE_RATE / 2)
+    window.plot_fft.setYRange(0, yf.max() * 1.1)
+    window.plot_fft.setLogMode(x=False, y=False)
+    window.plot_fft.invertY(False)
+
+
+def previous_preview(widget, preview):
+    # OscillatorWidget.show_preview before the persistent curves
+    t, y, xf, yf = preview
+    widget.plot_wave.clear()
+    widget.plot_wave.plot(t, y)
+    widget.plot_wave.setXRange(0, 0.01)
+    widget.plot_fft.clear()
+    widget.plot_fft.plot(xf, yf)
+    widget.plot_fft.setXRange(20, 20000)
+
+
+def previous_final_fft(widget, samples):
+    # FinalFFTWidget.update_fft before the persistent curve
+    N = len(samples)
+    yf = 2.0 / N * np.abs(np.fft.fft(samples * np.hanning(N))[0:N // 2])
+    xf = np.fft.fftfreq(N, d=1 / SAMPLE_RATE)[0:N // 2]
+    widget.plot_fft.clear()
+    widget.plot_fft.plot(xf, yf, pen='y')
+    widget.plot_fft.setXRange(0, SAMPLE_RATE / 2)
+    widget.plot_fft.setYRange(0, yf.max() * 1.1)
+    widget.plot_fft.setLogMode(x=False, y=False)
+    widget.plot_fft.invertY(False)
+
+
+def run(app, update, widgets):
+    times = []
+    for frame in range(FRAMES):
+        start = time.perf_counter()
+        update(frame)
+        for widget in widgets:
+            widget.repaint()
+        app.processEvents()
+        times.append(time.perf_counter() - start)
+    return np.array(times[10:]) * 1e3  # Skip the first frames (first paint, caches)
+
+
+def main():
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt6.QtWidgets import QApplication
+    from backend.preview import preview_spectrum, preview_waveform
+    from info_window import InfoWindow
+    from oscillator_widget import OscillatorWidget
+    from synth_panels.final_fft_widget import FinalFFTWidget
+
+    app = QApplication.instance() or QApplication([])
+    block = test_block(0, 4096)
+    created = []
+
+    def show(widget, width, height):
+        widget.resize(width, height)
+        widget.show()
+        app.processEvents()
+        created.append(widget)
+        return widget
+
+    def preview(frame):
+        frequency = 110 * 2 ** (frame % 48 / 12)
+        t, y = preview_waveform('sawtooth', frequency)
+        xf, yf = preview_spectrum('sawtooth', frequency)
+        return t, y, xf, yf
+
+    def info_case(previous):
+        window = show(InfoWindow(main_window=None), 900, 800)
+        update = (lambda samples: previous_info_update(window, samples)) if previous else window.update_displays
+        return [window.plot_waveform, window.plot_fft], lambda frame: update(test_block(frame))
+
+    def oscillator_case(previous):
+        widget = show(OscillatorWidget(name="Benchmark", default_shape='sawtooth'), 600, 500)
+        widget.stop_preview_worker()  # Previews are fed directly below
+
+        def update(frame):
+            if previous:
+                previous_preview(widget, preview(frame))
+            else:
+                widget.preview_generation = frame
+                widget.show_preview(frame, preview(frame))
+        return [widget.plot_wave, widget.plot_fft], update
+
+    def final_fft_case(previous):
+        widget = show(FinalFFTWidget(), 600, 300)
+
+        def update(frame):
+            samples = block * (1 + frame % 7)
+            if previous:
+                previous_final_fft(widget, samples)
+            else:
+                widget.update_fft(samples, SAMPLE_RATE)
+        return [widget.plot_fft], update
+
+    print(f"Frame time over {FRAMES} frames, update plus synchronous repaint (ms)")
+    print(f"{'plot':>12} {'path':>10} {'mean':>7} {'p99':>7} {'max':>7} {'over 16.7 ms':>13}")
+    for label, case in (('info window', info_case), ('oscillator', oscillator_case),
+                        ('final fft', final_fft_case)):
+        for path in ('previous', 'current'):
+            with contextlib.redirect_stdout(io.StringIO()):
+                widgets, update = case(path == 'previous')
+            times = run(app, update, widgets)
+            late = int(np.count_nonzero(times > FRAME_BUDGET_MS))
+            print(f"{label:>12} {path:>10} {times.mean():>7.2f} {np.percentile(times, 99):>7.2f} "
+                  f"{times.max():>7.2f} {late:>13}")
+    for widget in created:
+        widget.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmark for the OscillatorWidget preview computation.
+
+Compares the previous preview (one second of waveform at 44.1 kHz plus a
+44,100-point FFT per dial move) with the visible-span waveform and
+analytic, memoized spectrum, both on a first visit (cold) and when the dial
+returns to a value already shown (cached). Drawing is not included.
+
+Run from the repository root:
+    python -m benchmarks.bench_preview
+"""
+import timeit
+
+import numpy as np
+from scipy import signal
+from scipy.fft import fft
+
+from backend.preview import preview_spectrum, preview_waveform
+
+SAMPLE_RATE = 44100
+SHAPES = ['sine', 'square', 'sawtooth', 'triangle']
+
+
+def previous_preview(shape, frequency):
+    t = np.linspace(0, 1, SAMPLE_RATE, endpoint=False)
+    phases = 2 * np.pi * frequency * t
+    if shape == 'square':
+        y = signal.square(phases)
+    elif shape == 'sawtooth':
+        y = signal.sawtooth(phases)
+    elif shape == 'triangle':
+        y = signal.sawtooth(phases, width=0.5)
+    else:
+        y = np.sin(phases)
+    yf = 2.0 / SAMPLE_RATE * np.abs(fft(y)[0:SAMPLE_RATE // 2])
+    xf = np.fft.fftfreq(SAMPLE_RATE, d=1 / SAMPLE_RATE)[0:SAMPLE_RATE // 2]
+    return t, y, xf, yf
+
+
+def new_preview(shape, frequency):
+    return preview_waveform(shape, frequency) + preview_spectrum(shape, frequency)
+
+
+def main():
+    # A fine-tune sweep: 201 distinct frequencies per shape
+    frequencies = 440.0 * 2 ** (np.arange(-100, 101) / 1200)
+    print(f"{'shape':>10} {'previous (ms)':>14} {'cold (ms)':>10} {'cached (ms)':>12}")
+    for shape in SHAPES:
+        previous = min(timeit.repeat(lambda: [previous_preview(shape, f) for f in frequencies[:20]],
+                                     number=1, repeat=3)) / 20
+        preview_waveform.cache_clear()
+        preview_spectrum.cache_clear()
+        cold = timeit.timeit(lambda: [new_preview(shape, f) for f in frequencies], number=1) / len(frequencies)
+        cached = timeit.timeit(lambda: [new_preview(shape, f) for f in frequencies], number=1) / len(frequencies)
+        print(f"{shape:>10} {previous * 1e3:>14.3f} {cold * 1e3:>10.3f} {cached * 1e3:>12.4f}")
+    print(f"Startup (3 previews): previous {3 * previous * 1e3:.1f} ms, new {3 * cold * 1e3:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Scaling benchmark for multi-threaded voice rendering.
+
+Renders blocks of 256 sounding voices with Generator.set_render_threads
+at 1 to N threads (N defaults to the CPU count, at least 4), in the float32
+stream mode the GUI uses, and reports microseconds per block, real-time
+factor and speedup over one thread. Each threaded run is also checked
+against the serial output. Speedups need as many free cores as threads.
+
+Run from the repository root:
+    python -m benchmarks.bench_render_threads [--threads N] [--frames F]
+"""
+import argparse
+import contextlib
+import io
+import os
+import time
+
+import numpy as np
+
+from backend.generator import Generator
+from backend.params import OscillatorParams
+
+SAMPLE_RATE = 44100
+VOICES = 256
+OSCILLATORS = [OscillatorParams('sawtooth', 0.5, -2, 7, -12),
+               OscillatorParams('square', 0.5, -3),
+               OscillatorParams('sine', 0.5, -3)]
+ADSR = {'attack_time': 0.01, 'decay_time': 0.1, 'sustain_level': 0.7, 'release_time': 0.2}
+MIN_SECONDS = 1.0
+
+
+def make_generator(threads, frames):
+    np.random.seed(0)
+    generator = Generator(SAMPLE_RATE, max_voices=VOICES, polyphony=VOICES)
+    generator.params.set_oscillators(OSCILLATORS)
+    generator.params.update_stereo(spread=0.5)
+    generator.set_render_threads(threads, min_voices_per_thread=1)
+    generator.prepare(frames)
+    for index in range(VOICES):
+        generator.note_on(index // 48, 36 + index % 48, 0.8, ADSR)
+    return generator
+
+
+def measure(threads, frames):
+    generator = make_generator(threads, frames)
+    out = np.zeros((frames, 2), dtype=np.float32)
+    first = generator.generate_samples(frames, out=out).copy()
+    for _ in range(5):
+        generator.generate_samples(frames, out=out)
+    blocks = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < MIN_SECONDS:
+        generator.generate_samples(frames, out=out)
+        blocks += 1
+    seconds = (time.perf_counter() - start) / blocks
+    generator.close()
+    return seconds, first
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--threads', type=int, default=max(os.cpu_count() or 1, 4))
+    parser.add_argument('--frames', type=int, default=1024)
+    args = parser.parse_args()
+
+    print(f"{VOICES} voices x {len(OSCILLATORS)} oscillators, {args.frames} frames, "
+          f"{os.cpu_count()} CPUs")
+    print(f"{'threads':>8} {'us/block':>10} {'x realtime':>11} {'speedup':>8} {'max diff':>9}")
+    with contextlib.redirect_stdout(io.StringIO()):  # Envelope state messages
+        rows = [(threads, *measure(threads, args.frames)) for threads in range(1, args.threads + 1)]
+    serial_seconds, serial_block = rows[0][1], rows[0][2]
+    for threads, seconds, block in rows:
+        print(f"{threads:>8} {seconds * 1e6:>10.0f} {args.frames / SAMPLE_RATE / seconds:>11.2f} "
+              f"{serial_seconds / seconds:>8.2f} {np.abs(block - serial_block).max():>9.1e}")
+
+
+if __name__ == "__main__":
+    main()
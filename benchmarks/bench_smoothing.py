@@ -0,0 +1,88 @@
+"""
+Benchmark for per-sample parameter smoothing.
+
+Steps the mixer volume, filter cutoff and chorus depth once per block on a
+steady tone and reports the largest sample-to-sample jump (the audible
+"zipper" click) with stepped and with ramped parameters, plus the cost of a
+block while a ramp is running against a block with the value held.
+
+Run from the repository root:
+    python -m benchmarks.bench_smoothing
+"""
+import timeit
+
+import numpy as np
+
+from backend.chorus import ChorusEngine
+from backend.filters import FilterStage
+from backend.smoothing import LinearSmoother
+
+SAMPLE_RATE = 44100
+BLOCK_SIZE = 512
+BLOCKS = 32
+
+
+def tone(frames, frequency=220.0):
+    t = np.arange(frames) / SAMPLE_RATE
+    return np.sin(2 * np.pi * frequency * t)
+
+
+def targets():
+    # Alternating between two settings on every block
+    return [i % 2 for i in range(BLOCKS)]
+
+
+def max_jump(signal):
+    return np.abs(np.diff(signal, axis=0)).max()
+
+
+def volume_run(ramp_time):
+    signal = tone(BLOCK_SIZE * BLOCKS)
+    smoother = LinearSmoother(0.2, ramp_time, SAMPLE_RATE)
+    blocks = []
+    for index, target in enumerate(targets()):
+        gain = smoother.next_block(BLOCK_SIZE, 0.2 + 0.6 * target)[0]
+        blocks.append(signal[index * BLOCK_SIZE:(index + 1) * BLOCK_SIZE] * gain)
+    return np.concatenate(blocks)
+
+
+def filter_run(ramp_time):
+    signal = np.column_stack([tone(BLOCK_SIZE * BLOCKS, 1000.0)] * 2)
+    stage = FilterStage(SAMPLE_RATE, ramp_time=ramp_time)
+    return np.concatenate([stage.process(block, 'low_pass', 300 + 7700 * target)
+                           for block, target in zip(np.split(signal, BLOCKS), targets())])
+
+
+def chorus_run(ramp_time):
+    signal = tone(BLOCK_SIZE * BLOCKS)
+    engine = ChorusEngine(SAMPLE_RATE, voices=3, ramp_time=ramp_time)
+    return np.concatenate([engine.process(block, 0.002 + 0.02 * target, 1.0, 0.5)
+                           for block, target in zip(np.split(signal, BLOCKS), targets())])
+
+
+def block_cost(process):
+    return min(timeit.repeat(process, number=200, repeat=3)) / 200
+
+
+def main():
+    # A ramp time shorter than one sample is the old stepped behaviour
+    stepped = 1 / SAMPLE_RATE / 2
+    print(f"{'control':>8} {'stepped jump':>13} {'ramped jump':>12}")
+    for name, run in (('volume', volume_run), ('cutoff', filter_run), ('chorus', chorus_run)):
+        print(f"{name:>8} {max_jump(run(stepped)):>13.4f} {max_jump(run(0.02)):>12.4f}")
+
+    block = np.column_stack([tone(BLOCK_SIZE)] * 2)
+    stage = FilterStage(SAMPLE_RATE)
+    engine = ChorusEngine(SAMPLE_RATE, voices=3)
+    toggle = iter(range(10 ** 9))
+    print(f"\n{'stage':>8} {'held (us)':>10} {'ramping (us)':>13}")
+    held = block_cost(lambda: stage.process(block, 'low_pass', 1000))
+    ramping = block_cost(lambda: stage.process(block, 'low_pass', 1000 + next(toggle) % 2 * 4000))
+    print(f"{'filter':>8} {held * 1e6:>10.1f} {ramping * 1e6:>13.1f}")
+    held = block_cost(lambda: engine.process(block, 0.01, 1.0, 0.5))
+    ramping = block_cost(lambda: engine.process(block, 0.01 + next(toggle) % 2 * 0.01, 1.0, 0.5))
+    print(f"{'chorus':>8} {held * 1e6:>10.1f} {ramping * 1e6:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
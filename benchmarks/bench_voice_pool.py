@@ -0,0 +1,75 @@
+"""
+Benchmark for voice allocation in the Generator.
+
+With the pool full, times one note-on (which has to steal a voice) plus
+one note-off, for each stealing policy and several pool sizes. The
+previous allocator's scans (count, oldest voice, free slot and note-off
+lookup by frequency over the whole voice array) are timed alongside.
+
+Run from the repository root:
+    python -m benchmarks.bench_voice_pool
+"""
+import contextlib
+import io
+import timeit
+
+import numpy as np
+
+from backend.generator import Generator
+from backend.voice_bank import STEAL_POLICIES
+
+SAMPLE_RATE = 44100
+POOL_SIZES = [16, 64, 256]
+ADSR = {'attack_time': 0.01, 'decay_time': 0.1, 'sustain_level': 0.7, 'release_time': 0.2}
+CYCLES = 2000
+
+
+def previous_cycle(active, frequency, start_order, new_frequency):
+    # What add_note/remove_note did under the lock before the free list
+    int(np.count_nonzero(active))
+    slots = np.flatnonzero(active)
+    oldest = int(slots[np.argmin(start_order[slots])])
+    active[oldest] = False
+    slot = int(np.flatnonzero(~active)[0])
+    active[slot] = True
+    frequency[slot] = new_frequency
+    start_order[slot] = start_order.max() + 1
+    np.flatnonzero(active & (frequency == new_frequency))
+
+
+def time_previous(size):
+    active = np.ones(size, dtype=bool)
+    frequency = 440.0 * 2 ** ((np.arange(size) % 48 - 24) / 12)
+    start_order = np.arange(size, dtype=np.int64)
+    notes = iter(range(10 ** 9))
+    return min(timeit.repeat(lambda: previous_cycle(active, frequency, start_order, float(next(notes))),
+                             number=CYCLES, repeat=3)) / CYCLES
+
+
+def time_policy(size, policy):
+    generator = Generator(SAMPLE_RATE, max_voices=size, polyphony=size, steal_policy=policy)
+    generator.set_oscillators([])
+    for index in range(size):
+        generator.note_on(index // 128, index % 128, 0.8, ADSR)
+    notes = iter(range(10 ** 9))
+
+    def cycle():
+        index = next(notes)
+        generator.note_on(15, index % 128, 0.8, ADSR)
+        generator.note_off(15, (index + 64) % 128)
+
+    return min(timeit.repeat(cycle, number=CYCLES, repeat=3)) / CYCLES
+
+
+def main():
+    print("Note-on with a stolen voice plus a note-off, pool full (us)")
+    print(f"{'voices':>7} {'previous':>9}" + "".join(f" {policy:>10}" for policy in STEAL_POLICIES))
+    with contextlib.redirect_stdout(io.StringIO()):  # Envelope state messages
+        rows = [(size, time_previous(size), [time_policy(size, policy) for policy in STEAL_POLICIES])
+                for size in POOL_SIZES]
+    for size, previous, policies in rows:
+        print(f"{size:>7} {previous * 1e6:>9.1f}" + "".join(f" {t * 1e6:>10.1f}" for t in policies))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Benchmark for Generator.generate_samples at increasing polyphony.
+
+Compares the batched voice bank against the original per-note,
+per-oscillator loop (kept below as a reference) at 44.1 kHz / 256 frames.
+
+Run from the repository root:
+    python -m benchmarks.bench_voices
+"""
+import contextlib
+import io
+import timeit
+from types import SimpleNamespace
+
+import numpy as np
+from scipy import signal
+
+from backend.generator import Generator, Note
+
+SAMPLE_RATE = 44100
+BLOCK_SIZE = 256
+POLYPHONY = [1, 16, 64, 128, 256]
+ADSR = {'attack_time': 0.01, 'decay_time': 0.1, 'sustain_level': 0.5, 'release_time': 0.1}
+
+
+def make_oscillators():
+    return [
+        SimpleNamespace(shape='sawtooth', volume=0.5, base_octave=-2, pitch_semitones=7, fine_tune=-12),
+        SimpleNamespace(shape='square', volume=0.5, base_octave=-3, pitch_semitones=0, fine_tune=0),
+        SimpleNamespace(shape='sine', volume=0.5, base_octave=-3, pitch_semitones=0, fine_tune=0),
+    ]
+
+
+def loop_generate_samples(notes, oscillators, phase, num_frames):
+    """The original per-note, per-oscillator rendering loop."""
+    buffer = np.zeros((num_frames, 2))
+    for note in notes:
+        note_buffer = np.zeros((num_frames, 2))
+        envelope = note.envelope.process(num_frames)
+        for index, osc in enumerate(oscillators):
+            amplitude = note.velocity * osc.volume / 4
+            freq = note.frequency * (2 ** osc.base_octave)
+            freq *= 2 ** (osc.pitch_semitones / 12)
+            freq *= 2 ** (osc.fine_tune / 1200)
+            key = (note, index)
+            if key not in phase:
+                phase[key] = np.random.uniform(0, 2 * np.pi)
+            phase_increment = 2 * np.pi * freq / SAMPLE_RATE
+            phases = phase[key] + np.arange(num_frames) * phase_increment
+            phase[key] = (phases[-1] + phase_increment) % (2 * np.pi)
+            if osc.shape == 'square':
+                samples = amplitude * signal.square(phases)
+            elif osc.shape == 'sawtooth':
+                samples = amplitude * signal.sawtooth(phases)
+            elif osc.shape == 'triangle':
+                samples = amplitude * signal.sawtooth(phases, width=0.5)
+            else:
+                samples = amplitude * np.sin(phases)
+            samples *= envelope
+            note_buffer += np.column_stack((samples, samples))
+        buffer += note_buffer
+    return buffer
+
+
+def frequencies(count):
+    return 440.0 * 2 ** ((np.arange(count) % 48 - 24) / 12)
+
+
+def time_loop(polyphony, repeats=20):
+    oscillators = make_oscillators()
+    notes = [Note(f, 0.8, SAMPLE_RATE, ADSR) for f in frequencies(polyphony)]
+    phase = {}
+    return min(timeit.repeat(lambda: loop_generate_samples(notes, oscillators, phase, BLOCK_SIZE),
+                             number=repeats, repeat=3)) / repeats
+
+
+def time_bank(polyphony, repeats=20):
+    generator = Generator(SAMPLE_RATE, max_voices=max(POLYPHONY), polyphony=polyphony)
+    generator.set_oscillators(make_oscillators())
+    for index in range(polyphony):
+        # The same notes as frequencies(), repeated on further channels
+        generator.note_on(index // 48, 45 + index % 48, 0.8, ADSR)
+    return min(timeit.repeat(lambda: generator.generate_samples(BLOCK_SIZE),
+                             number=repeats, repeat=3)) / repeats
+
+
+def main():
+    budget = BLOCK_SIZE / SAMPLE_RATE
+    print(f"{BLOCK_SIZE} frames @ {SAMPLE_RATE} Hz, budget {budget * 1e3:.2f} ms per block")
+    print(f"{'voices':>8} {'loop (ms)':>10} {'bank (ms)':>10} {'speedup':>8} {'bank RTF':>9}")
+    with contextlib.redirect_stdout(io.StringIO()) as log:
+        rows = [(p, time_loop(p), time_bank(p)) for p in POLYPHONY]
+    for polyphony, loop_time, bank_time in rows:
+        print(f"{polyphony:>8} {loop_time * 1e3:>10.3f} {bank_time * 1e3:>10.3f} "
+              f"{loop_time / bank_time:>7.1f}x {budget / bank_time:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark and alias measurement for the band-limited wavetable oscillator.
+
+Compares per-voice rendering cost of WavetableOscillator against
+scipy.signal, and measures how much energy lands on non-harmonic
+(aliased) frequencies for naive and band-limited waveforms.
+
+Run from the repository root:
+    python -m benchmarks.bench_wavetable
+"""
+import timeit
+
+import numpy as np
+from scipy import signal
+
+from backend.wavetable import WavetableOscillator
+
+SAMPLE_RATE = 44100
+BLOCK_SIZE = 512
+VOICES = 64
+ALIAS_LIMIT_DB = -60.0  # Worst acceptable alias-to-harmonic energy for the tables
+SCIPY_SHAPES = {
+    'square': signal.square,
+    'sawtooth': signal.sawtooth,
+    'triangle': lambda phases: signal.sawtooth(phases, width=0.5),
+}
+
+
+def alias_ratio_db(samples, frequency):
+    """
+    Energy at non-harmonic bins relative to harmonic energy, in dB.
+
+    samples must hold exactly one second of a waveform at an integer
+    frequency, so every harmonic falls on an exact 1 Hz FFT bin.
+    """
+    power = np.abs(np.fft.rfft(samples)) ** 2
+    power[0] = 0.0
+    harmonic = np.zeros(len(power), dtype=bool)
+    harmonic[np.arange(frequency, len(power), frequency)] = True
+    return 10 * np.log10(power[~harmonic].sum() / power[harmonic].sum())
+
+
+def measure_aliasing(wavetables, frequencies=(440, 1249, 2489, 4999)):
+    print(f"{'shape':>10} {'freq (Hz)':>10} {'scipy (dB)':>11} {'table (dB)':>11}")
+    phases = 2 * np.pi * np.arange(SAMPLE_RATE)[np.newaxis, :] / SAMPLE_RATE
+    for shape, naive in SCIPY_SHAPES.items():
+        for frequency in frequencies:
+            naive_db = alias_ratio_db(naive(phases[0] * frequency), frequency)
+            table = wavetables.render(shape, phases * frequency, np.array([frequency]))[0]
+            table_db = alias_ratio_db(table, frequency)
+            print(f"{shape:>10} {frequency:>10} {naive_db:>11.1f} {table_db:>11.1f}")
+            if table_db > ALIAS_LIMIT_DB:
+                raise AssertionError(f"{shape} at {frequency} Hz aliases at {table_db:.1f} dB")
+
+
+def measure_speed(wavetables):
+    frequencies = 440.0 * 2 ** ((np.arange(VOICES) % 48 - 24) / 12)
+    phases = (np.random.uniform(0, 2 * np.pi, VOICES)[:, np.newaxis]
+              + 2 * np.pi * np.outer(frequencies, np.arange(BLOCK_SIZE)) / SAMPLE_RATE)
+    print(f"\n{VOICES} voices x {BLOCK_SIZE} frames")
+    print(f"{'shape':>10} {'scipy (us/voice)':>17} {'table (us/voice)':>17} {'speedup':>8}")
+    for shape, naive in SCIPY_SHAPES.items():
+        naive_time = min(timeit.repeat(lambda: naive(phases), number=20, repeat=5)) / 20
+        table_time = min(timeit.repeat(lambda: wavetables.render(shape, phases, frequencies),
+                                       number=20, repeat=5)) / 20
+        print(f"{shape:>10} {naive_time / VOICES * 1e6:>17.2f} {table_time / VOICES * 1e6:>17.2f} "
+              f"{naive_time / table_time:>7.1f}x")
+
+
+def main():
+    build_time = timeit.timeit(lambda: WavetableOscillator(SAMPLE_RATE), number=1)
+    print(f"Table build: {build_time * 1e3:.1f} ms\n")
+    wavetables = WavetableOscillator(SAMPLE_RATE)
+    measure_aliasing(wavetables)
+    measure_speed(wavetables)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Check that notes start and stop on their exact sample inside a block.
+
+Renders a fixed pattern of note-ons and note-offs with several block
+sizes, passing each event to Generator.generate_samples at its offset in
+the block, and compares the result with a reference that ends a block at
+every event. Onsets are also located directly in the output (the first
+non-zero sample after silence). The previous behaviour, applying events
+at the start of the next block, is shown for comparison.
+
+Run from the repository root:
+    python -m benchmarks.check_note_timing
+"""
+import contextlib
+import io
+
+import numpy as np
+
+from backend.generator import Generator
+from backend.params import OscillatorParams
+
+SAMPLE_RATE = 44100
+BLOCK_SIZES = [64, 512, 4096]
+ADSR = {'attack_time': 0.005, 'decay_time': 0.01, 'sustain_level': 0.7, 'release_time': 0.005}
+# (sample position, kind, note number), including two notes one sample apart
+PATTERN = [(1000, 'note_on', 57), (3001, 'note_off', 57),
+           (5555, 'note_on', 64), (7777, 'note_off', 64),
+           (9999, 'note_on', 69), (10000, 'note_on', 73),
+           (12345, 'note_off', 69), (12346, 'note_off', 73)]
+LENGTH = 16384
+
+
+def make_generator():
+    np.random.seed(0)  # Voices start at a random phase; make it the same in every render
+    generator = Generator(SAMPLE_RATE)
+    generator.set_oscillators([OscillatorParams('square', 1.0, 0, 0, 0)])
+    return generator
+
+
+def generator_event(kind, note_number, offset):
+    return (offset, kind, 0, note_number, 1.0, ADSR)
+
+
+def render_with_offsets(block_size):
+    generator = make_generator()
+    blocks = []
+    for start in range(0, LENGTH, block_size):
+        events = [generator_event(kind, note_number, position - start)
+                  for position, kind, note_number in PATTERN if start <= position < start + block_size]
+        blocks.append(generator.generate_samples(block_size, events)[:, 0])
+    return np.concatenate(blocks)
+
+
+def render_at_block_start(block_size):
+    # Events applied at the start of the block after the one they fall in
+    generator = make_generator()
+    blocks = []
+    for start in range(0, LENGTH, block_size):
+        events = [generator_event(kind, note_number, 0)
+                  for position, kind, note_number in PATTERN if start - block_size <= position < start]
+        blocks.append(generator.generate_samples(block_size, events)[:, 0])
+    return np.concatenate(blocks)
+
+
+def render_reference():
+    # A block boundary at every event position
+    generator = make_generator()
+    blocks = []
+    position = 0
+    for event_position, kind, note_number in PATTERN + [(LENGTH, None, None)]:
+        if event_position > position:
+            blocks.append(generator.generate_samples(event_position - position)[:, 0])
+            position = event_position
+        if kind == 'note_on':
+            generator.note_on(0, note_number, 1.0, ADSR)
+        elif kind == 'note_off':
+            generator.note_off(0, note_number)
+    return np.concatenate(blocks)
+
+
+def onsets(signal):
+    # A voice's first sample is silent (envelope and fade-in both start at 0),
+    # so the note starts one sample before the first non-zero sample
+    sounding = np.abs(signal) > 0
+    starts = np.flatnonzero(sounding[1:] & ~sounding[:-1]) + 1
+    return [int(start) - 1 for start in starts]
+
+
+def main():
+    expected = [1000, 5555, 9999]  # The note at 10000 joins one that is already sounding
+    with contextlib.redirect_stdout(io.StringIO()):  # Envelope state messages
+        reference = render_reference()
+    if onsets(reference) != expected:
+        raise AssertionError(f"Reference onsets {onsets(reference)} != {expected}")
+
+    print(f"{'frames':>7} {'max diff':>10} {'onsets':>22} {'block-start onsets':>24}")
+    for block_size in BLOCK_SIZES:
+        with contextlib.redirect_stdout(io.StringIO()):
+            rendered = render_with_offsets(block_size)
+            late = onsets(render_at_block_start(block_size))
+        difference = np.abs(rendered - reference).max()
+        if onsets(rendered) != expected or difference > 1e-12:
+            raise AssertionError(f"{block_size}-frame blocks: onsets {onsets(rendered)}, "
+                                 f"max difference {difference:.2e}")
+        print(f"{block_size:>7} {difference:>10.1e} {str(onsets(rendered)):>22} {str(late):>24}")
+    print("All onsets land on their exact sample")
+
+
+if __name__ == "__main__":
+    main()
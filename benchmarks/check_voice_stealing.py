@@ -0,0 +1,82 @@
+"""
+Check that every note of a chord played into a full voice pool survives.
+
+Fills the pool with held notes, renders a few blocks so they have a level,
+then starts a chord inside one block, both as offset events to
+Generator.generate_samples and as note_on calls between blocks. For every
+stealing policy, each chord note must still hold its voice afterwards:
+the voices stolen for it have to come from the notes held before. The
+held notes get quieter from first to last, so 'quietest' has to take the
+last ones and 'oldest' the first ones.
+
+Run from the repository root:
+    python -m benchmarks.check_voice_stealing
+"""
+import contextlib
+import io
+
+import numpy as np
+
+from backend.generator import Generator
+from backend.params import OscillatorParams
+from backend.voice_bank import STEAL_POLICIES
+
+SAMPLE_RATE = 44100
+POLYPHONY = 16
+BLOCK_SIZE = 256
+ADSR = {'attack_time': 0.01, 'decay_time': 0.1, 'sustain_level': 0.7, 'release_time': 0.2}
+HELD = list(range(36, 36 + POLYPHONY))
+CHORD = [60, 64, 67, 72]
+
+
+def make_generator(policy):
+    np.random.seed(0)
+    generator = Generator(SAMPLE_RATE, polyphony=POLYPHONY, steal_policy=policy)
+    generator.set_oscillators([OscillatorParams('sawtooth', 1.0, 0, 0, 0)])
+    for index, note_number in enumerate(HELD):
+        # Quieter from first to last, so the quietest voice is not the oldest
+        generator.note_on(0, note_number, 0.9 - 0.04 * index, ADSR)
+    for _ in range(4):
+        generator.generate_samples(BLOCK_SIZE)
+    return generator
+
+
+def play_as_events(policy):
+    generator = make_generator(policy)
+    events = [(10 * index, 'note_on', 0, note_number, 0.8, ADSR) for index, note_number in enumerate(CHORD)]
+    generator.generate_samples(BLOCK_SIZE, events)
+    return generator
+
+
+def play_between_blocks(policy):
+    generator = make_generator(policy)
+    for note_number in CHORD:
+        generator.note_on(0, note_number, 0.8, ADSR)
+    generator.generate_samples(BLOCK_SIZE)
+    return generator
+
+
+def main():
+    print(f"{'policy':>10} {'events':>8} {'note_on':>8}")
+    for policy in STEAL_POLICIES:
+        results = []
+        for play in (play_as_events, play_between_blocks):
+            with contextlib.redirect_stdout(io.StringIO()):  # Envelope state messages
+                generator = play(policy)
+            lost = [note_number for note_number in CHORD
+                    if generator.voices.slot_for_key((0, note_number)) is None]
+            if lost or generator.voices.count() != POLYPHONY:
+                raise AssertionError(f"{policy}, {play.__name__}: chord notes {lost} lost their voice, "
+                                     f"{generator.voices.count()} voices sounding")
+            stolen = [note_number for note_number in HELD
+                      if generator.voices.slot_for_key((0, note_number)) is None]
+            expected = HELD[-len(CHORD):] if policy == 'quietest' else HELD[:len(CHORD)]
+            if stolen != expected:
+                raise AssertionError(f"{policy}, {play.__name__}: stole {stolen}, expected {expected}")
+            results.append(f"{len(CHORD)}/{len(CHORD)}")
+        print(f"{policy:>10} {results[0]:>8} {results[1]:>8}")
+    print("Every chord note kept its voice")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""
+Benchmark suite for the audio engine, runnable without audio hardware.
+
+Sweeps polyphony, block size, oscillator shapes and effect settings for
+each DSP stage (Generator.generate_samples, the filter stage behind
+FilterPanel.apply_filter, the chorus engine behind ChorusPanel.apply_chorus
+and ADSREnvelope.process) and reports microseconds per block, real-time
+factor and peak bytes allocated per block (tracemalloc). Results are
+saved as JSON so two revisions can be compared:
+
+    python -m benchmarks.suite --output before.json
+    python -m benchmarks.suite --output after.json --compare before.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import platform
+import subprocess
+import time
+import tracemalloc
+
+import numpy as np
+
+from backend.chorus import ChorusEngine
+from backend.filters import FilterStage
+from backend.generator import ADSREnvelope, Generator
+from backend.params import OscillatorParams
+from backend.render import DEFAULT_PATCH
+
+SAMPLE_RATE = 44100
+POLYPHONY = [1, 4, 16, 64, 128, 256]
+BLOCK_SIZES = [32, 64, 128, 256, 512, 1024, 2048, 4096]
+SHAPES = ['sine', 'square', 'sawtooth', 'triangle', 'whitenoise']
+QUICK_POLYPHONY = [1, 16, 128]
+QUICK_BLOCK_SIZES = [64, 512, 4096]
+MIN_SECONDS = 0.05  # Minimum timed duration per case
+
+
+def generator_case(polyphony, shapes):
+    generator = Generator(SAMPLE_RATE, max_voices=max(polyphony, 1), polyphony=polyphony)
+    generator.set_oscillators([OscillatorParams(shape=shape, volume=0.5) for shape in shapes])
+    for index in range(polyphony):
+        # Four octaves around A4, repeated on further channels
+        generator.note_on(index // 48, 45 + index % 48, 0.8, DEFAULT_PATCH['adsr'])
+    return generator.generate_samples
+
+
+def filter_case(sweep):
+    stage = FilterStage(SAMPLE_RATE)
+    state = {'cutoff': 1000}
+
+    def run(frames, block):
+        if sweep:
+            state['cutoff'] = 200 + (state['cutoff'] * 7) % 15000
+        return stage.process(block, 'low_pass', state['cutoff'])
+    return run
+
+
+def chorus_case(voices, mix):
+    engine = ChorusEngine(SAMPLE_RATE, max_depth=0.05, voices=voices)
+    return lambda frames, block: engine.process(block, 0.01, 1.5, mix)
+
+
+def envelope_case():
+    envelope = ADSREnvelope(0.05, 0.1, 0.5, 0.1, SAMPLE_RATE)
+    state = {'rendered': 0}
+
+    def run(frames):
+        # Restart and release periodically so every segment is exercised
+        if state['rendered'] % SAMPLE_RATE < frames:
+            envelope.note_on()
+        elif state['rendered'] % SAMPLE_RATE >= SAMPLE_RATE // 2 and envelope.state == 'sustain':
+            envelope.note_off()
+        state['rendered'] += frames
+        return envelope.process(frames)
+    return run
+
+
+def measure(run_block):
+    """
+    Times run_block() until MIN_SECONDS have elapsed and returns
+    (seconds per block, peak bytes allocated during one block).
+    """
+    run_block()  # Warm up caches and lazily sized buffers
+    blocks = 0
+    start = time.perf_counter()
+    while True:
+        run_block()
+        blocks += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= MIN_SECONDS:
+            break
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    run_block()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed / blocks, peak - baseline
+
+
+def record(results, stage, params, frames, run_block):
+    with contextlib.redirect_stdout(io.StringIO()):  # Silence engine debug prints
+        seconds, allocated = measure(run_block)
+    entry = dict(stage=stage, frames=frames, **params,
+                 us_per_block=seconds * 1e6,
+                 realtime_factor=frames / SAMPLE_RATE / seconds,
+                 alloc_peak_bytes=allocated)
+    results.append(entry)
+    label = ' '.join(f"{key}={value}" for key, value in params.items())
+    print(f"{stage:>10} {frames:>6} {label:<32} {entry['us_per_block']:>10.1f} us "
+          f"{entry['realtime_factor']:>9.1f}x {allocated / 1024:>9.1f} KiB")
+
+
+def run_suite(polyphony_values, block_sizes):
+    results = []
+    block_input = np.random.uniform(-0.5, 0.5, (max(block_sizes), 2))
+    for frames in block_sizes:
+        block = block_input[:frames]
+        for polyphony in polyphony_values:
+            with contextlib.redirect_stdout(io.StringIO()):
+                generate = generator_case(polyphony, ['sawtooth', 'square', 'sine'])
+            record(results, 'generator', {'polyphony': polyphony, 'shapes': 'mixed'},
+                   frames, lambda: generate(frames))
+        for sweep in (False, True):
+            process = filter_case(sweep)
+            record(results, 'filter', {'cutoff': 'swept' if sweep else 'static'},
+                   frames, lambda: process(frames, block))
+        for voices in (1, 3):
+            for mix in (0.0, 0.5):
+                process = chorus_case(voices, mix)
+                record(results, 'chorus', {'voices': voices, 'mix': mix},
+                       frames, lambda: process(frames, block))
+        process = envelope_case()
+        record(results, 'envelope', {}, frames, lambda: process(frames))
+
+    # Oscillator shapes at a fixed, typical load
+    for shape in SHAPES:
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate = generator_case(16, [shape])
+        record(results, 'generator', {'polyphony': 16, 'shapes': shape}, 512, lambda: generate(512))
+    return results
+
+
+def case_key(entry):
+    return tuple(sorted((k, v) for k, v in entry.items()
+                        if k not in ('us_per_block', 'realtime_factor', 'alloc_peak_bytes')))
+
+
+def compare(results, baseline_path, threshold=1.1):
+    with open(baseline_path) as f:
+        baseline = {case_key(entry): entry for entry in json.load(f)['results']}
+    print(f"\nCompared with {baseline_path} (ratio = new / old time)")
+    regressions = 0
+    for entry in results:
+        old = baseline.get(case_key(entry))
+        if old is None:
+            continue
+        ratio = entry['us_per_block'] / old['us_per_block']
+        if ratio > threshold:
+            regressions += 1
+            print(f"  slower {ratio:5.2f}x  {dict(case_key(entry))}")
+    print(f"{regressions} case(s) more than {threshold:.0%} of the baseline time")
+
+
+def revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the audio engine stages.")
+    parser.add_argument('--output', default='bench_results.json', help="JSON file for the results")
+    parser.add_argument('--compare', help="Earlier results JSON to compare against")
+    parser.add_argument('--quick', action='store_true', help="Smaller polyphony and block-size grid")
+    args = parser.parse_args(argv)
+
+    polyphony = QUICK_POLYPHONY if args.quick else POLYPHONY
+    block_sizes = QUICK_BLOCK_SIZES if args.quick else BLOCK_SIZES
+    print(f"{'stage':>10} {'frames':>6} {'parameters':<32} {'time':>13} {'RTF':>10} {'alloc':>13}")
+    results = run_suite(polyphony, block_sizes)
+
+    report = {
+        'revision': revision(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'sample_rate': SAMPLE_RATE,
+        'results': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=1)
+    print(f"\nSaved {len(results)} results to {args.output}")
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+import time
+
+from PyQt6.QtCore import Qt, QTimer
+
+
+class FrameScheduler:
+    """
+    Runs a render callback at most once per display frame, only when new
+    audio has arrived.
+
+    position() returns the producer's sample count (the analysis ring's
+    write_count); a tick where it has not moved since the last rendered
+    frame is skipped, and a rendered frame always works on the newest data.
+    Slow frames stretch the interval (down to min_fps) and fast ones bring
+    it back to target_fps, so a slow GUI sheds frames instead of queueing
+    work. Achieved fps, rendered frames and dropped display frames are kept
+    for the status bar.
+    """
+
+    def __init__(self, render_frame, position, target_fps=60, min_fps=10):
+        self.render_frame = render_frame
+        self.position = position
+        self.target_interval = 1.0 / target_fps
+        self.max_interval = 1.0 / min_fps
+        self.interval = self.target_interval
+        self.last_position = None
+        self.last_frame_time = None
+        self.frame_seconds = 0.0  # Duration of the newest frame
+        self.fps = 0.0            # Smoothed rate of rendered frames
+        self.frames = 0
+        self.dropped = 0          # Display frames that passed without a render while data kept coming
+        self.timer = QTimer()
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.timer.timeout.connect(self.tick)
+        self._apply_interval()
+
+    def start(self):
+        self.timer.start()
+
+    def stop(self):
+        self.timer.stop()
+
+    def tick(self):
+        position = self.position()
+        if position == self.last_position:
+            self.last_frame_time = None  # Idle, so the next gap is not a drop
+            return
+        start = time.perf_counter()
+        self.render_frame()
+        end = time.perf_counter()
+        self.last_position = position
+        self._record(start, end)
+
+    def _record(self, start, end):
+        self.frames += 1
+        self.frame_seconds = end - start
+        if self.last_frame_time is not None:
+            gap = start - self.last_frame_time
+            self.dropped += max(int(gap / self.target_interval + 0.5) - 1, 0)
+            self.fps += 0.1 * (1.0 / gap - self.fps)
+        self.last_frame_time = start
+
+        # Keep rendering under about half of the frame interval
+        if self.frame_seconds > 0.5 * self.interval and self.interval < self.max_interval:
+            self.interval = min(self.interval * 1.5, self.max_interval)
+            self._apply_interval()
+        elif self.frame_seconds < 0.2 * self.interval and self.interval > self.target_interval:
+            self.interval = max(self.interval / 1.25, self.target_interval)
+            self._apply_interval()
+
+    def _apply_interval(self):
+        self.timer.setInterval(max(int(self.interval * 1000), 1))
+
+    def status_text(self):
+        return f"GUI {self.fps:.0f} fps, {self.dropped} dropped frames"
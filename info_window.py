@@ -2,15 +2,18 @@ from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QMessageBox, QPushButton, QFileDialog
 )
 from PyQt6.QtCore import pyqtSignal, pyqtSlot, Qt
-import pandas as pd
 import pyqtgraph as pg
 import numpy as np
-from scipy.io.wavfile import write
+
+from backend.analyzer import SpectrumAnalyzer
+from backend.recorder import StreamRecorder
+from plotting import LiveCurve
 
 class InfoWindow(QMainWindow):
     update_data_signal = pyqtSignal(np.ndarray)
     start_recording_signal = pyqtSignal()
     stop_recording_signal = pyqtSignal()
+    recording_finished_signal = pyqtSignal()  # Emitted by the recorder's writer thread
 
     def __init__(self, main_window):
         super().__init__()
@@ -22,14 +25,18 @@ class InfoWindow(QMainWindow):
         self.update_data_signal.connect(self.update_displays)
         self.start_recording_signal.connect(self.start_recording_slot)
         self.stop_recording_signal.connect(self.stop_recording_slot)
+        self.recording_finished_signal.connect(self.recording_finished_slot)
 
         # Variables for recording
         self.is_recording = False
-        self.recorded_samples = []
+        # Streams recorded blocks to a temporary file
+        self.recorder = StreamRecorder(on_finished=self.recording_finished_signal.emit)
         self.sample_rate = 44100  # Default sample rate
 
-        # Sample buffer for accumulating samples
-        self.sample_buffer = np.array([])
+        # Spectrum of the newest 4096 samples; a 512-sample hop (about 86 per
+        # second) leaves the frame scheduler, not the analyzer, to set the frame rate
+        self.analyzer = SpectrumAnalyzer(size=4096, hop=512)
+        self.time_axis = np.zeros(0)  # Rebuilt only when the frame length or rate changes
 
     def initUI(self):
         central_widget = QWidget()
@@ -40,6 +47,7 @@ class InfoWindow(QMainWindow):
         self.plot_waveform.setLabel('left', 'Amplitude')
         self.plot_waveform.setLabel('bottom', 'Time (s)')
         self.plot_waveform.showGrid(x=True, y=True, alpha=0.3)
+        self.waveform_curve = LiveCurve(self.plot_waveform, pen='c')
         layout.addWidget(self.plot_waveform)
 
         # FFT Plot
@@ -47,6 +55,7 @@ class InfoWindow(QMainWindow):
         self.plot_fft.setLabel('left', 'Amplitude')
         self.plot_fft.setLabel('bottom', 'Frequency (Hz)')
         self.plot_fft.showGrid(x=True, y=True, alpha=0.3)
+        self.fft_curve = LiveCurve(self.plot_fft, pen='y')
         layout.addWidget(self.plot_fft)
 
         # Frozen Waveform Plot
@@ -54,6 +63,10 @@ class InfoWindow(QMainWindow):
         self.plot_frozen_waveform.setLabel('left', 'Amplitude')
         self.plot_frozen_waveform.setLabel('bottom', 'Time (s)')
         self.plot_frozen_waveform.showGrid(x=True, y=True, alpha=0.3)
+        self.frozen_curve = self.plot_frozen_waveform.plot(pen='m')
+        self.frozen_envelope_curve = self.plot_frozen_waveform.plot(pen='r')
+        # Refetch the visible span at the matching pyramid level on zoom/pan
+        self.plot_frozen_waveform.getViewBox().sigXRangeChanged.connect(self.update_frozen_view)
         layout.addWidget(self.plot_frozen_waveform)
 
         # Buttons for Saving
@@ -89,49 +102,36 @@ class InfoWindow(QMainWindow):
                 # Convert stereo to mono
                 samples = samples.mean(axis=1)
 
-            # Accumulate samples
-            self.sample_buffer = np.concatenate((self.sample_buffer, samples))
+            # Record samples if recording is active
+            if self.is_recording:
+                self.recorder.append(samples)
 
-            # Limit the buffer size to, e.g., 4096 samples
-            if len(self.sample_buffer) > 4096:
-                self.sample_buffer = self.sample_buffer[-4096:]
+            # Only redraw once the analyzer has a new hop of samples
+            if not self.analyzer.push(samples):
+                return
 
-            samples_to_plot = self.sample_buffer.copy()
+            samples_to_plot = self.analyzer.frame()
             N = len(samples_to_plot)
             if N == 0:
                 return  # Avoid division by zero
 
             # Time axis for waveform
-            t = np.linspace(0, N / self.sample_rate, N)
+            duration = N / self.sample_rate
+            if len(self.time_axis) != N or self.time_axis[-1] != duration:
+                self.time_axis = np.linspace(0, duration, N)
 
             # Update live waveform plot
-            self.plot_waveform.clear()
-            self.plot_waveform.plot(t, samples_to_plot, pen='c')
-            self.plot_waveform.setXRange(0, N / self.sample_rate)
-            self.plot_waveform.setYRange(samples_to_plot.min() * 1.1, samples_to_plot.max() * 1.1)
+            self.waveform_curve.set_data(self.time_axis, samples_to_plot)
+            self.waveform_curve.set_x_range(0, duration)
+            self.waveform_curve.fit_y(samples_to_plot.min(), samples_to_plot.max())
 
-            # Apply a window function to reduce spectral leakage
-            window = np.hanning(N)
-            samples_windowed = samples_to_plot * window
-
-            # Compute FFT
-            yf_full = np.fft.fft(samples_windowed)
-            yf = 2.0 / N * np.abs(yf_full[0:N // 2])
-            xf = np.fft.fftfreq(N, d=1 / self.sample_rate)[0:N // 2]
+            # Windowed real FFT of the newest frame
+            xf, yf = self.analyzer.spectrum(self.sample_rate)
 
             # Update FFT plot
-            self.plot_fft.clear()
-            self.plot_fft.plot(xf, yf, pen='y')
-            self.plot_fft.setXRange(0, self.sample_rate / 2)
-            self.plot_fft.setYRange(0, yf.max() * 1.1)
-
-            # Use linear scale
-            self.plot_fft.setLogMode(x=False, y=False)
-            self.plot_fft.invertY(False)
-
-            # Record samples if recording is active
-            if self.is_recording:
-                self.recorded_samples.append(samples.copy())
+            self.fft_curve.set_data(xf, yf)
+            self.fft_curve.set_x_range(0, self.sample_rate / 2)
+            self.fft_curve.fit_y(0, yf.max())
 
         except Exception as e:
             print(f"Exception in update_displays: {e}")
@@ -142,38 +142,59 @@ class InfoWindow(QMainWindow):
     @pyqtSlot()
     def start_recording_slot(self):
         self.is_recording = True
-        self.recorded_samples = []  # Reset recorded samples
+        self.recorder.start()  # Replaces the previous recording
 
     def stop_recording(self):
         self.stop_recording_signal.emit()
 
     @pyqtSlot()
     def stop_recording_slot(self):
+        # Only queues the end marker; recording_finished_slot draws the result
         self.is_recording = False
+        self.recorder.stop()
 
-        # Concatenate recorded samples
-        if self.recorded_samples:
-            self.full_samples = np.concatenate(self.recorded_samples)
-            N = len(self.full_samples)
-            self.t = np.linspace(0, N / self.sample_rate, N)
-
-            # Update frozen waveform plot
-            self.plot_frozen_waveform.clear()
-            self.plot_frozen_waveform.plot(self.t, self.full_samples, pen='m')
-            self.plot_frozen_waveform.setXRange(0, self.t[-1])
-            self.plot_frozen_waveform.setYRange(self.full_samples.min() * 1.1, self.full_samples.max() * 1.1)
-
-            # Calculate and plot the envelope
-            envelope = np.abs(self.full_samples)
-            self.plot_frozen_waveform.plot(self.t, envelope, pen='r')
-
+    @pyqtSlot()
+    def recording_finished_slot(self):
+        if self.recorder.recording:
+            return  # A new recording started before this one was drawn
+        if self.recorder.frames:
+            duration = self.recorder.frames / self.sample_rate
+            y_min, y_max = self.recorder.pyramid.extent()
+            self.plot_frozen_waveform.setYRange(y_min * 1.1, y_max * 1.1)
+            self.plot_frozen_waveform.setXRange(0, duration)
+            self.update_frozen_view()
         else:
             print("No samples recorded.")
 
+    def update_frozen_view(self):
+        # Draws only about one min/max pair per pixel of the visible span
+        if self.is_recording or self.recorder.writing:
+            return
+        (x_start, x_end), _ = self.plot_frozen_waveform.getViewBox().viewRange()
+        max_points = max(int(self.plot_frozen_waveform.width()), 100)
+        positions, values = self.recorder.view(x_start * self.sample_rate, x_end * self.sample_rate, max_points)
+        t = positions / self.sample_rate
+        self.frozen_curve.setData(t, values)
+        self.frozen_envelope_curve.setData(t, np.abs(values))
+
+    def confirm_gaps(self):
+        # Blocks dropped while the writer fell behind leave gaps in the file
+        if not self.recorder.dropped_blocks:
+            return True
+        answer = QMessageBox.warning(
+            self, "Warning",
+            f"The recording has gaps: {self.recorder.dropped_blocks} blocks "
+            f"({self.recorder.dropped_frames / self.sample_rate:.2f} s) were dropped "
+            f"because the disk writer fell behind.\nSave it anyway?",
+            QMessageBox.StandardButton.Save | QMessageBox.StandardButton.Cancel)
+        return answer == QMessageBox.StandardButton.Save
+
     def save_csv(self):
-        if not hasattr(self, 'full_samples'):
+        if not self.recorder.has_data():
             QMessageBox.warning(self, "Warning", "No waveform data to save. Please record a waveform first.")
             return
+        if not self.confirm_gaps():
+            return
 
         default_filename = "waveform.csv"
         file_path, _ = QFileDialog.getSaveFileName(self, "Save .csv File", default_filename, "CSV Files (*.csv)")
@@ -182,9 +203,7 @@ class InfoWindow(QMainWindow):
             return  # User canceled the save dialog
 
         try:
-            data = {"Time": self.t, "Amplitude": self.full_samples}
-            dataframe = pd.DataFrame(data)
-            dataframe.to_csv(file_path, index=False)
+            self.recorder.export_csv(file_path, self.sample_rate)
             print(f"Data saved to: {file_path}")
 
             QMessageBox.information(self, "Success", f"File saved as:\n{file_path}")
@@ -193,9 +212,11 @@ class InfoWindow(QMainWindow):
             QMessageBox.critical(self, "Error", f"Couldn't save the file:\n{e}")
 
     def save_wav(self):
-        if not hasattr(self, 'full_samples'):
+        if not self.recorder.has_data():
             QMessageBox.warning(self, "Warning", "No waveform data to save. Please record a waveform first.")
             return
+        if not self.confirm_gaps():
+            return
 
         default_filename = "waveform.wav"
         file_path, _ = QFileDialog.getSaveFileName(self, "Save .wav File", default_filename, "WAV Files (*.wav)")
@@ -203,12 +224,9 @@ class InfoWindow(QMainWindow):
         if not file_path:
             return  # User canceled the save dialog
 
-        y = self.full_samples
-        y_normalized = y / np.max(np.abs(y)) if np.max(np.abs(y)) != 0 else y
-        y_int16 = np.int16(y_normalized * 32767)
-
         try:
-            write(file_path, int(self.sample_rate), y_int16)
+            # Written chunk by chunk from the recording file
+            self.recorder.export_wav(file_path, self.sample_rate)
             print(f"Data saved to: {file_path}")
 
             QMessageBox.information(self, "Success", f"File saved as:\n{file_path}")
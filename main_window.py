@@ -1,6 +1,6 @@
+import time
+
 import numpy as np
-import sounddevice as sd
-import rtmidi
 from PyQt6.QtWidgets import (
     QVBoxLayout,
     QHBoxLayout,
@@ -13,13 +13,17 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import QTimer, Qt
 
-from backend.utils import midi_note_number_to_frequency
+from backend import analyzer, filters
 from backend.generator import Generator
-from backend.midi_handler import MidiHandler
+from backend.instrumentation import CallbackProfiler, STAGE_GENERATION
+from backend.midi_input import NOTE_OFF, NOTE_ON, drain_events, open_midi_inputs
+from frame_scheduler import FrameScheduler
 from oscillator_widget import OscillatorWidget
 from synth_panel import SynthPanel
 from info_window import InfoWindow
 
+MAX_BLOCK_FRAMES = 4096  # Stream blocks the buffer pools are sized for; larger ones grow them
+
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -48,6 +52,12 @@ class MainWindow(QMainWindow):
         # Initialize the Generator instance after creating oscillators
         self.generator = Generator()
         self.generator.set_oscillators(self.oscillators)
+        for index, osc in enumerate(self.oscillators):
+            osc.bind_params(self.generator.params, index)
+        self.profiler = CallbackProfiler(self.generator.sample_rate)
+        self.midi_inputs = []
+        self.notes_played = 0  # Counted by the audio callback, read by update_info
+        self.notes_seen = 0
 
         self.setWindowTitle("Multi-Oscillator Synthesizer")
         self.initUI()
@@ -57,13 +67,13 @@ class MainWindow(QMainWindow):
         self.info_window = InfoWindow(main_window=self)
         self.info_window.show()
 
-        self.initAudioStream()
+        # The stream opens once the event loop runs, i.e. after the window is shown
+        QTimer.singleShot(0, self.initAudioStream)
 
-        # Timer to update FFT
-        self.timer = QTimer()
-        self.timer.setInterval(50)  # Update 20 times per second
-        self.timer.timeout.connect(self.update_info)
-        self.timer.start()
+        # The only source of analysis updates: at most one per display frame
+        self.frame_scheduler = FrameScheduler(self.update_info,
+                                              lambda: self.synth_panel.analysis_buffer.write_count)
+        self.frame_scheduler.start()
 
     def initUI(self):
         # Main Layout
@@ -134,67 +144,82 @@ class MainWindow(QMainWindow):
             self.toggle_fft_button.setText("Hide FFT Window")
 
     def update_info(self):
+        self.statusBar().showMessage(f"{self.profiler.status_text()}  |  {self.frame_scheduler.status_text()}  |  "
+                                     f"{self.info_window.recorder.status_text()}")
+        # Start recording if the callback has played new notes since the last tick
+        if self.notes_played != self.notes_seen:
+            self.notes_seen = self.notes_played
+            if not self.info_window.is_recording:
+                self.info_window.start_recording()
         samples = self.synth_panel.get_last_processed_samples()
         if samples is not None:
             self.info_window.update_info(samples, sample_rate=self.generator.sample_rate)
 
     def initMidiHandlers(self):
-        midi_in = rtmidi.RtMidiIn()
-        port_count = midi_in.getPortCount()
-        if port_count == 0:
-            print("NO MIDI INPUT PORTS!")
-            return
-
-        self.midi_handlers = []
-        for port in range(port_count):
-            handler = MidiHandler(port)
-            handler.note_on.connect(self.handle_note_on)
-            handler.note_off.connect(self.handle_note_off)
-            handler.controller.connect(self.handle_controller)
-            handler.start()
-            self.midi_handlers.append(handler)
+        # Inputs queue timestamped events; audio_callback consumes them directly
+        self.midi_inputs = open_midi_inputs()
 
     def initAudioStream(self):
+        import sounddevice as sd
+
+        # Slow scipy imports happen here, never in the first audio callback
+        filters.load_scipy()
+        analyzer.load_scipy()
+        # float32 end to end: buffers sized here, every block rendered into outdata
+        self.generator.prepare(MAX_BLOCK_FRAMES, np.float32)
+        self.synth_panel.prepare(MAX_BLOCK_FRAMES, np.float32)
         self.stream = sd.OutputStream(
             samplerate=self.generator.sample_rate,
             channels=2,  # Number of output channels for stereo
+            dtype='float32',
             callback=self.audio_callback  # Ensure this method is defined
         )
         self.stream.start()
 
     def audio_callback(self, outdata, frames, time, status):
-        if status:
-            print(f"Audio callback status: {status}")
-
-        samples = self.generator.generate_samples(frames)
-        if samples is None or len(samples) == 0:
-            outdata.fill(0)
-        else:
-            processed_samples = self.synth_panel.process_samples(samples)
-            outdata[:] = processed_samples  # Ensure correct shape without transposing
-
-            # Send samples to InfoWindow
-            self.info_window.update_info(processed_samples, sample_rate=self.generator.sample_rate)
-
-    def handle_note_on(self, note_number, velocity):
-        frequency = midi_note_number_to_frequency(note_number)
-        amplitude = velocity / 127.0  # Scale amplitude based on velocity
-        adsr_params = self.synth_panel.get_adsr_params()
-        self.generator.add_note(frequency, amplitude, adsr_params)
-        print(f"Note On: {note_number} ({frequency:.2f} Hz), Velocity: {velocity}")
-
-        # Start recording if not already recording
-        if not self.info_window.is_recording:
-            self.info_window.start_recording()
-
-    def handle_note_off(self, note_number):
-        frequency = midi_note_number_to_frequency(note_number)
-        self.generator.remove_note(frequency)
-        print(f"Removed note {note_number} ({frequency:.2f} Hz) from generator")
+        # Status flags (underflows) are counted by the profiler, not printed
+        self.profiler.begin(frames, status)
+        events = self.midi_block_events(frames)
+
+        # Each stage writes its result into outdata instead of returning a new block
+        self.generator.generate_samples(frames, events, out=outdata)
+        self.profiler.lap(STAGE_GENERATION)
+        # Also publishes the block to the analysis ring drained by update_info
+        self.synth_panel.process_samples(outdata, self.profiler, out=outdata)
+
+        self.profiler.end()
+
+    def midi_block_events(self, frames):
+        """
+        Turns the MIDI events queued since the last callback into Generator
+        events with sample offsets.
+
+        An event that arrived t seconds before this callback is placed one
+        block period minus t into the block, so the spacing between events
+        is kept exactly and every note gets the same one-block delay instead
+        of up to a block of jitter. Older events go to offset 0.
+        """
+        now = time.perf_counter_ns()
+        sample_rate = self.generator.sample_rate
+        adsr_params = self.generator.params.snapshot.adsr.as_dict()  # One envelope setting per block
+        events = []
+        for arrival, kind, channel, number, value in drain_events(self.midi_inputs):
+            age = (now - arrival) * sample_rate // 1_000_000_000
+            offset = min(max(frames - age, 0), frames - 1)
+            if kind == NOTE_ON:
+                amplitude = value / 127.0  # Scale amplitude based on velocity
+                events.append((offset, kind, channel, number, amplitude, adsr_params))
+                self.profiler.note_latency(arrival, offset)
+                self.notes_played += 1
+            elif kind == NOTE_OFF:
+                events.append((offset, kind, channel, number, 0.0, None))
+            else:
+                self.handle_controller(number, value)
+        return events
 
     def handle_controller(self, controller_number, controller_value):
         # Obsługa kontrolerów MIDI, jeśli potrzebne
-        print(f"CONTROLLER {controller_number}: {controller_value}")
+        pass
 
     def update_plots(self):
         # Aktualizacja wykresów dla wszystkich oscylatorów
@@ -202,9 +227,15 @@ class MainWindow(QMainWindow):
             osc.update_plots()
 
     def closeEvent(self, event):
-        for handler in getattr(self, 'midi_handlers', []):
-            handler.stop()
+        self.frame_scheduler.stop()
+        for midi_input in self.midi_inputs:
+            midi_input.close()
+        for osc in self.oscillators:
+            osc.stop_preview_worker()
         if hasattr(self, 'stream'):
             self.stream.stop()
             self.stream.close()
+        self.generator.close()
+        self.info_window.recorder.close()  # Deletes the temporary recording file
+        print(self.profiler.report())
         event.accept()
\ No newline at end of file
@@ -1,7 +1,5 @@
 import numpy as np
-from scipy import signal
-from scipy.fft import fft
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtWidgets import (
     QVBoxLayout,
     QWidget,
@@ -12,10 +10,13 @@ from PyQt6.QtWidgets import (
     QFileDialog,
     QMessageBox,
 )
-from scipy.io.wavfile import write
+from backend.params import OscillatorParams
 from backend.utils import note_name_to_frequency
+from plotting import LiveCurve
+from preview_worker import PreviewWorker
 import pyqtgraph as pg
-import pandas as pd
+
+# scipy and pandas are only needed by the exports and are imported there on first use
 
 
 class OscillatorWidget(QWidget):
@@ -33,6 +34,20 @@ class OscillatorWidget(QWidget):
         self.filter_freq = 1000
         self.reference_frequency = 440
 
+        # Parameter store the audio thread reads; set by bind_params
+        self.params = None
+        self.param_index = None
+
+        # Previews are computed on a worker thread and drawn when still current
+        self.preview_generation = 0
+        self.preview_worker = PreviewWorker()
+        self.preview_worker.preview_ready.connect(self.show_preview)
+        self.preview_worker.start()
+        self.preview_timer = QTimer(self)
+        self.preview_timer.setSingleShot(True)
+        self.preview_timer.setInterval(16)
+        self.preview_timer.timeout.connect(self.request_preview)
+
         self.initUI()
 
     def initUI(self):
@@ -45,12 +60,14 @@ class OscillatorWidget(QWidget):
 
         ## wave
         self.plot_wave = pg.PlotWidget(title="Waveform")
-        self.plot_wave.setXRange(0, 0.01)
+        self.wave_curve = LiveCurve(self.plot_wave, pen=(200, 200, 200))
+        self.wave_curve.set_x_range(0, 0.01)
         layout.addWidget(self.plot_wave)
 
         # FFT
         self.plot_fft = pg.PlotWidget(title="FFT")
-        self.plot_fft.setXRange(20, 20000)
+        self.fft_curve = LiveCurve(self.plot_fft, pen=(200, 200, 200))
+        self.fft_curve.set_x_range(20, 20000)
         layout.addWidget(self.plot_fft)
 
         controls_layout = QHBoxLayout()
@@ -132,22 +149,36 @@ class OscillatorWidget(QWidget):
         }
         self.shape = shape_funcs.get(value, 'sine')
         print(f"{self.name} - Shape changed to {self.shape}")
+        self.publish_params()
         self.update_plots()
 
     def change_base_octave(self, value):
         self.base_octave = value
         print(f"{self.name} - Base Octave changed to {self.base_octave}")
+        self.publish_params()
         self.update_plots()
 
     def change_pitch_semitones(self, value):
         self.pitch_semitones = max(min(value, 12), -12)
         print(f"{self.name} - Pitch shifted by {self.pitch_semitones} semitones")
+        self.publish_params()
         self.update_plots()
 
     def change_fine_tune(self, value):
         self.fine_tune = max(min(value, 100), -100)
+        self.publish_params()
         self.update_plots()
 
+    def bind_params(self, params, index):
+        self.params = params
+        self.param_index = index
+        self.publish_params()
+
+    def publish_params(self):
+        # Hands the audio thread a new immutable snapshot of this oscillator
+        if self.params is not None:
+            self.params.update_oscillator(self.param_index, OscillatorParams.from_object(self))
+
     def get_final_frequency(self):
         freq = self.reference_frequency * (2 ** self.base_octave)
         freq *= 2 ** (self.pitch_semitones / 12)
@@ -178,27 +209,39 @@ class OscillatorWidget(QWidget):
         return y
 
     def update_plots(self):
-        y = self.get_waveform()
-        sample_rate = 44100
-        duration = 1
-        t = np.linspace(0, duration, int(sample_rate * duration), endpoint=False)
+        # Coalesce dial changes to at most one preview request per display frame
+        self.preview_generation += 1
+        if not self.preview_timer.isActive():
+            self.preview_timer.start()
+
+    def request_preview(self):
+        self.freq = self.get_final_frequency()
+        self.preview_worker.request(self.preview_generation, self.shape, self.freq)
+
+    def show_preview(self, generation, preview):
+        if generation != self.preview_generation:
+            return  # Parameters changed again while this was computed
+        t, y, xf, yf = preview
 
         # Update waveform plot
-        self.plot_wave.clear()
-        self.plot_wave.plot(t, y)
-        self.plot_wave.setXRange(0, 0.01)
+        self.wave_curve.set_data(t, y)
+        self.wave_curve.fit_y(y.min(), y.max())
 
         # Update FFT plot
-        xf, yf = self.transform_fourier(y, sample_rate)
-        self.plot_fft.clear()
-        self.plot_fft.plot(xf, yf)
-        self.plot_fft.setXRange(20, 20000)
+        self.fft_curve.set_data(xf, yf)
+        self.fft_curve.fit_y(0, yf.max())
+
+    def stop_preview_worker(self):
+        self.preview_timer.stop()
+        self.preview_worker.stop()
 
     def save_csv(self):
         default_filename = self.name + ".csv"
         file_path, _ = QFileDialog.getSaveFileName(self, "Save .csv File", default_filename, "CSV Files (*.csv)")
 
         try:
+            import pandas as pd
+
             data = {"x": self.generator.t, "y": self.get_waveform()}
             dataframe = pd.DataFrame(data)
             dataframe.to_csv(file_path, index=False, sep="\t")
@@ -219,6 +262,8 @@ class OscillatorWidget(QWidget):
         y_int16 = np.int16(y_normalized * 32767)
 
         try:
+            from scipy.io.wavfile import write
+
             write(file_path, self.generator.sample_rate, y_int16)
             print(f"Dane zapisane do: {file_path}")
 
@@ -231,18 +276,23 @@ class OscillatorWidget(QWidget):
         return np.sin(2 * np.pi * freq * t)
 
     def square_wave(self, freq, t):
+        from scipy import signal
         return signal.square(2 * np.pi * freq * t)
 
     def sawtooth_wave(self, freq, t):
+        from scipy import signal
         return signal.sawtooth(2 * np.pi * freq * t)
 
     def triangle_wave(self, freq, t):
+        from scipy import signal
         return signal.sawtooth(2 * np.pi * freq * t, width=0.5)
 
     def white_noise(self, t):
         return np.random.normal(-1, 1, len(t))
 
     def transform_fourier(self, y, sample_rate):
+        from scipy.fft import fft
+
         N = len(y)
         yf = 2.0 / N * np.abs(fft(y)[0:N // 2])
         xf = np.fft.fftfreq(N, d=1 / sample_rate)[0:N // 2]
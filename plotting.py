@@ -0,0 +1,48 @@
+class LiveCurve:
+    """
+    A persistent curve on a PlotWidget for plots that redraw many times a
+    second.
+
+    The PlotDataItem is created once (with view clipping, automatic peak
+    downsampling and the finite check off) and new data goes through
+    setData. Axis ranges are managed here rather than by auto-range: the X
+    range is set only when it changes, and the Y range only when the data
+    leaves it or shrinks to less than shrink of it, so steady signals do
+    not rescale the view on every frame.
+    """
+
+    def __init__(self, plot_widget, pen, shrink=0.5, padding=1.1):
+        self.plot_widget = plot_widget
+        self.shrink = shrink
+        self.padding = padding
+        self.x_range = None
+        self.y_range = None
+        plot_widget.setLogMode(x=False, y=False)
+        plot_widget.invertY(False)
+        plot_widget.disableAutoRange()
+        self.curve = plot_widget.plot(pen=pen)
+        self.curve.setClipToView(True)
+        self.curve.setDownsampling(auto=True, method='peak')
+        self.curve.setSkipFiniteCheck(True)
+
+    def set_data(self, x, y):
+        self.curve.setData(x, y)
+
+    def set_x_range(self, low, high):
+        if (low, high) != self.x_range:
+            self.x_range = (low, high)
+            self.plot_widget.setXRange(low, high, padding=0)
+
+    def fit_y(self, low, high):
+        """
+        Makes [low, high] visible, with padding, rescaling only when needed.
+        """
+        if self.y_range is not None:
+            shown_low, shown_high = self.y_range
+            inside = shown_low <= low and high <= shown_high
+            if inside and (high - low) >= self.shrink * (shown_high - shown_low):
+                return
+        if high <= low:
+            high = low + 1e-6
+        self.y_range = (low * self.padding if low < 0 else low, high * self.padding)
+        self.plot_widget.setYRange(*self.y_range, padding=0)
@@ -0,0 +1,47 @@
+import threading
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from backend.preview import preview_waveform, preview_spectrum
+
+
+class PreviewWorker(QThread):
+    """
+    Computes oscillator previews off the GUI thread.
+
+    Only the newest request is kept: while a preview is being computed,
+    further requests overwrite each other, so a fast dial sweep collapses
+    into the latest value. Results carry the request's generation number
+    so the widget can drop any that are no longer current.
+    """
+    preview_ready = pyqtSignal(int, object)  # generation, (t, y, xf, yf)
+
+    def __init__(self):
+        super().__init__()
+        self.condition = threading.Condition()
+        self.pending = None
+        self.running = True
+
+    def request(self, generation, shape, frequency):
+        with self.condition:
+            self.pending = (generation, shape, frequency)
+            self.condition.notify()
+
+    def run(self):
+        while True:
+            with self.condition:
+                while self.pending is None and self.running:
+                    self.condition.wait()
+                if not self.running:
+                    return
+                generation, shape, frequency = self.pending
+                self.pending = None
+            t, y = preview_waveform(shape, frequency)
+            xf, yf = preview_spectrum(shape, frequency)
+            self.preview_ready.emit(generation, (t, y, xf, yf))
+
+    def stop(self):
+        with self.condition:
+            self.running = False
+            self.condition.notify()
+        self.wait()
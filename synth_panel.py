@@ -5,9 +5,11 @@ from synth_panels.mixer_panel import MixerPanel
 from synth_panels.filter_panel import FilterPanel
 from synth_panels.chorus_panel import ChorusPanel
 from synth_panels.adsr_panel import ADSRPanel  # Import your ADSRPanel class
-from threading import Lock
 import numpy as np
 
+from backend.instrumentation import STAGE_FILTER, STAGE_CHORUS, STAGE_ANALYSIS
+from backend.ring_buffer import SampleRingBuffer
+
 class SynthPanel(QWidget):
     def __init__(self, oscillator_widgets, generator, name="Synth Panel"):
         super().__init__()
@@ -15,50 +17,63 @@ class SynthPanel(QWidget):
         self.oscillators = oscillator_widgets
         self.generator = generator
         self.initUI()
-        self.lock = Lock()
-        self.last_processed_samples = None
+        # Processed audio handed to the analysis windows, about 3 s at 44.1 kHz
+        self.analysis_buffer = SampleRingBuffer(1 << 17, channels=2)
 
     def initUI(self):
         layout = QVBoxLayout()
 
         # Mixer
-        self.mixer = MixerPanel(self.oscillators)
+        self.mixer = MixerPanel(self.oscillators, params=self.generator.params)
+        self.mixer.publish_params()
         layout.addWidget(self.mixer)
 
         # Filter
-        self.filter = FilterPanel()
+        self.filter = FilterPanel(params=self.generator.params)
+        self.filter.publish_params()
         layout.addWidget(self.filter)
 
         # ADSR Panel
-        self.adsr_panel = ADSRPanel()
+        self.adsr_panel = ADSRPanel(params=self.generator.params)
+        self.adsr_panel.publish_params()
         layout.addWidget(self.adsr_panel)
 
         # Chorus
-        self.chorus = ChorusPanel()
+        self.chorus = ChorusPanel(params=self.generator.params)
+        self.chorus.publish_params()
         layout.addWidget(self.chorus)
 
         self.setLayout(layout)
 
     def get_adsr_params(self):
-        return {
-            'attack_time': self.adsr_panel.attack,
-            'decay_time': self.adsr_panel.decay,
-            'sustain_level': self.adsr_panel.sustain,
-            'release_time': self.adsr_panel.release
-        }
+        # The published envelope settings, safe to call from any thread
+        return self.generator.params.snapshot.adsr.as_dict()
+
+    def prepare(self, max_frames, dtype=np.float32):
+        # Effect buffers for the stream's block size and sample type
+        self.chorus.prepare(max_frames, dtype)
+
+    def process_samples(self, samples, profiler=None, out=None):
+        # Effect settings come from one parameter snapshot, never from the widgets.
+        # With out (which may be samples itself) every stage writes in place.
+        snapshot = self.generator.params.snapshot
 
-    def process_samples(self, samples):
-        with self.lock:
-            # Apply filter
-            filtered_samples = self.filter.apply_filter(samples)
+        # Apply filter
+        filtered_samples = self.filter.apply_filter(samples, settings=snapshot.filter, out=out)
+        if profiler is not None:
+            profiler.lap(STAGE_FILTER)
 
-            # Apply chorus
-            chorused_samples = self.chorus.apply_chorus(filtered_samples)
+        # Apply chorus
+        chorused_samples = self.chorus.apply_chorus(filtered_samples, settings=snapshot.chorus, out=out)
+        if profiler is not None:
+            profiler.lap(STAGE_CHORUS)
 
-            # Store the last processed samples for FFT visualization
-            self.last_processed_samples = chorused_samples.copy()
+        # Publish to the analysis ring; no locks or Qt calls on the audio thread
+        self.analysis_buffer.write(chorused_samples)
+        if profiler is not None:
+            profiler.lap(STAGE_ANALYSIS)
 
-            return chorused_samples
+        return chorused_samples
 
 
     def apply_limiter(self, samples, threshold=0.9):
@@ -67,8 +82,7 @@ class SynthPanel(QWidget):
         return samples
 
     def get_last_processed_samples(self):
-        with self.lock:
-            if self.last_processed_samples is not None:
-                return self.last_processed_samples.copy()
-            else:
-                return None
\ No newline at end of file
+        # Drains everything processed since the previous call (GUI thread only)
+        if self.analysis_buffer.available() == 0:
+            return None
+        return self.analysis_buffer.read()
@@ -10,9 +10,10 @@ import numpy as np
 
 
 class ADSRPanel(QWidget):
-    def __init__(self, name="ADSR Envelope"):
+    def __init__(self, name="ADSR Envelope", params=None):
         super().__init__()
         self.name = name
+        self.params = params  # ParameterStore the audio thread reads
         self.attack = 0.1
         self.decay = 0.5
         self.sustain = 0.5
@@ -76,20 +77,30 @@ class ADSRPanel(QWidget):
 
     def change_attack(self, value):
         self.attack = value / 1000.0
+        self.publish_params()
         print(f"{self.name} - Attack set to {self.attack} seconds")
 
     def change_decay(self, value):
         self.decay = value / 1000.0
+        self.publish_params()
         print(f"{self.name} - Decay set to {self.decay} seconds")
 
     def change_sustain(self, value):
         self.sustain = value / 100.0
+        self.publish_params()
         print(f"{self.name} - Sustain set to {self.sustain}")
 
     def change_release(self, value):
         self.release = value / 1000.0
+        self.publish_params()
         print(f"{self.name} - Release set to {self.release} seconds")
 
+    def publish_params(self):
+        # All four values go out in one snapshot, so a note never mixes old and new
+        if self.params is not None:
+            self.params.update_adsr(attack_time=self.attack, decay_time=self.decay,
+                                    sustain_level=self.sustain, release_time=self.release)
+
     def apply_adsr(self, y):
         attack_samples = int(self.attack * 44100)
         decay_samples = int(self.decay * 44100)
@@ -8,13 +8,18 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtCore import Qt
 import numpy as np
 
+from backend.chorus import ChorusEngine
+
 class ChorusPanel(QWidget):
-    def __init__(self, name="Chorus"):
+    def __init__(self, name="Chorus", params=None):
         super().__init__()
         self.name = name
+        self.params = params  # ParameterStore the audio thread reads
         self.depth = 0.005  # Start with 5 ms depth
         self.rate = 1.0     # Start with 1 Hz rate
         self.mix = 0    # Start with 50% mix
+        self.voices = 1     # Modulated taps per channel
+        self.engine = ChorusEngine(44100, max_depth=0.05, voices=self.voices)  # 50 ms = depth slider maximum
         self.initUI()
 
     def initUI(self):
@@ -69,50 +74,37 @@ class ChorusPanel(QWidget):
 
     def change_depth(self, value):
         self.depth = value / 1000.0  # ms to sec
+        self.publish_params()
         self.depth_value_label.setText(f"{self.depth * 1000:.1f}")
         print(f"{self.name} - Depth set to {self.depth * 1000:.1f} ms")
 
     def change_rate(self, value):
         self.rate = value / 10.0  # to Hz
+        self.publish_params()
         self.rate_value_label.setText(f"{self.rate:.1f}")
         print(f"{self.name} - Rate set to {self.rate:.1f} Hz")
 
     def change_mix(self, value):
         self.mix = value / 100.0  # [0, 1]
+        self.publish_params()
         self.mix_value_label.setText(f"{self.mix * 100:.0f}")
         print(f"{self.name} - Mix set to {self.mix * 100:.0f}%")
 
-    def apply_chorus(self, signal, sample_rate=44100):
-        # Ensure signal is stereo with shape (num_frames, 2)
-        if signal.ndim == 1:
-            signal = np.column_stack((signal, signal))
-
-        N = signal.shape[0]
-        max_delay_samples = int(self.depth * sample_rate)
-
-        # Create LFOs for modulation
-        t = np.arange(N)
-        lfo_left = 0.5 * (1 + np.sin(2 * np.pi * self.rate * t / sample_rate))
-        lfo_right = 0.5 * (1 + np.sin(2 * np.pi * self.rate * t / sample_rate + np.pi / 2))
-
-        delay_left = (lfo_left * max_delay_samples).astype(int)
-        delay_right = (lfo_right * max_delay_samples).astype(int)
-
-        indices = np.arange(N)
-
-        # Compute delayed indices
-        indices_left = indices - delay_left
-        indices_right = indices - delay_right
-
-        # Ensure indices are within valid range
-        indices_left = np.clip(indices_left, 0, N - 1)
-        indices_right = np.clip(indices_right, 0, N - 1)
-
-        delayed_left = signal[indices_left, 0]
-        delayed_right = signal[indices_right, 1]
-
-        delayed_signal = np.column_stack((delayed_left, delayed_right))
-
-        # Adjust the mix calculation
-        output = signal + self.mix * (delayed_signal - signal)
-        return output
\ No newline at end of file
+    def publish_params(self):
+        if self.params is not None:
+            self.params.update_chorus(depth=self.depth, rate=self.rate, mix=self.mix)
+
+    def prepare(self, max_frames, dtype=np.float32):
+        # Called when the stream starts: a fresh engine sized and typed for it
+        self.engine = ChorusEngine(self.engine.sample_rate, max_depth=0.05, voices=self.voices,
+                                   max_block=max_frames, dtype=dtype)
+
+    def apply_chorus(self, signal, sample_rate=44100, settings=None, out=None):
+        # The engine keeps its delay line and LFO phase between audio blocks.
+        # The audio thread passes a ChorusParams snapshot instead of reading widgets.
+        if self.engine.sample_rate != sample_rate:
+            self.engine = ChorusEngine(sample_rate, max_depth=0.05, voices=self.voices,
+                                       max_block=self.engine.max_block, dtype=self.engine.dtype)
+        if settings is None:
+            return self.engine.process(signal, self.depth, self.rate, self.mix, out=out)
+        return self.engine.process(signal, settings.depth, settings.rate, settings.mix, out=out)
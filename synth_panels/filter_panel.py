@@ -11,18 +11,19 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import Qt
 import numpy as np
-from scipy.signal import butter, lfilter
-from scipy.signal import filtfilt
 
+from backend.filters import FilterStage
 
 
 class FilterPanel(QWidget):
-    def __init__(self, name="Filter", sample_rate=44100):
+    def __init__(self, name="Filter", sample_rate=44100, params=None):
         super().__init__()
         self.name = name
+        self.params = params  # ParameterStore the audio thread reads
         self.filter_type = "low_pass"
         self.filter_freq = 20000  # Default frequency
         self.sample_rate = sample_rate
+        self.filter_stage = FilterStage(sample_rate, order=3)
         self.initUI()
 
     def initUI(self):
@@ -67,35 +68,21 @@ class FilterPanel(QWidget):
             self.filter_type = "low_pass"
         elif selected_button.text() == "High Pass":
             self.filter_type = "high_pass"
+        self.publish_params()
         print(f"{self.name} - Filter type changed to {self.filter_type}")
 
     def change_filter_freq(self, value):
         self.filter_freq = value
+        self.publish_params()
         print(f"{self.name} - Filter frequency set to {self.filter_freq} Hz")
 
-    def apply_filter(self, y):
-        nyq = 0.5 * self.sample_rate
-        normal_cutoff = self.filter_freq / nyq
-        order = 3
+    def publish_params(self):
+        if self.params is not None:
+            self.params.update_filter(filter_type=self.filter_type, cutoff=self.filter_freq)
 
-        if self.filter_type == 'low_pass':
-            b, a = butter(order, normal_cutoff, btype='low', analog=False)
-        elif self.filter_type == 'high_pass':
-            b, a = butter(order, normal_cutoff, btype='high', analog=False)
-        else:
-            raise ValueError("Invalid filter type")
-
-        # Apply the filter to each channel
-        filtered_signal = lfilter(b, a, y, axis=0)
-        # filtered_signal = filtfilt(b, a, y, axis=0)
-
-        return filtered_signal
-
-        # yf = np.fft.fft(y)
-        # xf = np.fft.fftfreq(len(y), 1 / 44100)
-        # if self.filter_type == 'low_pass':
-        #     yf[np.abs(xf) > self.filter_freq] = 0
-        # elif self.filter_type == 'high_pass':
-        #     yf[np.abs(xf) < self.filter_freq] = 0
-        # y_filtered = np.fft.ifft(yf).real
-        # return y_filtered
\ No newline at end of file
+    def apply_filter(self, y, settings=None, out=None):
+        # Cached coefficients, filter state carried across audio blocks.
+        # The audio thread passes a FilterParams snapshot instead of reading widgets.
+        if settings is None:
+            return self.filter_stage.process(y, self.filter_type, self.filter_freq, out=out)
+        return self.filter_stage.process(y, settings.filter_type, settings.cutoff, out=out)
@@ -2,6 +2,9 @@ import numpy as np
 from PyQt6.QtWidgets import QWidget, QVBoxLayout
 import pyqtgraph as pg
 
+from backend.analyzer import hann_window, spectrum_frequencies
+from plotting import LiveCurve
+
 class FinalFFTWidget(QWidget):
     def __init__(self, name="Final FFT"):
         super().__init__()
@@ -14,6 +17,7 @@ class FinalFFTWidget(QWidget):
         self.plot_fft.setLabel('left', 'Amplitude')
         self.plot_fft.setLabel('bottom', 'Frequency (Hz)')
         self.plot_fft.showGrid(x=True, y=True, alpha=0.3)
+        self.fft_curve = LiveCurve(self.plot_fft, pen='y')
         layout.addWidget(self.plot_fft)
         self.setLayout(layout)
 
@@ -28,31 +32,18 @@ class FinalFFTWidget(QWidget):
             if N == 0:
                 return  # Avoid division by zero
 
-            # Apply a window function to reduce spectral leakage
-            window = np.hanning(N)
-            samples_windowed = samples * window
-
-            # Compute FFT using the oscillator's method
-            yf_full = np.fft.fft(samples_windowed)
-            yf = 2.0 / N * np.abs(yf_full[0:N // 2])
-            xf = np.fft.fftfreq(N, d=1 / sample_rate)[0:N // 2]
-
-            # Update plot
-            self.plot_fft.clear()
-            self.plot_fft.plot(xf, yf, pen='y')
-
-            # Set x-axis range from 0 Hz to Nyquist frequency
-            nyquist = sample_rate / 2
-            self.plot_fft.setXRange(0, nyquist)
-
-            # Set y-axis range based on data
-            self.plot_fft.setYRange(0, yf.max() * 1.1)  # Add 10% padding
+            # Apply a window function to reduce spectral leakage (cached per length)
+            samples_windowed = samples * hann_window(N)
 
-            # Use linear scale (assuming oscillators use linear scale)
-            self.plot_fft.setLogMode(x=False, y=False)
+            # Real FFT; the positive half matches the full FFT's first N // 2 bins
+            yf = np.abs(np.fft.rfft(samples_windowed)[0:N // 2])
+            yf *= 2.0 / N
+            xf = spectrum_frequencies(N, sample_rate)
 
-            # Ensure y-axis is not inverted
-            self.plot_fft.invertY(False)
+            # Update the persistent curve; axes move only when the ranges change
+            self.fft_curve.set_data(xf, yf)
+            self.fft_curve.set_x_range(0, sample_rate / 2)
+            self.fft_curve.fit_y(0, yf.max())
 
         except Exception as e:
             print(f"Exception in update_fft: {e}")
\ No newline at end of file
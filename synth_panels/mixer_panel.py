@@ -10,10 +10,13 @@ import numpy as np
 
 
 class MixerPanel(QWidget):
-    def __init__(self, oscillator_widgets, name="Mixer"):
+    def __init__(self, oscillator_widgets, name="Mixer", params=None):
         super().__init__()
         self.oscillators = oscillator_widgets
         self.name = name
+        self.params = params  # ParameterStore the audio thread reads
+        self.pan = 0.0     # Centre of the voices, -1 (left) to 1 (right)
+        self.spread = 0.0  # How far voices fan out by pitch, 0 to 1
         self.initUI()
 
     def initUI(self):
@@ -36,12 +39,49 @@ class MixerPanel(QWidget):
             osc_layout.addWidget(slider)
             layout.addLayout(osc_layout)
 
+        # Pan Slider
+        pan_layout = QHBoxLayout()
+        pan_label = QLabel("Pan")
+        self.pan_slider = QSlider(Qt.Orientation.Horizontal)
+        self.pan_slider.setRange(-100, 100)  # Hard left to hard right
+        self.pan_slider.setValue(int(self.pan * 100))
+        self.pan_slider.valueChanged.connect(self.change_pan)
+        pan_layout.addWidget(pan_label)
+        pan_layout.addWidget(self.pan_slider)
+        layout.addLayout(pan_layout)
+
+        # Stereo Spread Slider
+        spread_layout = QHBoxLayout()
+        spread_label = QLabel("Spread")
+        self.spread_slider = QSlider(Qt.Orientation.Horizontal)
+        self.spread_slider.setRange(0, 100)  # 0% to 100%
+        self.spread_slider.setValue(int(self.spread * 100))
+        self.spread_slider.valueChanged.connect(self.change_spread)
+        spread_layout.addWidget(spread_label)
+        spread_layout.addWidget(self.spread_slider)
+        layout.addLayout(spread_layout)
+
         self.setLayout(layout)
 
     def set_volume(self, oscillator, value):
         oscillator.volume = value / 100.0  # Normalize to 0.0 - 1.0
+        oscillator.publish_params()
         print(f"{oscillator.name} - Volume set to {oscillator.volume}")
 
+    def change_pan(self, value):
+        self.pan = value / 100.0  # [-1, 1]
+        self.publish_params()
+        print(f"{self.name} - Pan set to {self.pan:+.2f}")
+
+    def change_spread(self, value):
+        self.spread = value / 100.0  # [0, 1]
+        self.publish_params()
+        print(f"{self.name} - Spread set to {self.spread * 100:.0f}%")
+
+    def publish_params(self):
+        if self.params is not None:
+            self.params.update_stereo(pan=self.pan, spread=self.spread)
+
     def mix_signals(self):
         # Generate mixed signal from active notes
         # Since the Generator now handles active notes, we may need to adjust this method